@@ -1,33 +1,252 @@
 import sys
 import os
+import argparse
+import base64
+import functools
+import hashlib
+import heapq
+import hmac
+import importlib.util
+import itertools
 import json
+import math
+import platform
 import random
-import webview
+import re
+import types
+import zlib
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, OrderedDict, deque
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass, field
+from http import HTTPStatus
 import threading
 import time
-from typing import Optional, Dict, List, Any, Tuple
+import traceback
+from typing import (
+    Optional,
+    Dict,
+    List,
+    Any,
+    Tuple,
+    Deque,
+    Callable,
+    Iterable,
+    Iterator,
+)
 from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Return ``name`` as a module that is only really imported on first use."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# Only the headless server, disk-backed banks and the benchmarks need these
+asyncio = lazy_import("asyncio")
+mimetypes = lazy_import("mimetypes")
+sqlite3 = lazy_import("sqlite3")
+tracemalloc = lazy_import("tracemalloc")
+
+# pywebview is imported by load_webview() when the first window opens; the
+# headless server (--serve) and the command-line tools never import it
+webview: Any = None
+
+
+def load_webview() -> Any:
+    global webview
+    if webview is None:
+        import webview as module
+
+        webview = module
+    return webview
+
+
+# NumPy is only needed for results analytics and loaded by load_numpy()
+numpy: Any = None
+
+
+def load_numpy() -> Any:
+    global numpy
+    if numpy is None:
+        import numpy as module
+
+        numpy = module
+    return numpy
+
+
+def set_admin_password(password: str):
+    global admin_password
+    admin_password = password
+
+
+def check_admin_password(password: Any) -> bool:
+    return hmac.compare_digest(str(password or "").encode(), admin_password.encode())
+
 
 # Force UTF-8 encoding for Windows
 if sys.platform == "win32":
     import io
-    import ctypes
 
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8")
 
-    try:
-        ctypes.windll.shcore.SetProcessDpiAwareness(1)
-    except (AttributeError, OSError):
-        try:
-            ctypes.windll.user32.SetProcessDPIAware()
-        except (AttributeError, OSError):
-            pass
-
+# Built-in admin password of the desktop app; --admin-password or
+# $MEOM_ADMIN_PASSWORD replace it, and --serve only starts with one of them
 ADMIN_PASSWORD = "250595"
+admin_password = os.environ.get("MEOM_ADMIN_PASSWORD") or ADMIN_PASSWORD
 TIEBREAKER_TAG = "TIEBREAKER"
 
+# Number of state changes kept for delta sync before clients get a snapshot
+STATE_JOURNAL_LIMIT = 2048
+QUESTION_STATE_FIELDS = ("answered_questions", "timed_out_questions", "questions_results")
+_MISSING = object()
+
+DEFAULT_TEAM_COUNT = 2
+MAX_TEAMS = 200
+TEAM_NAME_KEY = re.compile(r"team(\d+)_name")
+
+# Cross-check incrementally maintained counters against full rescans
+DEBUG_STATE_CHECKS = os.environ.get("MEOM_DEBUG_STATE") == "1"
+
+# QuestionStatus flag bits
+QUESTION_ANSWERED = 1
+QUESTION_TIMED_OUT = 2
+
+# Sync debounce windows (seconds): a burst of mutations becomes one sync
+PLAYER_SYNC_DELAY = 0.03
+ADMIN_SYNC_DELAY = 0.05
+SYNC_MAX_DELAY = 0.25
+# Question bodies kept in memory by disk-backed stores
+QUESTION_CACHE_SIZE = 512
+# Ready-built question payloads per store (two per question: with/without answer)
+QUESTION_PAYLOAD_CACHE_SIZE = 50000
+# Question edits kept for get_all_questions deltas before the admin reloads all
+QUESTION_JOURNAL_LIMIT = 4096
+VIEW_QUESTION_ID_BASE = 1 << 40
+# Streaming import tuning
+IMPORT_CHUNK_SIZE = 64 * 1024
+IMPORT_MAX_RECORD_CHARS = 1024 * 1024
+IMPORT_PROGRESS_EVERY = 500
+IMPORT_ERROR_LIMIT = 200
+# Optional question metadata that rounds are drawn by (0 = no difficulty)
+CATEGORY_MAX_CHARS = 64
+DIFFICULTY_LEVELS = 5
+ROUND_GROUPINGS = ("category", "difficulty")
+ROUND_GROUPING_ERROR = "Rounds are drawn by category or difficulty"
+# Question search: BM25 ranking, default/max results per query
+SEARCH_LIMIT = 50
+SEARCH_MAX_LIMIT = 500
+SEARCH_K1 = 1.2
+SEARCH_B = 0.75
+# Near-duplicate check on import: MinHash bins per question, bins per LSH band
+# and the estimated similarity that counts as a duplicate
+MINHASH_BINS = 32
+MINHASH_BAND = 4
+MINHASH_EMPTY = 0xFFFFFFFF
+DUPLICATE_THRESHOLD = 0.8
+# Rows per page when streaming from disk-backed stores / per export write
+QUESTION_PAGE_SIZE = 1000
+EXPORT_CHUNK_SIZE = 1000
+# Upper bound for a single wait_for_state_change long-poll (seconds)
+STATE_WAIT_TIMEOUT = 30.0
+
+# Crash-safe state: WAL records are fsynced at most this many seconds after
+# being written (0 = before returning), and a snapshot replaces the log
+# every STATE_SNAPSHOT_EVERY records, which bounds replay on recovery.
+STATE_FSYNC_WINDOW = 0.2
+STATE_SNAPSHOT_EVERY = 1000
+TEAM_SCORE_KEY = re.compile(r"team(\d+)_score")
+# Game event log: a checkpoint of the full state every N events bounds the
+# replay needed to rebuild any past state; past the cap every other one is
+# dropped and the interval doubles
+EVENT_CHECKPOINT_EVERY = 256
+EVENT_CHECKPOINTS_KEPT = 64
+EVENT_PAGE_SIZE = 200
+# Results archive: finished games' answers, one column file per field under
+# the state directory; analytics lists at most ANALYTICS_MAX_LIMIT questions
+RESULTS_DIR = "results"
+RESULT_WRONG = 0
+RESULT_CORRECT = 1
+RESULT_TIMEOUT = 2
+ANALYTICS_LIMIT = 20
+ANALYTICS_MAX_LIMIT = 1000
+# Share of respondents in the upper/lower groups of the discrimination index
+ANALYTICS_GROUP_SHARE = 0.27
+ANALYTICS_NUMPY_ERROR = "Results analytics needs NumPy (pip install numpy)"
+
+# Headless server (--serve): local only unless --host says otherwise; file
+# paths from the admin API must lie inside the data directory
+SERVER_HOST = "127.0.0.1"
+SERVER_DATA_DIR = "data"
+SERVER_PORT = 8765
+SERVER_WORKERS = 32
+SERVER_MAX_BODY = 16 * 1024 * 1024
+WS_SEND_QUEUE = 256
+# Admin sockets must send {"auth": password} within this many seconds
+WS_AUTH_TIMEOUT = 10.0
+
+# Game sessions (one per room in server mode)
+DEFAULT_GAME_ID = "main"
+GAME_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,32}")
+MAX_SESSIONS = 200
+SESSION_IDLE_TIMEOUT = 2 * 60 * 60.0
+SESSION_SWEEP_INTERVAL = 60.0
+
+# API metrics: off unless MEOM_METRICS=1 or --metrics-file is given.
+# Latency buckets are in seconds, size buckets in bytes of JSON.
+METRICS_ENABLED = os.environ.get("MEOM_METRICS") == "1"
+METRIC_LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0,
+)
+METRIC_SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+METRICS_DUMP_INTERVAL = 15.0
+
+# Benchmarks (--bench): synthetic games per bank size and team count. Before
+# each game questions are added and deleted and the bank is re-imported; the
+# admin state is sampled BENCH_STATE_SAMPLES times per game and every
+# BENCH_TRACE_EVERY-th call is traced for allocations instead of timed. A
+# saved baseline flags anything slower or bigger than BENCH_TOLERANCE.
+BENCH_SIZES = (100, 1000, 10000, 100000)
+BENCH_TEAMS = (2, 8)
+BENCH_EDITS = 200
+BENCH_IMPORT_RUNS = 3
+BENCH_STATE_SAMPLES = 50
+BENCH_TIMEOUT_RATE = 0.1
+BENCH_TRACE_EVERY = 50
+BENCH_TOLERANCE = 0.25
+BENCH_SLACK_US = 5.0
+# Fresh interpreters started by --bench-startup
+STARTUP_BENCH_RUNS = 5
+STARTUP_BENCH_TOP = 10
+# Settings sweep (--sweep): synthetic games per setting for every combination
+# of the grid below. A team answers in time with chance exp(-timer / mean
+# answer time) and is then right with SWEEP_ACCURACY. Games are drawn
+# SWEEP_CHUNK_CELLS answers at a time; the first SWEEP_VERIFY_GAMES of each
+# setting are replayed through GameMachine as a check.
+SWEEP_GAMES = 100000
+SWEEP_TEAMS = (2, 3, 4)
+SWEEP_POINTS_CORRECT = (1, 2, 3)
+SWEEP_POINTS_WRONG = (-1, 0)
+SWEEP_TIMERS = (15, 30, 60)
+SWEEP_ACCURACY = 0.5
+SWEEP_ANSWER_TIME = 12.0
+SWEEP_CHUNK_CELLS = 4_000_000
+SWEEP_VERIFY_GAMES = 20
+
 
 # =========================
 # Data Models
@@ -38,23 +257,176 @@ class Question:
     question: str
     options: List[str]
     correct: int
+    tiebreaker: bool = False
+    category: str = ""
+    difficulty: int = 0
 
     def to_dict(self, include_answer: bool = True) -> Dict[str, Any]:
-        data = {"id": self.id, "question": self.question, "options": self.options}
+        data = {
+            "id": self.id,
+            "question": self.question,
+            "options": self.options,
+            "tiebreaker": self.tiebreaker,
+        }
+        # Metadata only when set, so untagged banks look as they always did
+        if self.category:
+            data["category"] = self.category
+        if self.difficulty:
+            data["difficulty"] = self.difficulty
         if include_answer:
             data["correct"] = self.correct
         return data
 
 
+class QuestionPayload(dict):
+    """A question's to_dict() together with its JSON text, encoded once.
+
+    Behaves as the plain dict everywhere; encode_json() (the headless
+    server's encoder) splices in ``json`` instead of encoding it again.
+    """
+
+    __slots__ = ("json",)
+
+    def __init__(self, data: Dict[str, Any]):
+        super().__init__(data)
+        # ASCII escapes, like every other server response
+        self.json = json.dumps(data)
+
+
+class QuestionStatus:
+    """Per-question status bits, keyed by question id.
+
+    Only questions carrying a flag are stored, so memory follows the number
+    of answered questions rather than the largest id (view and imported ids
+    can be sparse, see VIEW_QUESTION_ID_BASE). Membership tests, updates and
+    counts are O(1); listing the ids that carry a flag is a single scan,
+    used only for full snapshots.
+    """
+
+    def __init__(self):
+        self._flags: Dict[int, int] = {}
+        self._counts = {QUESTION_ANSWERED: 0, QUESTION_TIMED_OUT: 0}
+
+    def has(self, question_index: int, flag: int) -> bool:
+        return bool(self._flags.get(question_index, 0) & flag)
+
+    def set(self, question_index: int, flag: int) -> bool:
+        bits = self._flags.get(question_index, 0)
+        if bits & flag:
+            return False
+        self._flags[question_index] = bits | flag
+        self._counts[flag] += 1
+        return True
+
+    def clear(self, question_index: int, flag: int) -> bool:
+        bits = self._flags.get(question_index, 0)
+        if not bits & flag:
+            return False
+        bits &= ~flag
+        if bits:
+            self._flags[question_index] = bits
+        else:
+            del self._flags[question_index]
+        self._counts[flag] -= 1
+        return True
+
+    def count(self, flag: int) -> int:
+        return self._counts[flag]
+
+    def indices(self, flag: int) -> List[int]:
+        return sorted(i for i, bits in self._flags.items() if bits & flag)
+
+    def replace(self, flag: int, indices) -> None:
+        for i in self.indices(flag):
+            self.clear(i, flag)
+        for i in indices:
+            self.set(i, flag)
+
+
+class TeamScores:
+    """Score array for N teams with an incrementally maintained ranking.
+
+    Teams are 1-based. Each score change moves one team between score
+    buckets, so the leader and tie checks never re-sort the whole table.
+    """
+
+    def __init__(self, team_count: int = 0):
+        self._scores = array("q")
+        self._buckets: Dict[int, set] = {}
+        self._distinct: List[int] = []  # ascending distinct scores
+        self.resize(team_count)
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def get(self, team: int) -> int:
+        if not 1 <= team <= len(self._scores):
+            return 0
+        return self._scores[team - 1]
+
+    def set(self, team: int, score: int) -> bool:
+        old = self._scores[team - 1]
+        if old == score:
+            return False
+        self._unbucket(team, old)
+        self._scores[team - 1] = score
+        self._bucket(team, score)
+        return True
+
+    def resize(self, team_count: int):
+        team_count = max(0, team_count)
+        while len(self._scores) > team_count:
+            self._unbucket(len(self._scores), self._scores.pop())
+        while len(self._scores) < team_count:
+            self._scores.append(0)
+            self._bucket(len(self._scores), 0)
+
+    def reset(self):
+        team_count = len(self._scores)
+        self._scores = array("q", bytes(8 * team_count))
+        self._buckets = {0: set(range(1, team_count + 1))} if team_count else {}
+        self._distinct = [0] if team_count else []
+
+    def _bucket(self, team: int, score: int):
+        bucket = self._buckets.get(score)
+        if bucket is None:
+            bucket = self._buckets[score] = set()
+            insort(self._distinct, score)
+        bucket.add(team)
+
+    def _unbucket(self, team: int, score: int):
+        bucket = self._buckets[score]
+        bucket.discard(team)
+        if not bucket:
+            del self._buckets[score]
+            del self._distinct[bisect_left(self._distinct, score)]
+
+    def leaders(self) -> Tuple[int, set]:
+        """Return the top score and the set of teams holding it."""
+        if not self._distinct:
+            return 0, set()
+        top = self._distinct[-1]
+        return top, self._buckets[top]
+
+    def ranking(self, limit: Optional[int] = None) -> List[Dict[str, int]]:
+        """Teams ordered by score (ties share a rank, then team number)."""
+        rows: List[Dict[str, int]] = []
+        rank = 1
+        for score in reversed(self._distinct):
+            for team in sorted(self._buckets[score]):
+                if limit is not None and len(rows) >= limit:
+                    return rows
+                rows.append({"rank": rank, "team": team, "score": score})
+            rank += len(self._buckets[score])
+        return rows
+
+    def to_list(self) -> List[int]:
+        return self._scores.tolist()
+
+
 @dataclass
 class GameState:
-    team1_score: int = 0
-    team2_score: int = 0
-    team3_score: int = 0
-    team4_score: int = 0
-
     remaining_questions: int = 0
-    answered_questions: List[int] = field(default_factory=list)
     current_question_index: Optional[int] = None
     current_team: int = 1
 
@@ -63,15 +435,96 @@ class GameState:
     game_finished: bool = False
     tiebreaker_active: bool = False
     tiebreaker_used: bool = False
+    # The round being played ({seed, size, by, weights, question_ids}), or
+    # None to play the whole bank
+    question_round: Optional[Dict[str, Any]] = None
 
-    timed_out_questions: List[int] = field(default_factory=list)
     questions_results: Dict[int, Dict[str, Any]] = field(default_factory=dict)
 
+    def __post_init__(self):
+        self._status = QuestionStatus()
+        self._scores = TeamScores(DEFAULT_TEAM_COUNT)
+        self._round_ids: Tuple[Any, set] = (None, set())
+        # Change journal: (version, kind, key) entries, oldest first. Any
+        # version older than _floor is no longer covered by the journal and
+        # must be answered with a full snapshot.
+        self._version = 0
+        self._floor = 0
+        self._journal: Deque[Tuple[int, str, Any]] = deque()
+        self._on_change: Optional[Callable[[], None]] = None
+
+    def __setattr__(self, name: str, value: Any):
+        tracking = "_journal" in self.__dict__ and not name.startswith("_")
+        if tracking and name not in QUESTION_STATE_FIELDS:
+            if self.__dict__.get(name, _MISSING) == value:
+                return
+            object.__setattr__(self, name, value)
+            self._record("field", name)
+            return
+        object.__setattr__(self, name, value)
+        if tracking:
+            # Wholesale replacement of per-question data cannot be expressed
+            # as a delta.
+            self.invalidate()
+
+    def _record(self, kind: str, key: Any):
+        self._version += 1
+        self._journal.append((self._version, kind, key))
+        if len(self._journal) > STATE_JOURNAL_LIMIT:
+            self._floor = self._journal.popleft()[0]
+        if self._on_change:
+            self._on_change()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    # List views kept for compatibility; prefer is_answered()/is_timed_out()
+    @property
+    def answered_questions(self) -> List[int]:
+        return self._status.indices(QUESTION_ANSWERED)
+
+    @answered_questions.setter
+    def answered_questions(self, indices: List[int]):
+        self._status.replace(QUESTION_ANSWERED, indices)
+
+    @property
+    def timed_out_questions(self) -> List[int]:
+        return self._status.indices(QUESTION_TIMED_OUT)
+
+    @timed_out_questions.setter
+    def timed_out_questions(self, indices: List[int]):
+        self._status.replace(QUESTION_TIMED_OUT, indices)
+
+    @property
+    def answered_count(self) -> int:
+        return self._status.count(QUESTION_ANSWERED)
+
+    def is_answered(self, question_index: int) -> bool:
+        return self._status.has(question_index, QUESTION_ANSWERED)
+
+    def is_timed_out(self, question_index: int) -> bool:
+        return self._status.has(question_index, QUESTION_TIMED_OUT)
+
+    def in_round(self, question_id: int) -> bool:
+        """Whether a regular question is played in this game (all are without a round)."""
+        if self.question_round is None:
+            return True
+        ids = self.question_round["question_ids"]
+        if self._round_ids[0] is not ids:
+            self._round_ids = (ids, set(ids))
+        return question_id in self._round_ids[1]
+
+    def invalidate(self):
+        """Bump the version and force the next delta request to a full snapshot."""
+        self._version += 1
+        self._floor = self._version
+        self._journal.clear()
+        if self._on_change:
+            self._on_change()
+
     def reset(self, total_questions: int):
-        self.team1_score = 0
-        self.team2_score = 0
-        self.team3_score = 0
-        self.team4_score = 0
+        self._scores.reset()
         self.remaining_questions = max(0, total_questions - 1)
         self.answered_questions = []
         self.current_question_index = None
@@ -81,17 +534,79 @@ class GameState:
         self.game_finished = False
         self.tiebreaker_active = False
         self.tiebreaker_used = False
+        self.question_round = None
         self.timed_out_questions = []
         self.questions_results = {}
+        self.invalidate()
+
+    # -------------- Team scores --------------
+    @property
+    def team_count(self) -> int:
+        return len(self._scores)
+
+    def set_team_count(self, team_count: int):
+        """Resize the score table; removed teams lose their scores."""
+        if team_count != len(self._scores):
+            self._scores.resize(team_count)
+            self.invalidate()
+
+    def get_score(self, team: int) -> int:
+        return self._scores.get(team)
+
+    def set_score(self, team: int, score: int):
+        if self._scores.set(team, score):
+            self._record("score", team)
+
+    def leaders(self) -> Tuple[int, set]:
+        return self._scores.leaders()
+
+    def leaderboard(self, limit: Optional[int] = None) -> List[Dict[str, int]]:
+        return self._scores.ranking(limit)
+
+    # -------------- Per-question mutations --------------
+    def mark_answered(self, question_index: int) -> bool:
+        if not self._status.set(question_index, QUESTION_ANSWERED):
+            return False
+        self._record("question", question_index)
+        return True
+
+    def mark_timed_out(self, question_index: int):
+        if self._status.set(question_index, QUESTION_TIMED_OUT):
+            self._record("question", question_index)
+
+    def clear_timed_out(self, question_index: int):
+        if self._status.clear(question_index, QUESTION_TIMED_OUT):
+            self._record("question", question_index)
 
+    def record_result(self, question_index: int, team: int, correct: bool):
+        self.questions_results[question_index] = {
+            "team": team,
+            "correct": bool(correct),
+        }
+        self._record("question", question_index)
+
+    def forget_question(self, question_index: int):
+        """Drop all state for a deleted question."""
+        changed = self._status.clear(question_index, QUESTION_ANSWERED)
+        changed = self._status.clear(question_index, QUESTION_TIMED_OUT) or changed
+        changed = self.questions_results.pop(question_index, None) is not None or changed
+        if changed:
+            self._record("question", question_index)
+
+    def question_status(self, question_index: int) -> Dict[str, Any]:
+        return {
+            "answered": self.is_answered(question_index),
+            "timed_out": self.is_timed_out(question_index),
+            "result": self.questions_results.get(question_index),
+        }
+
+    # -------------- Serialization --------------
     def to_dict(self) -> Dict[str, Any]:
         return {
-            "team1_score": self.team1_score,
-            "team2_score": self.team2_score,
-            "team3_score": self.team3_score,
-            "team4_score": self.team4_score,
+            "version": self._version,
+            **self.score_dict(),
             "remaining_questions": self.remaining_questions,
-            "answered_questions": list(self.answered_questions),
+            "answered_questions": self.answered_questions,
             "current_question_index": self.current_question_index,
             "current_team": self.current_team,
             "wheel_spun": self.wheel_spun,
@@ -99,35 +614,144 @@ class GameState:
             "game_finished": self.game_finished,
             "tiebreaker_active": self.tiebreaker_active,
             "tiebreaker_used": self.tiebreaker_used,
-            "timed_out_questions": list(self.timed_out_questions),
+            "question_round": self.question_round,
+            "timed_out_questions": self.timed_out_questions,
             "questions_results": dict(self.questions_results),
         }
 
+    def score_dict(self) -> Dict[str, int]:
+        return {
+            f"team{team}_score": score
+            for team, score in enumerate(self._scores.to_list(), start=1)
+        }
+
+    def restore(self, data: Dict[str, Any]):
+        """Load a to_dict() snapshot; the version never moves backwards."""
+        scores = {
+            int(m.group(1)): value
+            for m, value in ((TEAM_SCORE_KEY.fullmatch(k), v) for k, v in data.items())
+            if m
+        }
+        self._scores = TeamScores(max(scores, default=DEFAULT_TEAM_COUNT))
+        for team, score in scores.items():
+            self._scores.set(team, score)
+        for name in (
+            "remaining_questions",
+            "current_question_index",
+            "current_team",
+            "wheel_spun",
+            "game_started",
+            "game_finished",
+            "tiebreaker_active",
+            "tiebreaker_used",
+            "question_round",
+        ):
+            if name in data:
+                object.__setattr__(self, name, data[name])
+        for flag, key in (
+            (QUESTION_ANSWERED, "answered_questions"),
+            (QUESTION_TIMED_OUT, "timed_out_questions"),
+        ):
+            self._status.replace(flag, [int(i) for i in data.get(key, [])])
+        object.__setattr__(
+            self,
+            "questions_results",
+            {int(k): v for k, v in data.get("questions_results", {}).items()},
+        )
+        self._version = max(self._version, int(data.get("version", 0)))
+        self.invalidate()
+
+    def apply_delta(self, delta: Dict[str, Any]):
+        """Replay a delta_since() payload on top of the current state."""
+        if delta.get("full"):
+            self.restore(delta["game_state"])
+            return
+        for name, value in delta.get("changes", {}).items():
+            match = TEAM_SCORE_KEY.fullmatch(name)
+            if match:
+                self.set_score(int(match.group(1)), value)
+            else:
+                setattr(self, name, value)
+        for key, status in delta.get("questions", {}).items():
+            idx = int(key)
+            for flag, on in (
+                (QUESTION_ANSWERED, status["answered"]),
+                (QUESTION_TIMED_OUT, status["timed_out"]),
+            ):
+                if on:
+                    self._status.set(idx, flag)
+                else:
+                    self._status.clear(idx, flag)
+            if status.get("result"):
+                self.questions_results[idx] = status["result"]
+            else:
+                self.questions_results.pop(idx, None)
+            self._record("question", idx)
+        self._version = max(self._version, int(delta.get("version", 0)))
+
+    def delta_since(self, since_version: int) -> Dict[str, Any]:
+        """Return only what changed after ``since_version``.
+
+        Falls back to a full snapshot when the version is unknown, was
+        invalidated by a reset or has aged out of the journal.
+        """
+        if not self._floor <= since_version <= self._version:
+            return {"full": True, "version": self._version, "game_state": self.to_dict()}
+        changed = {"field": set(), "score": set(), "question": set()}
+        for version, kind, key in reversed(self._journal):
+            if version <= since_version:
+                break
+            changed[kind].add(key)
+        changes = {name: getattr(self, name) for name in changed["field"]}
+        for team in changed["score"]:
+            changes[f"team{team}_score"] = self._scores.get(team)
+        return {
+            "full": False,
+            "version": self._version,
+            "since": since_version,
+            "changes": changes,
+            "questions": {idx: self.question_status(idx) for idx in changed["question"]},
+        }
+
 
 @dataclass
 class Settings:
-    team1_name: str = "team1"
-    team2_name: str = "team2"
-    team3_name: str = " team3"
-    team4_name: str = " team4"
+    team_names: List[str] = field(
+        default_factory=lambda: ["team1", "team2", " team3", " team4"]
+    )
     timer_duration: int = 30
     points_correct: int = 2
     points_wrong: int = 0
     enable_sound: bool = True
     enable_music: bool = True
-    number_of_teams: int = 2
+    number_of_teams: int = DEFAULT_TEAM_COUNT
+    # Bumped on every update() so the state log knows when to record settings
+    revision: int = field(default=0, compare=False, repr=False)
 
     def update(self, new_settings: Dict[str, Any]):
+        self.revision += 1
         for key, value in new_settings.items():
-            if hasattr(self, key):
+            match = TEAM_NAME_KEY.fullmatch(key)
+            if match:
+                self.set_team_name(int(match.group(1)), value)
+            elif hasattr(self, key) and key != "revision":
                 setattr(self, key, value)
 
+    def set_team_name(self, team_num: int, name: str):
+        if not 1 <= team_num <= MAX_TEAMS:
+            return
+        while len(self.team_names) < team_num:
+            self.team_names.append(f"team{len(self.team_names) + 1}")
+        self.team_names[team_num - 1] = name
+
     def to_dict(self) -> Dict[str, Any]:
+        # Names are flattened to team<N>_name keys for the web front ends
+        name_slots = max(len(self.team_names), self.number_of_teams)
         return {
-            "team1_name": self.team1_name,
-            "team2_name": self.team2_name,
-            "team3_name": self.team3_name,
-            "team4_name": self.team4_name,
+            **{
+                f"team{i}_name": self._team_name(i)
+                for i in range(1, name_slots + 1)
+            },
             "timer_duration": self.timer_duration,
             "points_correct": self.points_correct,
             "points_wrong": self.points_wrong,
@@ -136,152 +760,2523 @@ class Settings:
             "number_of_teams": self.number_of_teams,
         }
 
+    def _team_name(self, team_num: int) -> str:
+        if team_num <= len(self.team_names):
+            return self.team_names[team_num - 1]
+        return f"team{team_num}"
+
     def get_team_name(self, team_num: int) -> Optional[str]:
         if not 1 <= team_num <= self.number_of_teams:
             return None
-        return getattr(self, f"team{team_num}_name", None)
+        return self._team_name(team_num)
 
 
 # =========================
-# Game Manager
+# Question Store
 # =========================
-class GameManager:
-    def __init__(self):
-        self.questions: List[Question] = self._load_default_questions()
-        self.state = GameState(remaining_questions=max(0, len(self.questions) - 1))
-        self.settings = Settings()
-        self.player_window: Optional[webview.Window] = None
-        self.admin_window: Optional[webview.Window] = None
-        self._sync_lock = threading.Lock()
+class QuestionPayloadCache:
+    """Ready-built payloads of one store's questions, keyed by (id, include_answer).
 
-    def _load_default_questions(self) -> List[Question]:
-        default_data = [
-            {
-                "question": "What is the average blink rate per minute?",
-                "options": ["5-10", "15-20", "25-30", "35-40"],
-                "correct": 1,
-            },
-            {
-                "question": "Which of the following is a type of eye movement disorder?",
-                "options": ["Nystagmus", "Strabismus", "Amblyopia", "Ptosis"],
-                "correct": 0,
-            },
-            {
-                "question": "Which cranial nerve is responsible for innervating the lateral rectus muscle?",
-                "options": ["CN III", "CN IV", "CN V", "CN VI"],
-                "correct": 3,
-            },
-            {
-                "question": "Which layer of the cornea is responsible for most of its refractive power?",
-                "options": [
-                    "Epithelium",
-                    "Stroma",
-                    "Endothelium",
-                    "Descemet's membrane",
-                ],
-                "correct": 1,
-            },
-            {
-                "question": "Which structure is responsible for the 'double hump' sign seen during indentation gonioscopy?",
-                "options": [
-                    "Ciliary body cyst",
-                    "Plateau iris configuration",
-                    "Iris bombe",
-                    "Posterior synechiae",
-                ],
-                "correct": 1,
-            },
-            {
-                "question": "What is the mechanism of action of netarsudil in glaucoma therapy?",
-                "options": [
-                    "Carbonic anhydrase inhibition",
-                    "Alpha-2 adrenergic receptor agonism",
-                    "Rho kinase (ROCK) inhibition",
-                    "Prostaglandin analog receptor stimulation",
-                ],
-                "correct": 2,
-            },
-            {
-                "question": "Which color is most visible to the human eye?",
-                "options": ["Red", "Green", "Blue", "Yellow"],
-                "correct": 0,
-            },
-            {
-                "question": "Which medication is commonly used to treat CMV retinitis?",
-                "options": ["Ganciclovir", "Acyclovir", "Fluconazole", "Ciprofloxacin"],
-                "correct": 0,
-            },
-            {
-                "question": "If you stare at a bright light and see spots, what's the term for this phenomenon?",
-                "options": ["Phosphene", "Scotoma", "Floaters", "Photophobia"],
-                "correct": 0,
-            },
-            {
-                "question": "Which visual field defect is commonly associated with pituitary tumours?",
-                "options": [
-                    "Bitemporal hemianopia",
-                    "Central scotoma",
-                    "Homonymous hemianopia",
-                    "Quadrantanopia",
-                ],
-                "correct": 0,
-            },
-            {
-                "question": "What is the Watzke-Allen sign used to detect?",
-                "options": [
-                    "Central serous chorioretinopathy",
-                    "Full-thickness macular hole",
-                    "Epiretinal membrane",
-                    "Retinal detachment",
-                ],
-                "correct": 1,
-            },
-            {
-                "question": "Which mutation is linked to Best disease and what is its inheritance pattern?",
-                "options": [
-                    "ABCA4, autosomal recessive",
-                    "BEST1 (VMD2), autosomal dominant",
-                    "RPE65, X-linked",
-                    "RS1, X-linked recessive",
-                ],
-                "correct": 1,
-            },
-            {
-                "question": "Which famous artist had strabismus and may have seen the world differently?",
-                "options": ["Monet", "Van Gogh", "Picasso", "Rembrandt"],
-                "correct": 1,
-            },
-            {
-                "question": "Which animal has the best vision on Earth?",
-                "options": ["Human", "Eagle", "Mantis shrimp", "Owl"],
-                "correct": 2,
-            },
-            {
-                "question": "Which Disney princess had famously large, animated eyes?",
-                "options": ["Cinderella", "Ariel", "Rapunzel (from Tangled)", "Belle"],
-                "correct": 2,
-            },
-            {
-                "question": "What is the UAE's national day celebrated?",
-                "options": ["December 1", "December 2", "November 30", "January 1"],
-                "correct": 1,
-            },
-            {
-                "question": "What is a traditional form of Emirati hospitality?",
-                "options": [
-                    "Serving Turkish coffee",
-                    "Offering Arabic coffee and dates",
-                    "Serving mint tea only",
-                    "Offering rose water and sweets",
-                ],
-                "correct": 1,
-            },
-            {
-                "question": "In which year was the MEOM Academy established?",
-                "options": ["2015", "2018", "2019", "2020"],
-                "correct": 1,
-            },
-            {
+    Payloads are built on first use and dropped when their question is
+    edited or removed; a full replace clears them all. They are shared
+    between callers, who must not modify them. Hits take no lock (so the
+    hit counter is approximate under contention); once ``max_size`` is
+    reached the oldest entries go first.
+    """
+
+    def __init__(self, max_size: int = QUESTION_PAYLOAD_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: Dict[Tuple[int, bool], QuestionPayload] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        question_id: int,
+        include_answer: bool,
+        load: Callable[[int], Optional[Question]],
+    ) -> Optional[QuestionPayload]:
+        key = (question_id, include_answer)
+        payload = self._entries.get(key)
+        if payload is not None:
+            self.hits += 1
+            return payload
+        with self._lock:
+            self.misses += 1
+            generation = self._generation
+        question = load(question_id)
+        if question is None:
+            return None
+        payload = QuestionPayload(question.to_dict(include_answer))
+        with self._lock:
+            # An edit that landed while this was built would make it stale
+            if generation == self._generation:
+                self._entries[key] = payload
+                if len(self._entries) > self.max_size:
+                    del self._entries[next(iter(self._entries))]
+        return payload
+
+    def invalidate(self, question_id: int):
+        with self._lock:
+            self._generation += 1
+            self._entries.pop((question_id, True), None)
+            self._entries.pop((question_id, False), None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+        }
+
+
+def reordered_ids(
+    ids: List[int], moves: Iterable[Tuple[int, Optional[int]]]
+) -> List[int]:
+    """Apply ``(question_id, before_id)`` moves to ``ids`` in order.
+
+    Each id goes just before ``before_id``, or to the end when that is None.
+    The list is threaded once, so any number of moves costs O(len(ids)).
+    """
+    if not ids:
+        return []
+    prev: Dict[int, Optional[int]] = dict(zip(ids, [None] + ids[:-1]))
+    nxt: Dict[int, Optional[int]] = dict(zip(ids, ids[1:] + [None]))
+    head, tail = ids[0], ids[-1]
+    for question_id, before in moves:
+        if question_id == before:
+            continue
+        p, n = prev[question_id], nxt[question_id]
+        if p is None:
+            head = n
+        else:
+            nxt[p] = n
+        if n is None:
+            tail = p
+        else:
+            prev[n] = p
+        p = tail if before is None else prev[before]
+        prev[question_id], nxt[question_id] = p, before
+        if p is None:
+            head = question_id
+        else:
+            nxt[p] = question_id
+        if before is None:
+            tail = question_id
+        else:
+            prev[before] = question_id
+    order = []
+    node: Optional[int] = head
+    while node is not None:
+        order.append(node)
+        node = nxt[node]
+    return order
+
+
+class QuestionStore(ABC):
+    """Question bank keyed by stable ids.
+
+    Ids are never reused. Play order is kept separately from the ids, and
+    exactly one question carries the tiebreaker flag; it always sorts last.
+    Subclasses keep ``payloads`` and the change journal (``revision``) in
+    step with every add/update/remove.
+    """
+
+    payloads: QuestionPayloadCache
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    @abstractmethod
+    def __contains__(self, question_id: int) -> bool:
+        ...
+
+    def __iter__(self) -> Iterator[Question]:
+        return self.iter_range()
+
+    @property
+    @abstractmethod
+    def tiebreaker_id(self) -> Optional[int]:
+        ...
+
+    @abstractmethod
+    def get(self, question_id: int) -> Optional[Question]:
+        ...
+
+    def ids(self, start: int = 0, stop: Optional[int] = None) -> List[int]:
+        """Question ids in play order (tiebreaker last)."""
+        return [q.id for q in self.iter_range(start, stop)]
+
+    @abstractmethod
+    def iter_range(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Question]:
+        ...
+
+    @abstractmethod
+    def add(self, question: Question) -> int:
+        """Append a regular question (before the tiebreaker); return its id."""
+        ...
+
+    @abstractmethod
+    def update(self, question_id: int, question: Question):
+        ...
+
+    @abstractmethod
+    def remove(self, question_id: int):
+        ...
+
+    @abstractmethod
+    def replace_all(self, questions: Iterable[Question]):
+        """Replace the bank; the last question becomes the tiebreaker."""
+        ...
+
+    @abstractmethod
+    def reorder(self, moves: Iterable[Tuple[int, Optional[int]]]):
+        """Move regular questions (see reordered_ids); the order is rebuilt once.
+
+        Clients are sent the full list next time, since deltas carry no order.
+        """
+        ...
+
+    @contextmanager
+    def batch(self):
+        """Group several edits: an exception inside undoes all of them."""
+        yield
+
+    def close(self):
+        pass
+
+    # -------------- Cached payloads --------------
+    def payload(self, question_id: int, include_answer: bool = True) -> Optional[QuestionPayload]:
+        """Shared to_dict() of one question (see QuestionPayloadCache)."""
+        return self.payloads.get(question_id, include_answer, self.get)
+
+    def iter_payloads(self, include_answer: bool = True) -> Iterator[QuestionPayload]:
+        """Shared to_dict() of every question in play order."""
+        for question in self:
+            yield self._cached_payload(question, include_answer)
+
+    def _cached_payload(self, question: Question, include_answer: bool) -> QuestionPayload:
+        return self.payloads.get(question.id, include_answer, lambda _: question)
+
+    def payload_stats(self) -> Dict[str, Any]:
+        return self.payloads.stats()
+
+    # -------------- Revisions --------------
+    def _init_changes(self):
+        # Random per open store, so revisions from another run never match
+        self.bank_id = os.urandom(8).hex()
+        self.revision = 0
+        self._change_floor = 0
+        self._changes: Deque[Tuple[int, int]] = deque()
+
+    def _record_change(self, question_id: int):
+        self.revision += 1
+        self._changes.append((self.revision, question_id))
+        if len(self._changes) > QUESTION_JOURNAL_LIMIT:
+            self._change_floor = self._changes.popleft()[0]
+
+    def _reset_changes(self):
+        """Forget the journal; every older revision gets a full reload."""
+        self.revision += 1
+        self._change_floor = self.revision
+        self._changes.clear()
+
+    def _touched_since(self, revision: int) -> set:
+        """Ids added, edited or removed after ``revision`` (within the journal)."""
+        touched = set()
+        for changed_at, question_id in reversed(self._changes):
+            if changed_at <= revision:
+                break
+            touched.add(question_id)
+        return touched
+
+    def delta_since(
+        self, since_revision: Optional[int] = None, bank_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Questions changed and deleted after ``since_revision``.
+
+        Falls back to the full list when the revision is unknown, belongs to
+        another bank or has aged out of the journal. Changed questions come
+        in id order, which is the order they were added in.
+        """
+        head = {"bank": self.bank_id, "revision": self.revision}
+        if (
+            since_revision is None
+            or bank_id != self.bank_id
+            or not self._change_floor <= since_revision <= self.revision
+        ):
+            return {**head, "full": True, "modified": True, "questions": list(self.iter_payloads())}
+        touched = self._touched_since(since_revision)
+        changed, deleted = [], []
+        for question_id in sorted(touched):
+            payload = self.payload(question_id)
+            if payload is None:
+                deleted.append(question_id)
+            else:
+                changed.append(payload)
+        return {
+            **head,
+            "full": False,
+            "modified": bool(touched),
+            "since": since_revision,
+            "changed": changed,
+            "deleted": deleted,
+        }
+
+    # -------------- Derived indexes --------------
+    _index: Optional["QuestionSearchIndex"] = None
+    _pool: Optional["QuestionPool"] = None
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT) -> List[Tuple[int, float]]:
+        """(id, score) of the questions best matching ``query``, best first."""
+        return self._synced("_index", QuestionSearchIndex).search(query, limit)
+
+    def draw_round(
+        self,
+        size: int,
+        rng: random.Random,
+        weights: Optional[Dict[Any, float]] = None,
+        by: str = "category",
+    ) -> List[int]:
+        """Regular question ids for one round (see QuestionPool.draw)."""
+        return self._round_pool().draw(size, rng, weights, by)
+
+    def round_groups(self, by: str = "category") -> Dict[Any, int]:
+        """Regular questions per category (or difficulty level)."""
+        return self._round_pool().sizes(by)
+
+    def _round_pool(self) -> "QuestionPool":
+        return self._synced("_pool", QuestionPool)
+
+    def _synced(self, name: str, factory: Callable[[], Any]) -> Any:
+        """The derived index in attribute ``name`` (anything with add/remove
+        and bank_id/revision), built on first use and then caught up from
+        the change journal; a reset journal (import, reorder) rebuilds it."""
+        index = getattr(self, name)
+        if index is None or index.bank_id != self.bank_id or index.revision < self._change_floor:
+            index = factory()
+            setattr(self, name, index)
+            for question in self:
+                index.add(question)
+        elif index.revision != self.revision:
+            for question_id in self._touched_since(index.revision):
+                index.remove(question_id)
+                question = self.get(question_id)
+                if question is not None:
+                    index.add(question)
+        index.bank_id, index.revision = self.bank_id, self.revision
+        return index
+
+
+class MemoryQuestionStore(QuestionStore):
+    def __init__(self, questions: Iterable[Question] = ()):
+        self._next_id = 0
+        self._batch_depth = 0
+        self.payloads = QuestionPayloadCache()
+        self._init_changes()
+        self.replace_all(questions)
+
+    def __len__(self) -> int:
+        return len(self._regular) + (self._tiebreaker is not None)
+
+    def __contains__(self, question_id: int) -> bool:
+        return question_id in self._regular or (
+            self._tiebreaker is not None and self._tiebreaker.id == question_id
+        )
+
+    @property
+    def tiebreaker_id(self) -> Optional[int]:
+        return self._tiebreaker.id if self._tiebreaker else None
+
+    def get(self, question_id: int) -> Optional[Question]:
+        if self._tiebreaker is not None and self._tiebreaker.id == question_id:
+            return self._tiebreaker
+        return self._regular.get(question_id)
+
+    def iter_range(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Question]:
+        ordered = itertools.chain(
+            self._regular.values(), [self._tiebreaker] if self._tiebreaker else []
+        )
+        return itertools.islice(ordered, max(0, start), stop)
+
+    def _assign_id(self, question: Question) -> Question:
+        question.id = self._next_id
+        self._next_id += 1
+        return question
+
+    def add(self, question: Question) -> int:
+        question.tiebreaker = False
+        self._assign_id(question)
+        # dicts keep insertion order, so this is both the index and the order
+        self._regular[question.id] = question
+        self._record_change(question.id)
+        return question.id
+
+    def update(self, question_id: int, question: Question):
+        current = self.get(question_id)
+        question.id, question.tiebreaker = question_id, current.tiebreaker
+        if current.tiebreaker:
+            self._tiebreaker = question
+        else:
+            self._regular[question_id] = question
+        self.payloads.invalidate(question_id)
+        self._record_change(question_id)
+
+    def remove(self, question_id: int):
+        del self._regular[question_id]
+        self.payloads.invalidate(question_id)
+        self._record_change(question_id)
+
+    def reorder(self, moves: Iterable[Tuple[int, Optional[int]]]):
+        order = reordered_ids(list(self._regular), moves)
+        self._regular = {question_id: self._regular[question_id] for question_id in order}
+        self._reset_changes()
+
+    @contextmanager
+    def batch(self):
+        if self._batch_depth:
+            yield
+            return
+        # Edits replace Question objects rather than change them, so copies
+        # of the two containers are enough to put the bank back
+        regular, tiebreaker = dict(self._regular), self._tiebreaker
+        self._batch_depth += 1
+        try:
+            yield
+        except BaseException:
+            self._regular, self._tiebreaker = regular, tiebreaker
+            self.payloads.clear()
+            self._reset_changes()
+            raise
+        finally:
+            self._batch_depth -= 1
+
+    @classmethod
+    def adopt(cls, questions: Iterable[Question]) -> "MemoryQuestionStore":
+        """A store over questions that keep their ids; the last is the tiebreaker."""
+        store = cls()
+        questions = list(questions)
+        store._regular = {q.id: q for q in questions[:-1]}
+        store._tiebreaker = questions[-1] if questions else None
+        store._next_id = max((q.id for q in questions), default=-1) + 1
+        return store
+
+    def replace_all(self, questions: Iterable[Question]):
+        self.payloads.clear()
+        self._reset_changes()
+        self._regular: Dict[int, Question] = {}
+        self._tiebreaker: Optional[Question] = None
+        previous = None
+        for question in questions:
+            if previous is not None:
+                self._regular[previous.id] = previous
+            previous = self._assign_id(question)
+            previous.tiebreaker = False
+        if previous is not None:
+            previous.tiebreaker = True
+            self._tiebreaker = previous
+
+
+class SQLiteQuestionStore(QuestionStore):
+    """SQLite-backed bank. Opening is O(1); question bodies are read on demand
+    through a small LRU cache and every edit is committed as it happens.
+
+    Play order is a sparse ``position`` column, so adding and removing a
+    question touches only that row. The question count is kept in the
+    ``meta`` table, in the same transaction as the rows it counts.
+    """
+
+    def __init__(self, path: str, cache_size: int = QUESTION_CACHE_SIZE):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._cache: "OrderedDict[int, Question]" = OrderedDict()
+        self._cache_size = cache_size
+        self.payloads = QuestionPayloadCache()
+        self._init_changes()
+        self._tiebreaker_id: Any = _MISSING
+        self._count: Any = _MISSING
+        self._batch_depth = 0
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS questions ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " position INTEGER NOT NULL,"
+                " question TEXT NOT NULL,"
+                " options TEXT NOT NULL,"
+                " correct INTEGER NOT NULL,"
+                " tiebreaker INTEGER NOT NULL DEFAULT 0,"
+                " category TEXT NOT NULL DEFAULT '',"
+                " difficulty INTEGER NOT NULL DEFAULT 0)"
+            )
+            columns = {r[1] for r in self._conn.execute("PRAGMA table_info(questions)")}
+            if "tiebreaker" not in columns:
+                # Banks written before the explicit flag: the last row is the tiebreaker
+                self._conn.execute(
+                    "ALTER TABLE questions ADD COLUMN tiebreaker INTEGER NOT NULL DEFAULT 0"
+                )
+                self._conn.execute(
+                    "UPDATE questions SET tiebreaker = 1 WHERE id ="
+                    " (SELECT id FROM questions ORDER BY position DESC LIMIT 1)"
+                )
+            if "category" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE questions ADD COLUMN category TEXT NOT NULL DEFAULT ''"
+                )
+                self._conn.execute(
+                    "ALTER TABLE questions ADD COLUMN difficulty INTEGER NOT NULL DEFAULT 0"
+                )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            if self._conn.execute("SELECT 1 FROM meta WHERE key = 'count'").fetchone() is None:
+                # Banks written before the meta table are counted once
+                self._conn.execute(
+                    "INSERT INTO meta (key, value) SELECT 'count', COUNT(*) FROM questions"
+                )
+            self._conn.execute("DROP INDEX IF EXISTS idx_questions_position")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_questions_order"
+                " ON questions(tiebreaker, position)"
+            )
+
+    @staticmethod
+    def _text(value: str) -> str:
+        # Joins escaped surrogate pairs (e.g. the tiebreaker trophy) into real
+        # characters; SQLite only accepts valid UTF-8.
+        return value.encode("utf-16", "surrogatepass").decode("utf-16", "replace")
+
+    @staticmethod
+    def _question(row: Tuple[int, str, str, int, int, str, int]) -> Question:
+        question_id, text, options, correct, tiebreaker, category, difficulty = row
+        return Question(
+            id=question_id,
+            question=text,
+            options=json.loads(options),
+            correct=correct,
+            tiebreaker=bool(tiebreaker),
+            category=category,
+            difficulty=difficulty,
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._count is _MISSING:
+                self._count = self._conn.execute(
+                    "SELECT value FROM meta WHERE key = 'count'"
+                ).fetchone()[0]
+            return self._count
+
+    def _write_count(self, count: int):
+        """Store the question count; call inside _writing()."""
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('count', ?)", (count,))
+        self._count = count
+
+    def __contains__(self, question_id: int) -> bool:
+        return self.get(question_id) is not None
+
+    @property
+    def tiebreaker_id(self) -> Optional[int]:
+        with self._lock:
+            if self._tiebreaker_id is _MISSING:
+                row = self._conn.execute(
+                    "SELECT id FROM questions WHERE tiebreaker = 1 LIMIT 1"
+                ).fetchone()
+                self._tiebreaker_id = row[0] if row else None
+            return self._tiebreaker_id
+
+    def get(self, question_id: int) -> Optional[Question]:
+        with self._lock:
+            question = self._cache.get(question_id)
+            if question is None:
+                row = self._conn.execute(
+                    "SELECT id, question, options, correct, tiebreaker, category, difficulty"
+                    " FROM questions WHERE id = ?",
+                    (question_id,),
+                ).fetchone()
+                if row is None:
+                    return None
+                question = self._cache[question_id] = self._question(row)
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.move_to_end(question_id)
+        return Question(
+            id=question.id,
+            question=question.question,
+            options=list(question.options),
+            correct=question.correct,
+            tiebreaker=question.tiebreaker,
+            category=question.category,
+            difficulty=question.difficulty,
+        )
+
+    def iter_range(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Question]:
+        # Keyset paging: only one page of rows is held at a time
+        remaining = None if stop is None else max(0, stop - max(0, start))
+        key: Optional[Tuple[int, int]] = None
+        while remaining is None or remaining > 0:
+            limit = QUESTION_PAGE_SIZE if remaining is None else min(QUESTION_PAGE_SIZE, remaining)
+            with self._lock:
+                if key is None:
+                    rows = self._conn.execute(
+                        "SELECT id, question, options, correct, tiebreaker, category,"
+                        " difficulty, position"
+                        " FROM questions ORDER BY tiebreaker, position LIMIT ? OFFSET ?",
+                        (limit, max(0, start)),
+                    ).fetchall()
+                else:
+                    rows = self._conn.execute(
+                        "SELECT id, question, options, correct, tiebreaker, category,"
+                        " difficulty, position"
+                        " FROM questions WHERE (tiebreaker, position) > (?, ?)"
+                        " ORDER BY tiebreaker, position LIMIT ?",
+                        (*key, limit),
+                    ).fetchall()
+            for row in rows:
+                yield self._question(row[:7])
+            if len(rows) < limit:
+                return
+            key = (rows[-1][4], rows[-1][7])
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def add(self, question: Question) -> int:
+        with self._writing():
+            cur = self._conn.execute(
+                "INSERT INTO questions"
+                " (position, question, options, correct, tiebreaker, category, difficulty)"
+                " SELECT COALESCE(MAX(position), 0) + 1, ?, ?, ?, 0, ?, ?"
+                " FROM questions WHERE tiebreaker = 0",
+                (
+                    self._text(question.question),
+                    json.dumps(question.options),
+                    question.correct,
+                    self._text(question.category),
+                    question.difficulty,
+                ),
+            )
+            self._write_count(len(self) + 1)
+            self._record_change(cur.lastrowid)
+            return cur.lastrowid
+
+    def update(self, question_id: int, question: Question):
+        with self._writing():
+            self._conn.execute(
+                "UPDATE questions SET question = ?, options = ?, correct = ?,"
+                " category = ?, difficulty = ? WHERE id = ?",
+                (
+                    self._text(question.question),
+                    json.dumps(question.options),
+                    question.correct,
+                    self._text(question.category),
+                    question.difficulty,
+                    question_id,
+                ),
+            )
+            self._cache.pop(question_id, None)
+            self.payloads.invalidate(question_id)
+            self._record_change(question_id)
+
+    def remove(self, question_id: int):
+        with self._writing():
+            cur = self._conn.execute("DELETE FROM questions WHERE id = ?", (question_id,))
+            self._write_count(len(self) - cur.rowcount)
+            self._cache.pop(question_id, None)
+            self.payloads.invalidate(question_id)
+            self._record_change(question_id)
+
+    def replace_all(self, questions: Iterable[Question]):
+        with self._writing():
+            self._conn.execute("DELETE FROM questions")
+            cur = self._conn.executemany(
+                "INSERT INTO questions"
+                " (position, question, options, correct, category, difficulty)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        i,
+                        self._text(q.question),
+                        json.dumps(q.options),
+                        q.correct,
+                        self._text(q.category),
+                        q.difficulty,
+                    )
+                    for i, q in enumerate(questions, start=1)
+                ),
+            )
+            self._write_count(cur.rowcount)
+            self._conn.execute(
+                "UPDATE questions SET tiebreaker = 1 WHERE id ="
+                " (SELECT id FROM questions ORDER BY position DESC LIMIT 1)"
+            )
+            self._cache.clear()
+            self.payloads.clear()
+            self._reset_changes()
+            self._tiebreaker_id = _MISSING
+
+    def reorder(self, moves: Iterable[Tuple[int, Optional[int]]]):
+        with self._writing():
+            ids = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT id FROM questions WHERE tiebreaker = 0 ORDER BY position"
+                )
+            ]
+            self._conn.executemany(
+                "UPDATE questions SET position = ? WHERE id = ?",
+                ((i, question_id) for i, question_id in enumerate(reordered_ids(ids, moves), 1)),
+            )
+            self._reset_changes()
+
+    @contextmanager
+    def _writing(self):
+        # Inside batch() the batch's transaction commits (or rolls back) everything
+        with self._lock:
+            if self._batch_depth:
+                yield
+                return
+            try:
+                with self._conn:
+                    yield
+            except BaseException:
+                self._count = _MISSING  # rolled back with the rows
+                raise
+
+    @contextmanager
+    def batch(self):
+        with self._lock:
+            if self._batch_depth:
+                yield
+                return
+            self._batch_depth += 1
+            try:
+                with self._conn:
+                    yield
+            except BaseException:
+                # Rolled back: drop anything cached from inside the batch
+                self._cache.clear()
+                self.payloads.clear()
+                self._reset_changes()
+                self._tiebreaker_id = _MISSING
+                self._count = _MISSING
+                raise
+            finally:
+                self._batch_depth -= 1
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class QuestionBankView(QuestionStore):
+    """Copy-on-write view of a shared bank for one game session.
+
+    Reads fall through to ``base``, whose questions are shared by every
+    session and never modified here. Edits are kept in small per-view
+    overlays, and a full replace (import) gives the view a private bank.
+    Questions added to a view get ids from VIEW_QUESTION_ID_BASE up, so
+    they never collide with ids the base hands out later. Edits made to
+    the base itself reach the view's journal as a full reload.
+    """
+
+    def __init__(self, base: QuestionStore):
+        self._base = base
+        self._own: Optional[MemoryQuestionStore] = None
+        self._edited: Dict[int, Question] = {}
+        self._added: Dict[int, Question] = {}
+        self._removed: set = set()
+        self._next_id = VIEW_QUESTION_ID_BASE
+        # Only for the overlays; untouched questions use the base's shared cache
+        self.payloads = QuestionPayloadCache()
+        self._init_changes()
+        self._base_seen = (base.bank_id, base.revision)
+
+    def _pristine(self) -> bool:
+        return not (self._edited or self._added or self._removed)
+
+    def __len__(self) -> int:
+        if self._own is not None:
+            return len(self._own)
+        return len(self._base) - len(self._removed) + len(self._added)
+
+    def __contains__(self, question_id: int) -> bool:
+        return self.get(question_id) is not None
+
+    @property
+    def tiebreaker_id(self) -> Optional[int]:
+        if self._own is not None:
+            return self._own.tiebreaker_id
+        return self._base.tiebreaker_id
+
+    def get(self, question_id: int) -> Optional[Question]:
+        if self._own is not None:
+            return self._own.get(question_id)
+        if question_id in self._removed:
+            return None
+        question = self._edited.get(question_id) or self._added.get(question_id)
+        return question if question is not None else self._base.get(question_id)
+
+    def iter_range(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Question]:
+        if self._own is not None:
+            return self._own.iter_range(start, stop)
+        if self._pristine():
+            return self._base.iter_range(start, stop)
+        return itertools.islice(self._merged(), max(0, start), stop)
+
+    def _merged(self) -> Iterator[Question]:
+        tiebreaker = None
+        for question in self._base:
+            if question.tiebreaker:
+                tiebreaker = question
+            elif question.id not in self._removed:
+                yield self._edited.get(question.id, question)
+        yield from self._added.values()
+        if tiebreaker is not None:
+            yield self._edited.get(tiebreaker.id, tiebreaker)
+
+    def add(self, question: Question) -> int:
+        if self._own is not None:
+            question_id = self._own.add(question)
+        else:
+            question.id, question.tiebreaker = self._next_id, False
+            self._next_id += 1
+            self._added[question.id] = question
+            question_id = question.id
+        self._record_change(question_id)
+        return question_id
+
+    def update(self, question_id: int, question: Question):
+        if self._own is not None:
+            self._own.update(question_id, question)
+        else:
+            question.id = question_id
+            if question_id in self._added:
+                question.tiebreaker = False
+                self._added[question_id] = question
+            else:
+                question.tiebreaker = question_id == self._base.tiebreaker_id
+                self._edited[question_id] = question
+            self.payloads.invalidate(question_id)
+        self._record_change(question_id)
+
+    def remove(self, question_id: int):
+        if self._own is not None:
+            self._own.remove(question_id)
+        else:
+            if self._added.pop(question_id, None) is None:
+                self._removed.add(question_id)
+                self._edited.pop(question_id, None)
+            self.payloads.invalidate(question_id)
+        self._record_change(question_id)
+
+    def replace_all(self, questions: Iterable[Question]):
+        self._own = MemoryQuestionStore(questions)
+        self._edited, self._added, self._removed = {}, {}, set()
+        self.payloads.clear()
+        self._reset_changes()
+
+    def reorder(self, moves: Iterable[Tuple[int, Optional[int]]]):
+        if self._own is None:
+            # A private order needs a private bank; ids stay as they are
+            self._own = MemoryQuestionStore.adopt(self._merged())
+            self._edited, self._added, self._removed = {}, {}, set()
+            self.payloads.clear()
+        self._own.reorder(moves)
+        self._reset_changes()
+
+    @contextmanager
+    def batch(self):
+        own = self._own
+        saved = (own, dict(self._edited), dict(self._added), set(self._removed))
+        with own.batch() if own is not None else nullcontext():
+            try:
+                yield
+            except BaseException:
+                self._own, self._edited, self._added, self._removed = saved
+                self.payloads.clear()
+                self._reset_changes()
+                raise
+
+    def delta_since(
+        self, since_revision: Optional[int] = None, bank_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        base_now = (self._base.bank_id, self._base.revision)
+        if self._own is None and base_now != self._base_seen:
+            self._reset_changes()
+        self._base_seen = base_now
+        return super().delta_since(since_revision, bank_id)
+
+    def _overlaid(self, question_id: int) -> bool:
+        return question_id in self._edited or question_id in self._added
+
+    def payload(self, question_id: int, include_answer: bool = True) -> Optional[QuestionPayload]:
+        if self._own is not None:
+            return self._own.payload(question_id, include_answer)
+        if question_id in self._removed:
+            return None
+        if self._overlaid(question_id):
+            return super().payload(question_id, include_answer)
+        return self._base.payload(question_id, include_answer)
+
+    def _cached_payload(self, question: Question, include_answer: bool) -> QuestionPayload:
+        if self._own is not None:
+            return self._own._cached_payload(question, include_answer)
+        if self._overlaid(question.id):
+            return super()._cached_payload(question, include_answer)
+        return self._base._cached_payload(question, include_answer)
+
+    def payload_stats(self) -> Dict[str, Any]:
+        own = self._own.payload_stats() if self._own is not None else self.payloads.stats()
+        return {**own, "shared": self._base.payload_stats()}
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT) -> List[Tuple[int, float]]:
+        if self._own is not None:
+            return self._own.search(query, limit)
+        base = self._base._synced("_index", QuestionSearchIndex)
+        if self._pristine():
+            return base.search(query, limit)
+        # The base index is shared: drop its hits the overlays hide or replace,
+        # and score the overlays with the same term statistics so both merge
+        overlay = self._overlay_index()
+        hidden = len(self._removed) + len(self._edited)
+        hits = [
+            hit
+            for hit in base.search(query, limit + hidden, shared=(overlay,))
+            if hit[0] not in self._removed and hit[0] not in self._edited
+        ]
+        hits += overlay.search(query, limit, shared=(base,))
+        return heapq.nlargest(limit, hits, key=lambda hit: hit[1])
+
+    def _round_pool(self) -> "QuestionPool":
+        if self._own is not None:
+            return self._own._round_pool()
+        if self._pristine():
+            return self._base._round_pool()
+        # Overlays change the groups themselves, so the view pools its merged bank
+        stamp = (self.revision, self._base.bank_id, self._base.revision)
+        pool = self._pool
+        if pool is None or pool.revision != stamp:
+            pool = self._pool = QuestionPool()
+            for question in self._merged():
+                pool.add(question)
+            pool.revision = stamp
+        return pool
+
+    def _overlay_index(self) -> "QuestionSearchIndex":
+        index = self._index
+        if index is None or index.revision != self.revision:
+            index = self._index = QuestionSearchIndex()
+            for question in itertools.chain(self._edited.values(), self._added.values()):
+                index.add(question)
+            index.revision = self.revision
+        return index
+
+
+def open_question_store(path: Optional[str] = None) -> Optional[QuestionStore]:
+    """Open the bank at ``path`` (or $MEOM_QUESTION_DB); None means in-memory defaults."""
+    path = path or os.environ.get("MEOM_QUESTION_DB")
+    if not path:
+        return None
+    return SQLiteQuestionStore(path)
+
+
+# =========================
+# Question search
+# =========================
+SEARCH_TERM = re.compile(r"\w+")
+
+
+def search_terms(text: str) -> List[str]:
+    """Case-folded words of ``text``, as indexed and searched."""
+    return [sys.intern(term) for term in SEARCH_TERM.findall(text.casefold())]
+
+
+def question_terms(question: Question) -> List[str]:
+    terms = search_terms(question.question)
+    for option in question.options:
+        terms += search_terms(option)
+    return terms
+
+
+class QuestionSearchIndex:
+    """Inverted index over question text and options, ranked with BM25.
+
+    Each word maps to parallel arrays of question ids and term counts, so a
+    100k bank stays at a few MB. Stores keep it current through their change
+    journal (see QuestionStore.search); ``bank_id``/``revision`` say how far.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._terms: Dict[int, Tuple[str, ...]] = {}
+        self._lengths: Dict[int, int] = {}
+        self._total_length = 0
+        self.bank_id: Optional[str] = None
+        self.revision = -1
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, question: Question):
+        terms = question_terms(question)
+        counts = Counter(terms)
+        for term, count in counts.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = (array("q"), array("H"))
+            posting[0].append(question.id)
+            posting[1].append(min(count, 0xFFFF))
+        self._terms[question.id] = tuple(counts)
+        self._lengths[question.id] = len(terms)
+        self._total_length += len(terms)
+
+    def remove(self, question_id: int):
+        for term in self._terms.pop(question_id, ()):
+            ids, counts = self._postings[term]
+            i = ids.index(question_id)
+            del ids[i], counts[i]
+            if not ids:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(question_id, 0)
+
+    def search(
+        self, query: str, limit: int = SEARCH_LIMIT, shared: Iterable["QuestionSearchIndex"] = ()
+    ) -> List[Tuple[int, float]]:
+        """(id, score) of the best matches, best first.
+
+        Term statistics also count the ``shared`` indexes, so hits from a
+        bank and from an overlay on it score alike and can be merged.
+        """
+        indexes = (self, *shared)
+        total = sum(len(index) for index in indexes)
+        if limit <= 0 or not len(self):
+            return []
+        frequencies = {}
+        for term in set(search_terms(query)):
+            frequency = sum(
+                len(index._postings[term][0]) for index in indexes if term in index._postings
+            )
+            if frequency:
+                frequencies[term] = frequency
+        # Words found in most questions rank almost nothing; skip them when
+        # the query has rarer ones, which also keeps their long lists unread
+        rare = {term: df for term, df in frequencies.items() if df * 2 <= total}
+        average = sum(index._total_length for index in indexes) / total or 1.0
+        norm_base = SEARCH_K1 * (1 - SEARCH_B)
+        norm_length = SEARCH_K1 * SEARCH_B / average
+        lengths = self._lengths
+        scores: Dict[int, float] = {}
+        get = scores.get
+        for term, df in (rare or frequencies).items():
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            weight = math.log(1 + (total - df + 0.5) / (df + 0.5)) * (SEARCH_K1 + 1)
+            for question_id, count in zip(*posting):
+                scores[question_id] = get(question_id, 0.0) + weight * count / (
+                    count + norm_base + norm_length * lengths[question_id]
+                )
+        return heapq.nlargest(limit, scores.items(), key=lambda hit: hit[1])
+
+
+def shingle_hash(shingle: Any) -> int:
+    """CRC-32 of a word, word pair or option: unlike the builtin hash() of a
+    str, which is salted per process, it is the same in every run."""
+    text = "\x01".join(shingle) if isinstance(shingle, tuple) else shingle
+    return zlib.crc32(text.encode())
+
+
+def minhash_signature(shingles: Iterable[Any], bins: int = MINHASH_BINS) -> array:
+    """One-permutation MinHash: each shingle's hash picks a bin and competes
+    for its minimum. Real minimums are even; empty bins hold MINHASH_EMPTY."""
+    signature = [MINHASH_EMPTY] * bins
+    for h in map(shingle_hash, shingles):
+        b = h % bins
+        value = h // bins & 0xFFFFFFFE
+        if value < signature[b]:
+            signature[b] = value
+    return array("I", signature)
+
+
+def minhash_similarity(a: array, b: array) -> float:
+    """Estimated Jaccard similarity; bins empty in both sides don't count."""
+    matches = filled = 0
+    for x, y in zip(a, b):
+        if x != y:
+            filled += 1
+        elif x != MINHASH_EMPTY:
+            matches += 1
+            filled += 1
+    return matches / filled if filled else 1.0
+
+
+class NearDuplicateFinder:
+    """Spots questions that repeat, or nearly repeat, one seen before.
+
+    Questions are fed in order. Text and options are reduced to words, so
+    case and punctuation never matter; identical ones are exact duplicates.
+    For the rest a MinHash signature over words, word pairs and options is
+    cut into bands of MINHASH_BAND bins, and a question is only compared
+    with the latest earlier question that shares a band, which keeps a 100k
+    import to one pass.
+    """
+
+    def __init__(self, threshold: float = DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self._count = 0
+        self._exact: Dict[str, int] = {}
+        self._signatures: Dict[int, array] = {}
+        self._bands: List[Dict[bytes, int]] = [
+            {} for _ in range(0, MINHASH_BINS, MINHASH_BAND)
+        ]
+        # Bands with no shingle in them would pair up every short question
+        self._empty_band = array("I", [MINHASH_EMPTY] * MINHASH_BAND).tobytes()
+
+    def check(self, text: str, options: Iterable[str]) -> Optional[Tuple[int, float]]:
+        """Add the next question; return (position of the earlier question it
+        duplicates, estimated similarity), or None."""
+        position = self._count
+        self._count += 1
+        words = SEARCH_TERM.findall(text.casefold())
+        answers = sorted(" ".join(SEARCH_TERM.findall(option.casefold())) for option in options)
+        key = "\0".join([" ".join(words), *answers])
+        earlier = self._exact.setdefault(key, position)
+        if earlier != position:
+            return earlier, 1.0
+
+        shingles = set(words)
+        shingles.update(zip(words, words[1:]))
+        shingles.update(answers)
+        signature = minhash_signature(shingles)
+        keys = [
+            signature[start:start + MINHASH_BAND].tobytes()
+            for start in range(0, MINHASH_BINS, MINHASH_BAND)
+        ]
+        best = None
+        candidates = {
+            band.get(band_key)
+            for band, band_key in zip(self._bands, keys)
+            if band_key != self._empty_band
+        }
+        candidates.discard(None)
+        for other in sorted(candidates):
+            similarity = minhash_similarity(signature, self._signatures[other])
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (other, similarity)
+        # A duplicate is found through the question it repeats, so only
+        # originals are kept and filed
+        if best is None:
+            self._signatures[position] = signature
+            for band, band_key in zip(self._bands, keys):
+                if band_key != self._empty_band:
+                    band[band_key] = position
+        return best
+
+
+# =========================
+# Rounds
+# =========================
+class QuestionPool:
+    """Regular question ids grouped by category and by difficulty.
+
+    Groups are id-sorted lists, so the same seed over the same bank always
+    draws the same round, and drawing only touches the ids it picks. Ids
+    are appended and a group is re-sorted only when one arrives out of
+    order. Stores keep the pool current like the search index.
+    """
+
+    def __init__(self):
+        self._groups: Dict[str, Dict[Any, List[int]]] = {by: {} for by in ROUND_GROUPINGS}
+        self._unsorted: set = set()
+        self._keys: Dict[int, Tuple[str, int]] = {}
+        self.bank_id: Optional[str] = None
+        self.revision: Any = -1
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, question: Question):
+        if question.tiebreaker:
+            return
+        keys = (question.category, question.difficulty)
+        self._keys[question.id] = keys
+        for by, key in zip(ROUND_GROUPINGS, keys):
+            group = self._groups[by].setdefault(key, [])
+            group.append(question.id)
+            if len(group) > 1 and group[-2] > question.id:
+                self._unsorted.add((by, key))
+
+    def remove(self, question_id: int):
+        keys = self._keys.pop(question_id, None)
+        if keys is None:
+            return
+        for by, key in zip(ROUND_GROUPINGS, keys):
+            group = self._group(by, key)
+            del group[bisect_left(group, question_id)]
+            if not group:
+                del self._groups[by][key]
+                self._unsorted.discard((by, key))
+
+    def _group(self, by: str, key: Any) -> List[int]:
+        group = self._groups[by][key]
+        if (by, key) in self._unsorted:
+            group.sort()
+            self._unsorted.discard((by, key))
+        return group
+
+    def sizes(self, by: str = "category") -> Dict[Any, int]:
+        return {key: len(ids) for key, ids in self._groups[by].items()}
+
+    def draw(
+        self,
+        size: int,
+        rng: random.Random,
+        weights: Optional[Dict[Any, float]] = None,
+        by: str = "category",
+    ) -> List[int]:
+        """Up to ``size`` distinct ids in random order.
+
+        ``weights`` maps groups (categories, or difficulty levels) to
+        relative weights, and groups left out are not drawn from; without
+        it every question is equally likely. Picks go to groups by weight,
+        a full group passes its extra picks on to the others, and then each
+        group is sampled, so a round costs O(size + groups) at any bank size.
+        """
+        groups = self._groups[by]
+        if weights is None:
+            chances = {key: float(len(ids)) for key, ids in groups.items()}
+        else:
+            chances = {
+                key: weight for key, weight in weights.items() if weight > 0 and key in groups
+            }
+        counts = dict.fromkeys(chances, 0)
+        wanted = min(size, sum(len(groups[key]) for key in chances))
+        while wanted:
+            keys = sorted(chances)
+            for key in rng.choices(keys, [chances[key] for key in keys], k=wanted):
+                counts[key] += 1
+            wanted = 0
+            for key in keys:
+                spare = len(groups[key]) - counts[key]
+                if spare <= 0:
+                    counts[key] += spare
+                    wanted -= spare
+                    del chances[key]
+        ids: List[int] = []
+        for key in sorted(counts):
+            ids += rng.sample(self._group(by, key), counts[key])
+        rng.shuffle(ids)
+        return ids
+
+
+def option_order(seed: int, question_id: int, count: int = 4) -> List[int]:
+    """The order one round shows a question's options in: position i shows
+    stored option ``order[i]``. Derived from the round seed, never stored."""
+    order = list(range(count))
+    random.Random(f"{seed}:{question_id}").shuffle(order)
+    return order
+
+
+# =========================
+# Question import
+# =========================
+def validate_question_record(record: Any) -> Optional[str]:
+    """Return an error message for an invalid import record, else None."""
+    if not isinstance(record, dict):
+        return "Record must be an object"
+    if not all(k in record for k in ["question", "options", "correct"]):
+        return "Missing fields"
+    if not isinstance(record["question"], str) or not record["question"].strip():
+        return "Question text cannot be empty"
+    options = record["options"]
+    if not isinstance(options, list) or len(options) != 4:
+        return "Each question must have 4 options"
+    if not all(isinstance(o, str) and o.strip() for o in options):
+        return "All options must be non-empty"
+    correct = record["correct"]
+    if isinstance(correct, bool) or not isinstance(correct, int) or not 0 <= correct < 4:
+        return "Invalid correct answer index"
+    return validate_question_metadata(record)
+
+
+def validate_question_metadata(record: Dict[str, Any]) -> Optional[str]:
+    """Check the optional ``category`` and ``difficulty`` of a record."""
+    category = record.get("category", "")
+    if not isinstance(category, str) or len(category) > CATEGORY_MAX_CHARS:
+        return f"Category must be text of at most {CATEGORY_MAX_CHARS} characters"
+    difficulty = record.get("difficulty", 0)
+    if (
+        isinstance(difficulty, bool)
+        or not isinstance(difficulty, int)
+        or not 0 <= difficulty <= DIFFICULTY_LEVELS
+    ):
+        return f"Difficulty must be 0-{DIFFICULTY_LEVELS}"
+    return None
+
+
+def _iter_json_lines(fh) -> Iterator[Tuple[int, Any, Optional[str]]]:
+    for line_no, line in enumerate(fh, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line), None
+        except json.JSONDecodeError as e:
+            yield line_no, None, f"Invalid JSON: {e.msg}"
+
+
+def _iter_json_array(fh) -> Iterator[Tuple[int, Any, Optional[str]]]:
+    """Decode the elements of a top-level JSON array one at a time."""
+    decoder = json.JSONDecoder()
+    buf, pos, line_no = "", 0, 1
+    eof = opened = False
+
+    def fill() -> bool:
+        # Compact only when reading more, so each record costs O(its size)
+        nonlocal buf, pos, eof
+        chunk = fh.read(IMPORT_CHUNK_SIZE)
+        buf, pos = buf[pos:] + chunk, 0
+        eof = not chunk
+        return not eof
+
+    while True:
+        while pos < len(buf) and (buf[pos].isspace() or (opened and buf[pos] == ",")):
+            if buf[pos] == "\n":
+                line_no += 1
+            pos += 1
+        if pos >= len(buf):
+            if not fill():
+                yield line_no, None, "Unexpected end of file"
+                return
+            continue
+        if not opened:
+            if buf[pos] != "[":
+                yield line_no, None, "Expected a JSON array or JSON Lines"
+                return
+            opened = True
+            pos += 1
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            record, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError as e:
+            if not eof and len(buf) - pos < IMPORT_MAX_RECORD_CHARS and fill():
+                continue
+            yield line_no + buf.count("\n", pos, e.pos), None, f"Invalid JSON: {e.msg}"
+            return
+        yield line_no, record, None
+        line_no += buf.count("\n", pos, end)
+        pos = end
+
+
+def iter_question_records(path: str) -> Iterator[Tuple[int, Any, Optional[str]]]:
+    """Stream ``(line, record, parse_error)`` tuples from a JSON or JSON Lines file."""
+    with open(path, "r", encoding="utf-8-sig") as fh:
+        head = fh.read(1)
+        while head and head.isspace():
+            head = fh.read(1)
+        fh.seek(0)
+        if head == "[":
+            yield from _iter_json_array(fh)
+        else:
+            yield from _iter_json_lines(fh)
+
+
+def stream_export_questions(
+    store: QuestionStore,
+    path: str,
+    fmt: str = "jsonl",
+    start: int = 0,
+    stop: Optional[int] = None,
+    include: Optional[Callable[[Question], bool]] = None,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """Write questions ``[start, stop)`` to ``path`` in compact chunks.
+
+    ``fmt`` is ``"jsonl"`` (one object per line) or ``"json"`` (an array).
+    ``include`` optionally filters questions, e.g. answered ones only.
+    """
+    if fmt not in ("json", "jsonl"):
+        return {"success": False, "error": f"Unknown export format: {fmt}"}
+    stats = {"records": 0, "exported": 0}
+    tmp_path = f"{path}.part"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+
+        def flush(chunk: List[str]):
+            if fmt == "jsonl":
+                fh.write("\n".join(chunk) + "\n")
+            else:
+                fh.write((",\n" if stats["exported"] > len(chunk) else "") + ",\n".join(chunk))
+
+        if fmt == "json":
+            fh.write("[\n")
+        chunk: List[str] = []
+        for question in store.iter_range(start, stop):
+            stats["records"] += 1
+            if include is None or include(question):
+                chunk.append(json.dumps(question.to_dict(), separators=(",", ":")))
+                stats["exported"] += 1
+            if len(chunk) >= EXPORT_CHUNK_SIZE:
+                flush(chunk)
+                chunk = []
+                if progress:
+                    progress(dict(stats))
+        if chunk:
+            flush(chunk)
+        if fmt == "json":
+            fh.write("\n]\n")
+    os.replace(tmp_path, path)
+    return dict(stats, success=True, path=path)
+
+
+def record_duplicate(
+    stats: Dict[str, Any], position: int, match: Tuple[int, float], **where: Any
+):
+    """Note in import ``stats`` that question ``position`` (1-based) repeats
+    the one NearDuplicateFinder.check() matched."""
+    stats["duplicate_count"] += 1
+    if len(stats["duplicates"]) < IMPORT_ERROR_LIMIT:
+        earlier, similarity = match
+        stats["duplicates"].append(
+            {
+                **where,
+                "position": position,
+                "duplicate_of": earlier + 1,
+                "similarity": round(similarity, 2),
+            }
+        )
+
+
+def stream_import_questions(
+    store: QuestionStore,
+    path: str,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """Replace the bank in ``store`` with the valid records from ``path``.
+
+    Records are parsed, validated and written one at a time; invalid ones are
+    skipped and reported. Near-duplicates are imported but reported too. The
+    bank is left untouched if nothing is valid.
+    """
+    stats: Dict[str, Any] = {
+        "records": 0,
+        "imported": 0,
+        "error_count": 0,
+        "errors": [],
+        "duplicate_count": 0,
+        "duplicates": [],
+    }
+    duplicates = NearDuplicateFinder()
+
+    def report(line_no: int):
+        if progress and stats["records"] % IMPORT_PROGRESS_EVERY == 0:
+            progress(dict(stats, line=line_no, errors=len(stats["errors"])))
+
+    def valid_questions() -> Iterator[Question]:
+        for line_no, record, error in iter_question_records(path):
+            stats["records"] += 1
+            error = error or validate_question_record(record)
+            if error:
+                stats["error_count"] += 1
+                if len(stats["errors"]) < IMPORT_ERROR_LIMIT:
+                    stats["errors"].append({"line": line_no, "error": error})
+            else:
+                stats["imported"] += 1
+                match = duplicates.check(record["question"], record["options"])
+                if match is not None:
+                    record_duplicate(stats, stats["imported"], match, line=line_no)
+                yield Question(
+                    id=-1,
+                    question=record["question"],
+                    options=list(record["options"]),
+                    correct=record["correct"],
+                    category=record.get("category", "").strip(),
+                    difficulty=record.get("difficulty", 0),
+                )
+            report(line_no)
+
+    questions = valid_questions()
+    first = next(questions, None)
+    if first is None:
+        return dict(stats, success=False, error="No valid questions found")
+    store.replace_all(itertools.chain([first], questions))
+    # Ensure last is tiebreaker
+    last = store.get(store.tiebreaker_id)
+    if TIEBREAKER_TAG not in last.question.upper():
+        last.question = "\ud83c\udfc6 TIEBREAKER: " + last.question
+        store.update(last.id, last)
+    return dict(stats, success=True)
+
+
+# =========================
+# Game events
+# =========================
+@dataclass
+class GameEvent:
+    """One recorded transition; ``seq`` is its offset in the game's event log."""
+
+    seq: int
+    kind: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    at: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"seq": self.seq, "kind": self.kind, "data": dict(self.data), "at": self.at}
+
+    def question_ids(self) -> List[int]:
+        """Questions this event is about (several for a batch of edits)."""
+        if "question_id" in self.data:
+            return [self.data["question_id"]]
+        added = self.data.get("added", [])
+        return added + [question_id for question_id, _ in self.data.get("deleted", [])]
+
+
+class GameMachine:
+    """The game rules as a function of (state, settings, event).
+
+    Live play applies every transition through apply(), and replay runs the
+    same code over recorded events, so a log always rebuilds the same state.
+    Events carry everything the rules need from the question bank (which
+    answer was correct, whether it was the tiebreaker), so replay needs no
+    bank. ``overrides`` pins settings such as the point rules while
+    replaying, for re-scoring old games.
+    """
+
+    def __init__(
+        self,
+        state: GameState,
+        settings: Settings,
+        overrides: Optional[Dict[str, Any]] = None,
+    ):
+        self.state = state
+        self.settings = settings
+        self.overrides = dict(overrides or {})
+        if self.overrides:
+            self.settings.update(self.overrides)
+
+    @classmethod
+    def restored(
+        cls,
+        state_data: Dict[str, Any],
+        settings_data: Dict[str, Any],
+        overrides: Optional[Dict[str, Any]] = None,
+    ) -> "GameMachine":
+        """A machine over fresh copies of a to_dict() state and settings."""
+        state, settings = GameState(), Settings()
+        settings.update(settings_data)
+        state.restore(state_data)
+        state.set_team_count(settings.number_of_teams)
+        return cls(state, settings, overrides)
+
+    @staticmethod
+    def spin_outcome(seed: int, number_of_teams: int) -> int:
+        return random.Random(seed).randint(1, number_of_teams)
+
+    def apply(self, event: GameEvent) -> Dict[str, Any]:
+        handler = getattr(self, f"_on_{event.kind}", None)
+        if handler is None:
+            raise ValueError(f"Unknown event kind: {event.kind}")
+        return handler(**event.data) or {}
+
+    # -------------- Rules --------------
+    def next_team(self, current_team: int) -> int:
+        num_teams = max(1, self.settings.number_of_teams)
+        nxt = current_team + 1
+        return 1 if nxt > num_teams else nxt
+
+    def winner(self) -> Optional[str]:
+        _, leaders = self.state.leaders()
+        if not leaders:
+            return None
+        if len(leaders) > 1:
+            return "TIE"
+        return f"TEAM{next(iter(leaders))}"
+
+    def tiebreaker_due(self) -> bool:
+        if self.state.remaining_questions > 0:
+            return False
+        if self.settings.number_of_teams < 2:
+            return False
+        _, leaders = self.state.leaders()
+        return len(leaders) > 1
+
+    def _lock_question(self, question_id: int, tiebreaker: bool):
+        if self.state.mark_answered(question_id) and not tiebreaker:
+            self._add_remaining(-1)
+
+    def _add_remaining(self, delta: int):
+        self.state.remaining_questions = max(0, self.state.remaining_questions + delta)
+
+    def _end_of_round(self) -> Dict[str, Any]:
+        """After the last regular question: tiebreaker or final result."""
+        if self.state.remaining_questions != 0:
+            return {"game_ended": False, "winner": None}
+        if self.tiebreaker_due():
+            self.state.tiebreaker_active = True
+            self.state.tiebreaker_used = True
+            return {"game_ended": False, "winner": None}
+        self.state.game_finished = True
+        return {"game_ended": True, "winner": self.winner()}
+
+    # -------------- Transitions --------------
+    def _on_reset(self, total_questions: int):
+        self.state.reset(total_questions)
+
+    def _on_spin(self, team: int, seed: Optional[int] = None):
+        # Forced spins (admin) carry no seed
+        if seed is not None:
+            expected = self.spin_outcome(seed, self.settings.number_of_teams)
+            if team != expected:
+                raise ValueError(f"Spin with seed {seed} gives team {expected}, not {team}")
+        self.state.current_team = team
+        self.state.wheel_spun = True
+
+    def _on_start(self):
+        self.state.game_started = True
+
+    def _on_open(self, question_id: int):
+        self.state.current_question_index = question_id
+
+    def _on_answer(
+        self, question_id: int, team: int, selected: int, correct: bool, tiebreaker: bool
+    ) -> Dict[str, Any]:
+        if not tiebreaker:
+            points = self.settings.points_correct if correct else self.settings.points_wrong
+            self.state.set_score(team, max(0, self.state.get_score(team) + points))
+        self.state.record_result(question_id, team, correct)
+        self._lock_question(question_id, tiebreaker)
+        self.state.clear_timed_out(question_id)
+        if tiebreaker and correct:
+            self.state.game_finished = True
+            self.state.tiebreaker_active = False
+            self.state.tiebreaker_used = True
+            return {"game_ended": True, "winner": f"TEAM{team}"}
+        self.state.current_team = self.next_team(team)
+        if tiebreaker:
+            return {"game_ended": False, "winner": None}
+        return self._end_of_round()
+
+    def _on_timeout(self, question_id: int, team: int, tiebreaker: bool) -> Dict[str, Any]:
+        self._lock_question(question_id, tiebreaker)
+        self.state.mark_timed_out(question_id)
+        self.state.current_team = self.next_team(team)
+        if tiebreaker:
+            return {"game_ended": False, "winner": None}
+        return self._end_of_round()
+
+    def _on_switch(self):
+        self.state.current_team = self.next_team(self.state.current_team)
+
+    def _on_score(self, team: int, score: int):
+        self.state.set_score(team, score)
+
+    def _on_settings(self, settings: Dict[str, Any]):
+        self.settings.update({**settings, **self.overrides})
+        self.settings.number_of_teams = int(self.settings.number_of_teams)
+        if self.state.current_team > self.settings.number_of_teams:
+            self.state.current_team = 1
+        # Removed teams lose their scores
+        self.state.set_team_count(self.settings.number_of_teams)
+
+    def _on_question_added(self, question_id: int):
+        # Questions added later are never part of a drawn round
+        if self.state.in_round(question_id):
+            self._add_remaining(1)
+
+    def _on_question_deleted(self, question_id: int, answered: bool):
+        # Ids are stable, so only the deleted question's own state goes
+        self.state.forget_question(question_id)
+        if not answered and self.state.in_round(question_id):
+            self._add_remaining(-1)
+
+    def _on_questions_changed(self, added: List[int], deleted: List[List[Any]]):
+        # A batch: ``deleted`` holds (question id, was answered) pairs
+        unanswered = 0
+        for question_id, answered in deleted:
+            self.state.forget_question(question_id)
+            unanswered += not answered and self.state.in_round(question_id)
+        self._add_remaining(sum(map(self.state.in_round, added)) - unanswered)
+
+    def _on_bank_replaced(self, remaining: int):
+        self.state.remaining_questions = remaining
+
+    def _on_round(self, question_round: Optional[Dict[str, Any]], remaining: int):
+        # The drawn ids travel in the event, so replay never draws again
+        self.state.question_round = question_round
+        self.state.remaining_questions = remaining
+
+
+class GameEventLog:
+    """Every transition of one game, in order, with periodic checkpoints.
+
+    A copy of the state is kept every ``checkpoint_every`` events, so
+    rebuilding the state at any offset costs a binary search for the nearest
+    checkpoint, one state restore and at most ``checkpoint_every - 1``
+    replayed events. Each copy is a full state, so at most
+    ``max_checkpoints`` are kept: when one more is due, every other one is
+    dropped and the interval doubles. Memory stays within ``max_checkpoints``
+    states, and a seek in a game of n events replays fewer than
+    max(checkpoint_every, 2n / max_checkpoints) of them.
+
+    The log covers one game: restart() drops it and starts again from the
+    current state, and offsets go on counting from ``origin``, the number of
+    events dropped so far. Offsets before ``origin`` read as ``origin``.
+    """
+
+    def __init__(
+        self,
+        state: GameState,
+        settings: Settings,
+        checkpoint_every: int = EVENT_CHECKPOINT_EVERY,
+        origin: int = 0,
+        max_checkpoints: int = EVENT_CHECKPOINTS_KEPT,
+    ):
+        self.checkpoint_every = checkpoint_every
+        self.max_checkpoints = max(2, max_checkpoints)
+        self._start(state, settings, origin)
+
+    def _start(self, state: GameState, settings: Settings, origin: int):
+        self.origin = origin
+        self._interval = self.checkpoint_every
+        self.events: List[GameEvent] = []
+        self._offsets: List[int] = []
+        self._checkpoints: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        self._by_question: Dict[int, List[int]] = {}
+        self._checkpoint(state, settings)
+
+    def __len__(self) -> int:
+        """Offset of the next event: ``origin`` plus the events kept."""
+        return self.origin + len(self.events)
+
+    def _checkpoint(self, state: GameState, settings: Settings):
+        self._offsets.append(len(self.events))
+        self._checkpoints.append((state.to_dict(), settings.to_dict()))
+
+    def restart(self, state: GameState, settings: Settings):
+        """Drop every event so far; ``state``/``settings`` become the new base."""
+        self._start(state, settings, len(self))
+
+    def append(self, event: GameEvent, state: GameState, settings: Settings):
+        """Add an event already applied to ``state``/``settings``."""
+        self.events.append(event)
+        for question_id in event.question_ids():
+            self._by_question.setdefault(question_id, []).append(event.seq)
+        if len(self.events) - self._offsets[-1] >= self._interval:
+            if len(self._checkpoints) == self.max_checkpoints:
+                # Checkpoints sit at multiples of the interval: keep the even ones
+                del self._offsets[1::2], self._checkpoints[1::2]
+                self._interval *= 2
+                if len(self.events) - self._offsets[-1] < self._interval:
+                    return
+            self._checkpoint(state, settings)
+
+    def since(self, offset: int, limit: Optional[int] = None) -> List[GameEvent]:
+        """Events from ``offset`` on (at most ``limit`` of them)."""
+        first = max(0, offset - self.origin)
+        return self.events[first:] if limit is None else self.events[first:first + limit]
+
+    def question_history(self, question_id: int) -> List[GameEvent]:
+        return [self.events[seq - self.origin] for seq in self._by_question.get(question_id, [])]
+
+    def machine_at(
+        self, offset: Optional[int] = None, overrides: Optional[Dict[str, Any]] = None
+    ) -> GameMachine:
+        """Rebuild the game as it was after the first ``offset`` events.
+
+        With ``overrides`` (e.g. new point rules) the checkpoints no longer
+        apply, so the replay starts from the beginning.
+        """
+        total = len(self.events)
+        offset = total if offset is None else max(0, min(int(offset) - self.origin, total))
+        i = 0 if overrides else bisect_right(self._offsets, offset) - 1
+        machine = GameMachine.restored(*self._checkpoints[i], overrides)
+        for event in self.events[self._offsets[i]:offset]:
+            machine.apply(event)
+        return machine
+
+    def to_dict(self) -> Dict[str, Any]:
+        state, settings = self._checkpoints[0]
+        return {
+            "origin": self.origin,
+            "base": {"state": state, "settings": settings},
+            "events": [event.to_dict() for event in self.events],
+        }
+
+    @classmethod
+    def from_dict(
+        cls, data: Dict[str, Any], checkpoint_every: int = EVENT_CHECKPOINT_EVERY
+    ) -> "GameEventLog":
+        """Rebuild a log (and its checkpoints) by replaying a to_dict() copy."""
+        machine = GameMachine.restored(data["base"]["state"], data["base"]["settings"])
+        log = cls(machine.state, machine.settings, checkpoint_every, data.get("origin", 0))
+        for record in data["events"]:
+            event = GameEvent(**record)
+            machine.apply(event)
+            log.append(event, machine.state, machine.settings)
+        return log
+
+    def export(self, path: str):
+        """Write the log as JSON lines: the base state, then one event per line."""
+        data = self.to_dict()
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(json.dumps({"origin": data["origin"], "base": data["base"]}) + "\n")
+            for event in data["events"]:
+                fh.write(json.dumps(event) + "\n")
+
+
+def read_event_log(path: str) -> Dict[str, Any]:
+    """Load a file written by GameEventLog.export() as a to_dict() copy."""
+    with open(path, "r", encoding="utf-8") as fh:
+        header = json.loads(fh.readline())
+        if not isinstance(header, dict) or "base" not in header:
+            raise ValueError("Not an event log")
+        return {
+            "origin": header.get("origin", 0),
+            "base": header["base"],
+            "events": [json.loads(line) for line in fh if line.strip()],
+        }
+
+
+def rescore_event_logs(
+    paths: Iterable[str], overrides: Dict[str, Any]
+) -> Iterator[Dict[str, Any]]:
+    """Replay archived games under different settings, one result per file.
+
+    Answers, timeouts and turns are replayed as recorded; only the scoring
+    (and therefore ties and the winner) follows ``overrides``.
+    """
+    for path in paths:
+        try:
+            data = read_event_log(path)
+            machine = GameMachine.restored(
+                data["base"]["state"], data["base"]["settings"], overrides
+            )
+            outcome: Dict[str, Any] = {}
+            for record in data["events"]:
+                outcome = machine.apply(GameEvent(**record)) or outcome
+            if not machine.state.game_finished:
+                outcome = {}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            yield {"path": path, "success": False, "error": str(e)}
+            continue
+        yield {
+            "path": path,
+            "success": True,
+            "events": len(data["events"]),
+            **machine.state.score_dict(),
+            "winner": outcome.get("winner") or machine.winner(),
+        }
+
+
+# =========================
+# State persistence
+# =========================
+class StateLog:
+    """Crash-safe persistence of one game's GameState and Settings.
+
+    Each transition that changed anything appends one JSON line holding its
+    delta, its game events and, when they changed, the settings to the
+    current log segment. A transition that restarted the event log (a
+    reset) writes the new log whole instead, so neither snapshots nor
+    recovery carry the events of earlier games.
+    Lines reach the OS immediately and are fsynced in batches, at most
+    ``fsync_window`` seconds later. Every ``snapshot_every`` records a new
+    segment is started and the full state is written to
+    ``state.snapshot.json`` in the background, after which older segments
+    are deleted; recovery therefore replays at most about that many records.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        fsync_window: float = STATE_FSYNC_WINDOW,
+        snapshot_every: int = STATE_SNAPSHOT_EVERY,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.snapshot_path = self.directory / "state.snapshot.json"
+        self.fsync_window = fsync_window
+        self.snapshot_every = snapshot_every
+        self._seq = 0
+        self._since_snapshot = 0
+        self._logged_version = -1
+        self._logged_settings = -1
+        self._logged_events = 0
+        self._logged_origin = 0
+        self._wal = None
+        self._cond = threading.Condition()
+        self._dirty = False
+        self._closed = False
+        self._snapshotting: Optional[threading.Thread] = None
+        self.records = 0
+        self.fsyncs = 0
+        self.snapshots = 0
+
+    def _segments(self) -> List[Tuple[int, Path]]:
+        """Log segments as (first seq, path), oldest first."""
+        found = []
+        for path in self.directory.glob("state.*.wal"):
+            try:
+                found.append((int(path.name.split(".")[1]), path))
+            except ValueError:
+                continue
+        return sorted(found)
+
+    # -------------- Recovery --------------
+    def recover(self, manager: "GameManager") -> int:
+        """Load the snapshot and replay the log into ``manager``.
+
+        Returns the number of log records replayed. A torn line (the process
+        died mid-write) ends the replay.
+        """
+        replayed = 0
+        torn = False
+        segments = self._segments()
+        fresh = not segments and not self.snapshot_path.exists()
+        events = manager.events.to_dict()
+        if self.snapshot_path.exists():
+            snapshot = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+            self._seq = snapshot["seq"]
+            manager.settings.update(snapshot["settings"])
+            manager.state.restore(snapshot["state"])
+            events = snapshot.get("events") or {
+                "base": {"state": snapshot["state"], "settings": snapshot["settings"]},
+                "events": [],
+            }
+        for _, path in segments:
+            with open(path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        torn = True
+                        break
+                    if record["seq"] <= self._seq:
+                        continue  # already folded into the snapshot
+                    if "settings" in record:
+                        manager.settings.update(record["settings"])
+                        manager.state.set_team_count(manager.settings.number_of_teams)
+                    manager.state.apply_delta(record["state"])
+                    if "log" in record:
+                        events = record["log"]
+                    else:
+                        events["events"].extend(record.get("events", ()))
+                    self._seq = record["seq"]
+                    replayed += 1
+        # Clients may hold versions from before the crash: make them resync
+        manager.state.invalidate()
+        manager.events = GameEventLog.from_dict(events)
+        self._logged_version = manager.state.version
+        self._logged_settings = manager.settings.revision
+        self._logged_events = len(manager.events)
+        self._logged_origin = manager.events.origin
+        threading.Thread(target=self._flusher, name="state-fsync", daemon=True).start()
+        if replayed or torn or fresh:
+            # Fold the old segments (and any torn tail) into a fresh snapshot;
+            # a new log starts with one so the event log keeps its base state
+            self.snapshot(manager)
+        else:
+            self._start_segment()
+        return replayed
+
+    def _start_segment(self):
+        # A segment named after the next seq holds nothing replayable (at
+        # most a torn line), so it is safe to overwrite
+        self._wal = open(self.directory / f"state.{self._seq + 1}.wal", "w", encoding="utf-8")
+
+    # -------------- Writing --------------
+    def record(self, manager: "GameManager"):
+        """Append what changed since the last record; call with the game lock held."""
+        state, settings = manager.state, manager.settings
+        if self._wal is None or (
+            state.version == self._logged_version
+            and settings.revision == self._logged_settings
+            and len(manager.events) == self._logged_events
+            and manager.events.origin == self._logged_origin
+        ):
+            return
+        self._seq += 1
+        entry: Dict[str, Any] = {"seq": self._seq, "state": state.delta_since(self._logged_version)}
+        if settings.revision != self._logged_settings:
+            entry["settings"] = settings.to_dict()
+        if manager.events.origin != self._logged_origin:
+            entry["log"] = manager.events.to_dict()
+        else:
+            events = manager.events.since(self._logged_events)
+            if events:
+                entry["events"] = [event.to_dict() for event in events]
+        self._logged_version = state.version
+        self._logged_settings = settings.revision
+        self._logged_events = len(manager.events)
+        self._logged_origin = manager.events.origin
+        with self._cond:
+            self._wal.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._wal.flush()
+            self.records += 1
+            if self.fsync_window <= 0:
+                self._fsync()
+            elif not self._dirty:
+                self._dirty = True
+                self._cond.notify()
+        self._since_snapshot += 1
+        if self._since_snapshot >= self.snapshot_every:
+            self.snapshot(manager)
+
+    def snapshot(self, manager: "GameManager"):
+        """Start a new segment and write the full state behind the game's back.
+
+        Only copying the state happens here (under the game lock); encoding,
+        fsync and deleting old segments run on a background thread. A
+        snapshot still in flight postpones the next one.
+        """
+        if self._snapshotting is not None and self._snapshotting.is_alive():
+            return
+        data = {
+            "seq": self._seq,
+            "state": manager.state.to_dict(),
+            "settings": manager.settings.to_dict(),
+            "events": manager.events.to_dict(),
+        }
+        with self._cond:
+            old = self._wal
+            self._start_segment()
+        self._since_snapshot = 0
+        self._snapshotting = threading.Thread(
+            target=self._write_snapshot, args=(data, old), name="state-snapshot", daemon=True
+        )
+        self._snapshotting.start()
+
+    def _write_snapshot(self, data: Dict[str, Any], old_segment):
+        try:
+            if old_segment is not None:
+                os.fsync(old_segment.fileno())
+                old_segment.close()
+            tmp = self.snapshot_path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as fh:
+                fh.write(json.dumps(data, separators=(",", ":")))
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp, self.snapshot_path)
+            # Segments that end at or before the snapshot are no longer needed
+            for first_seq, path in self._segments():
+                if first_seq <= data["seq"]:
+                    path.unlink(missing_ok=True)
+            self.snapshots += 1
+        except OSError as e:
+            print(f"State snapshot failed: {e}")
+
+    def _fsync(self):
+        self._dirty = False
+        os.fsync(self._wal.fileno())
+        self.fsyncs += 1
+
+    def _flusher(self):
+        while True:
+            with self._cond:
+                while not self._dirty and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+            time.sleep(self.fsync_window)
+            with self._cond:
+                if self._closed:
+                    return
+                if self._dirty:
+                    self._fsync()
+
+    def close(self):
+        if self._snapshotting is not None:
+            self._snapshotting.join()
+        with self._cond:
+            if self._wal is None or self._closed:
+                return
+            self._closed = True
+            self._fsync()
+            self._wal.close()
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "records": self.records,
+            "fsyncs": self.fsyncs,
+            "snapshots": self.snapshots,
+            "since_snapshot": self._since_snapshot,
+            "fsync_window": self.fsync_window,
+        }
+
+
+# =========================
+# Results archive
+# =========================
+class ResultsArchive:
+    """Results of finished games: one row per answered or timed-out question.
+
+    Rows are stored column by column in typed arrays (game number, question
+    id, team, outcome), in the order they were played, so analytics can hand
+    whole columns to NumPy. Tiebreaker answers are left out.
+
+    With a ``directory`` every column is also an append-only file of raw
+    array items: archiving a game appends a few bytes per question and
+    loading reads each file in one go. Rows that not every column received
+    before a crash are dropped when the archive is loaded again.
+    """
+
+    COLUMNS = (("game", "I"), ("question", "q"), ("team", "H"), ("outcome", "B"))
+
+    def __init__(self, directory: Optional[str] = None):
+        self.columns: Dict[str, array] = {name: array(code) for name, code in self.COLUMNS}
+        # Event offset each archived game started at, indexed by game number
+        self.starts = array("q")
+        self.directory = None if directory is None else Path(directory)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.columns["outcome"])
+
+    @property
+    def games(self) -> int:
+        return len(self.starts)
+
+    def _files(self) -> Iterator[Tuple[Path, array]]:
+        for name, column in (*self.columns.items(), ("starts", self.starts)):
+            yield self.directory / f"{name}.{column.typecode}", column
+
+    def _load(self):
+        for path, column in self._files():
+            if path.exists():
+                data = path.read_bytes()
+                column.frombytes(data[: len(data) - len(data) % column.itemsize])
+        # Keep only the rows every column has, of games whose start was recorded
+        rows = min(len(column) for column in self.columns.values())
+        rows = min(rows, bisect_left(self.columns["game"], len(self.starts), 0, rows))
+        for column in self.columns.values():
+            del column[rows:]
+        del self.starts[self.columns["game"][-1] + 1 if rows else 0:]
+        for path, column in self._files():
+            if path.exists():
+                os.truncate(path, len(column) * column.itemsize)
+
+    def add_game(self, start: int, rows: List[Tuple[int, int, int]]) -> bool:
+        """Archive one game's (question id, team, outcome) rows, in play order.
+
+        ``start`` is the event offset the game began at; a game already
+        archived under it is not added again, so a crash between archiving
+        and logging the reset doesn't count the game twice.
+        """
+        if not rows or (self.starts and self.starts[-1] == start):
+            return False
+        questions, teams, outcomes = zip(*rows)
+        added = {
+            "game": array("I", [len(self.starts)]) * len(rows),
+            "question": array("q", questions),
+            "team": array("H", teams),
+            "outcome": array("B", outcomes),
+            "starts": array("q", [start]),
+        }
+        if self.directory is not None:
+            self._append_files(added)
+        for name, column in self.columns.items():
+            column.extend(added[name])
+        self.starts.extend(added["starts"])
+        return True
+
+    def _append_files(self, added: Dict[str, array]):
+        # Rows first: a game counts once its start is on disk. A failed write
+        # cuts every file back so memory and disk keep the same games.
+        sizes = []
+        try:
+            for path, column in self._files():
+                sizes.append((path, path.stat().st_size if path.exists() else 0))
+                with open(path, "ab") as fh:
+                    added[path.stem].tofile(fh)
+        except OSError:
+            for path, size in sizes:
+                if path.exists():
+                    os.truncate(path, size)
+            raise
+
+    def snapshot(self) -> Dict[str, array]:
+        """Copies of the columns, to analyse while more games are archived."""
+        return {name: column[:] for name, column in self.columns.items()}
+
+
+def results_analytics(
+    columns: Dict[str, array], limit: int = ANALYTICS_LIMIT, min_attempts: int = 1
+) -> Dict[str, Any]:
+    """Per-question and per-team statistics over a ResultsArchive.snapshot().
+
+    Everything is computed with whole-column NumPy operations, however many
+    games are archived. Questions with at least ``min_attempts`` results come
+    easiest first, at most ``limit`` of them. A question's discrimination is
+    its accuracy among the best 27% of respondents (one team in one game)
+    minus that among the worst 27%; near zero or below, it doesn't tell
+    strong teams from weak ones. Raises ImportError without NumPy.
+    """
+    np = load_numpy()
+    game, question, team, outcome = (
+        np.frombuffer(columns[name], dtype=columns[name].typecode)
+        for name in ("game", "question", "team", "outcome")
+    )
+    rows = len(outcome)
+    summary: Dict[str, Any] = {
+        "games": int(game[-1]) + 1 if rows else 0,
+        "responses": rows,
+        "accuracy": None,
+        "timeout_rate": None,
+        "question_count": 0,
+        "questions": [],
+        "teams": [],
+    }
+    if not rows:
+        return summary
+    correct = outcome == RESULT_CORRECT
+    timed_out = outcome == RESULT_TIMEOUT
+    summary["accuracy"] = round(float(correct.mean()), 4)
+    summary["timeout_rate"] = round(float(timed_out.mean()), 4)
+
+    # Per question
+    question_ids, q = np.unique(question, return_inverse=True)
+    n = len(question_ids)
+    attempts = np.bincount(q, minlength=n)
+    accuracy = np.bincount(q, weights=correct, minlength=n) / attempts
+    timeout_rate = np.bincount(q, weights=timed_out, minlength=n) / attempts
+
+    # Discrimination: respondents ranked by their share of correct answers
+    respondent = game.astype(np.int64) * (MAX_TEAMS + 1) + team
+    _, r = np.unique(respondent, return_inverse=True)
+    score = np.bincount(r, weights=correct) / np.bincount(r)
+    ranked = np.argsort(score, kind="stable")
+    group = min(len(ranked) // 2, max(1, round(len(ranked) * ANALYTICS_GROUP_SHARE)))
+
+    def group_accuracy(members) -> Any:
+        in_group = np.zeros(len(ranked), dtype=bool)
+        in_group[members] = True
+        mask = in_group[r]
+        seen = np.bincount(q[mask], minlength=n)
+        hits = np.bincount(q[mask], weights=correct[mask], minlength=n)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return hits / seen
+
+    if group:
+        discrimination = group_accuracy(ranked[-group:]) - group_accuracy(ranked[:group])
+    else:
+        discrimination = np.full(n, np.nan)
+
+    # Per team: a streak is a run of correct answers by one team in one game;
+    # any other result (or the next game) starts a new run
+    order = np.lexsort((team, game))
+    run_correct = correct[order]
+    run_key = respondent[order]
+    new_run = np.ones(rows, dtype=bool)
+    new_run[1:] = (run_key[1:] != run_key[:-1]) | ~run_correct[:-1]
+    run = np.cumsum(new_run) - 1
+    run_length = np.bincount(run, weights=run_correct).astype(np.int64)
+    longest = np.zeros(MAX_TEAMS + 1, dtype=np.int64)
+    np.maximum.at(longest, team[order][new_run], run_length)
+    team_attempts = np.bincount(team, minlength=MAX_TEAMS + 1)
+    team_correct = np.bincount(team, weights=correct, minlength=MAX_TEAMS + 1)
+    team_timeouts = np.bincount(team, weights=timed_out, minlength=MAX_TEAMS + 1)
+
+    def rate(value: float) -> Optional[float]:
+        return None if math.isnan(value) else round(value, 4)
+
+    shown = np.flatnonzero(attempts >= max(1, int(min_attempts)))
+    shown = shown[np.lexsort((-attempts[shown], -accuracy[shown]))][: max(0, int(limit))]
+    summary["question_count"] = int(np.count_nonzero(attempts >= max(1, int(min_attempts))))
+    summary["questions"] = [
+        {
+            "question_id": int(question_ids[i]),
+            "attempts": int(attempts[i]),
+            "accuracy": rate(float(accuracy[i])),
+            "timeout_rate": rate(float(timeout_rate[i])),
+            "discrimination": rate(float(discrimination[i])),
+        }
+        for i in shown.tolist()
+    ]
+    summary["teams"] = [
+        {
+            "team": t,
+            "attempts": int(team_attempts[t]),
+            "accuracy": rate(float(team_correct[t] / team_attempts[t])),
+            "timeout_rate": rate(float(team_timeouts[t] / team_attempts[t])),
+            "longest_streak": int(longest[t]),
+        }
+        for t in np.flatnonzero(team_attempts).tolist()
+    ]
+    return summary
+
+
+# =========================
+# Window sync
+# =========================
+class SyncDispatcher:
+    """Debounces sync requests for one window onto a single long-lived thread.
+
+    Requests arriving while a sync is pending are merged into it. The pending
+    sync fires ``delay`` seconds after the latest request, but never later than
+    ``max_delay`` after the first one, so bursts collapse into one round trip.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        get_window,
+        script: str,
+        delay: float = 0.03,
+        max_delay: float = SYNC_MAX_DELAY,
+    ):
+        self.name = name
+        self._get_window = get_window
+        self._script = script
+        self.delay = delay
+        self.max_delay = max_delay
+        self._cond = threading.Condition()
+        self._pending = False
+        self._first_request = 0.0
+        self._deadline = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self.requested = 0
+        self.dispatched = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    def request(self):
+        if not self._get_window():
+            return
+        now = time.monotonic()
+        with self._cond:
+            self.requested += 1
+            if self._pending:
+                self.coalesced += 1
+                self._deadline = min(now + self.delay, self._first_request + self.max_delay)
+                return
+            self._pending = True
+            self._first_request = now
+            self._deadline = now + self.delay
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"sync-{self.name}", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                while True:
+                    remaining = self._deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                self._pending = False
+            self._dispatch()
+
+    def _dispatch(self):
+        window = self._get_window()
+        if not window or not hasattr(window, "evaluate_js"):
+            return
+        try:
+            window.evaluate_js(self._script)
+            self.dispatched += 1
+        except Exception as e:
+            self.failed += 1
+            print(f"Sync to {self.name} failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "requested": self.requested,
+            "dispatched": self.dispatched,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+        }
+
+
+# =========================
+# Game Manager
+# =========================
+class GameManager:
+    def __init__(self, store: Optional[QuestionStore] = None, seed: Optional[int] = None):
+        if store is None:
+            store = MemoryQuestionStore(self._load_default_questions())
+        elif len(store) == 0:
+            store.replace_all(self._load_default_questions())
+        self.questions: QuestionStore = store
+        self.state = GameState(remaining_questions=max(0, len(self.questions) - 1))
+        self.settings = Settings()
+        self.job_progress: Dict[str, Dict[str, Any]] = {}
+        self._job_lock = threading.Lock()
+        # Every API transition (and file import/export) runs under this lock
+        self.lock = threading.RLock()
+        self._depth = 0
+        self.state_log: Optional[StateLog] = None
+        self.state.set_team_count(self.settings.number_of_teams)
+        # All transitions go through the machine and are recorded in the log
+        self.machine = GameMachine(self.state, self.settings)
+        self.events = GameEventLog(self.state, self.settings)
+        # Finished games' answers, for cross-game analytics
+        self.results = ResultsArchive()
+        # Wheel spins draw their seed from here, so a seeded game is reproducible
+        self.rng = random.Random(seed)
+        self._state_changed = threading.Condition()
+        self.state._on_change = self._notify_state_change
+        # A webview.Window, or anything else with evaluate_js() (see RemoteWindow)
+        self.player_window: Optional[Any] = None
+        self.admin_window: Optional[Any] = None
+        self.player_sync = SyncDispatcher(
+            "player",
+            lambda: self.player_window,
+            "(async () => { if(window.syncFromAdmin) await window.syncFromAdmin(); })()",
+            delay=PLAYER_SYNC_DELAY,
+        )
+        self.admin_sync = SyncDispatcher(
+            "admin",
+            lambda: self.admin_window,
+            "(async () => { if(window.syncFromPlayer) await window.syncFromPlayer(); })()",
+            delay=ADMIN_SYNC_DELAY,
+        )
+
+    def _load_default_questions(self) -> List[Question]:
+        default_data = [
+            {
+                "question": "What is the average blink rate per minute?",
+                "options": ["5-10", "15-20", "25-30", "35-40"],
+                "correct": 1,
+            },
+            {
+                "question": "Which of the following is a type of eye movement disorder?",
+                "options": ["Nystagmus", "Strabismus", "Amblyopia", "Ptosis"],
+                "correct": 0,
+            },
+            {
+                "question": "Which cranial nerve is responsible for innervating the lateral rectus muscle?",
+                "options": ["CN III", "CN IV", "CN V", "CN VI"],
+                "correct": 3,
+            },
+            {
+                "question": "Which layer of the cornea is responsible for most of its refractive power?",
+                "options": [
+                    "Epithelium",
+                    "Stroma",
+                    "Endothelium",
+                    "Descemet's membrane",
+                ],
+                "correct": 1,
+            },
+            {
+                "question": "Which structure is responsible for the 'double hump' sign seen during indentation gonioscopy?",
+                "options": [
+                    "Ciliary body cyst",
+                    "Plateau iris configuration",
+                    "Iris bombe",
+                    "Posterior synechiae",
+                ],
+                "correct": 1,
+            },
+            {
+                "question": "What is the mechanism of action of netarsudil in glaucoma therapy?",
+                "options": [
+                    "Carbonic anhydrase inhibition",
+                    "Alpha-2 adrenergic receptor agonism",
+                    "Rho kinase (ROCK) inhibition",
+                    "Prostaglandin analog receptor stimulation",
+                ],
+                "correct": 2,
+            },
+            {
+                "question": "Which color is most visible to the human eye?",
+                "options": ["Red", "Green", "Blue", "Yellow"],
+                "correct": 0,
+            },
+            {
+                "question": "Which medication is commonly used to treat CMV retinitis?",
+                "options": ["Ganciclovir", "Acyclovir", "Fluconazole", "Ciprofloxacin"],
+                "correct": 0,
+            },
+            {
+                "question": "If you stare at a bright light and see spots, what's the term for this phenomenon?",
+                "options": ["Phosphene", "Scotoma", "Floaters", "Photophobia"],
+                "correct": 0,
+            },
+            {
+                "question": "Which visual field defect is commonly associated with pituitary tumours?",
+                "options": [
+                    "Bitemporal hemianopia",
+                    "Central scotoma",
+                    "Homonymous hemianopia",
+                    "Quadrantanopia",
+                ],
+                "correct": 0,
+            },
+            {
+                "question": "What is the Watzke-Allen sign used to detect?",
+                "options": [
+                    "Central serous chorioretinopathy",
+                    "Full-thickness macular hole",
+                    "Epiretinal membrane",
+                    "Retinal detachment",
+                ],
+                "correct": 1,
+            },
+            {
+                "question": "Which mutation is linked to Best disease and what is its inheritance pattern?",
+                "options": [
+                    "ABCA4, autosomal recessive",
+                    "BEST1 (VMD2), autosomal dominant",
+                    "RPE65, X-linked",
+                    "RS1, X-linked recessive",
+                ],
+                "correct": 1,
+            },
+            {
+                "question": "Which famous artist had strabismus and may have seen the world differently?",
+                "options": ["Monet", "Van Gogh", "Picasso", "Rembrandt"],
+                "correct": 1,
+            },
+            {
+                "question": "Which animal has the best vision on Earth?",
+                "options": ["Human", "Eagle", "Mantis shrimp", "Owl"],
+                "correct": 2,
+            },
+            {
+                "question": "Which Disney princess had famously large, animated eyes?",
+                "options": ["Cinderella", "Ariel", "Rapunzel (from Tangled)", "Belle"],
+                "correct": 2,
+            },
+            {
+                "question": "What is the UAE's national day celebrated?",
+                "options": ["December 1", "December 2", "November 30", "January 1"],
+                "correct": 1,
+            },
+            {
+                "question": "What is a traditional form of Emirati hospitality?",
+                "options": [
+                    "Serving Turkish coffee",
+                    "Offering Arabic coffee and dates",
+                    "Serving mint tea only",
+                    "Offering rose water and sweets",
+                ],
+                "correct": 1,
+            },
+            {
+                "question": "In which year was the MEOM Academy established?",
+                "options": ["2015", "2018", "2019", "2020"],
+                "correct": 1,
+            },
+            {
                 "question": "Which city hosts the MEOM conference every year?",
                 "options": ["Riyadh", "Amman", "Dubai", "Muscat"],
                 "correct": 2,
@@ -322,654 +3317,2972 @@ class GameManager:
                 "correct": 1,
             },
         ]
-        # Ensure last is tiebreaker
-        if default_data and TIEBREAKER_TAG not in default_data[-1]["question"].upper():
-            default_data[-1]["question"] = (
-                "\ud83c\udfc6 TIEBREAKER: " + default_data[-1]["question"]
+        # Ensure last is tiebreaker
+        if default_data and TIEBREAKER_TAG not in default_data[-1]["question"].upper():
+            default_data[-1]["question"] = (
+                "\ud83c\udfc6 TIEBREAKER: " + default_data[-1]["question"]
+            )
+        return [Question(id=i, **q) for i, q in enumerate(default_data)]
+
+    # -------------- Transactions --------------
+    @contextmanager
+    def transaction(self):
+        """Run one atomic transition; its changes are logged when it ends."""
+        with self.lock:
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0 and self.state_log is not None:
+                    self.state_log.record(self)
+
+    def emit(self, kind: str, **data) -> Dict[str, Any]:
+        """Apply one transition and append it to the event log; call inside transaction()."""
+        event = GameEvent(len(self.events), kind, data, time.time())
+        try:
+            outcome = self.machine.apply(event)
+        except Exception:
+            # A handler that failed halfway must not leave changes the log
+            # can't explain: go back to the state the logged events rebuild
+            self.rewind()
+            raise
+        self.events.append(event, self.state, self.settings)
+        self._check_remaining_questions()
+        return outcome
+
+    def rewind(self):
+        """Reset state and settings to what replaying the event log gives."""
+        machine = self.events.machine_at()
+        self.settings.update(machine.settings.to_dict())
+        self.state.restore(machine.state.to_dict())
+
+    def enable_persistence(
+        self, directory: str, fsync_window: float = STATE_FSYNC_WINDOW
+    ) -> int:
+        """Recover state from ``directory`` and log every change there from now on.
+
+        Returns the number of log records replayed.
+        """
+        with self.transaction():
+            self.results = ResultsArchive(str(Path(directory) / RESULTS_DIR))
+            log = StateLog(directory, fsync_window)
+            replayed = log.recover(self)
+            # Attached first so the fix-ups below are logged as well
+            self.state_log = log
+            if self.settings.number_of_teams != self.state.team_count:
+                self.state.set_team_count(self.settings.number_of_teams)
+            if self.state.game_started:
+                # The bank may have changed since the crash
+                self._recalculate_remaining_questions()
+            return replayed
+
+    def close(self):
+        if self.state_log is not None:
+            self.state_log.close()
+            self.state_log = None
+
+    # -------------- Sync helpers --------------
+    def sync_to_player(self):
+        self.player_sync.request()
+
+    def sync_to_admin(self):
+        self.admin_sync.request()
+
+    def sync_stats(self) -> Dict[str, Dict[str, int]]:
+        return {"player": self.player_sync.stats(), "admin": self.admin_sync.stats()}
+
+    def _notify_state_change(self):
+        with self._state_changed:
+            self._state_changed.notify_all()
+
+    def wait_for_state_change(
+        self, last_version: int, timeout: float = STATE_WAIT_TIMEOUT
+    ) -> bool:
+        """Block until the state version moves past ``last_version``.
+
+        Returns False if ``timeout`` seconds pass without a change. A
+        ``last_version`` ahead of the server (after a restart, or simply
+        bogus) waits out the timeout too rather than returning at once, so a
+        client that keeps sending it cannot spin; callers then hand it a full
+        snapshot to resync from.
+        """
+        timeout = max(0.0, min(float(timeout), STATE_WAIT_TIMEOUT))
+        with self._state_changed:
+            return self._state_changed.wait_for(
+                lambda: self.state.version > last_version, timeout
+            )
+
+    def state_payload(self, known_version: Optional[int] = None) -> Dict[str, Any]:
+        """Full state for callers without a version, otherwise only the delta."""
+        if known_version is None:
+            return {"game_state": self.state.to_dict()}
+        return {"state_delta": self.state.delta_since(int(known_version))}
+
+    # -------------- Core computations --------------
+    def _count_remaining_questions(self) -> int:
+        if self.state.question_round is not None:
+            return sum(
+                1
+                for qid in self.state.question_round["question_ids"]
+                if qid in self.questions and not self.state.is_answered(qid)
+            )
+        total_regular = max(0, len(self.questions) - 1)
+        answered_regular = sum(
+            1 for qid in self.state.answered_questions if self.is_regular_question(qid)
+        )
+        return max(0, total_regular - answered_regular)
+
+    def _recalculate_remaining_questions(self):
+        """Full rescan; only needed when the whole bank is replaced."""
+        plan = self.state.question_round
+        if plan is not None and not self.state.game_started:
+            # The drawn ids went with the old bank; draw again from the new one
+            redrawn = self.build_round(plan["size"], plan["seed"], plan["weights"], plan["by"])
+            if not redrawn["success"]:
+                self.build_round(0)
+            return
+        remaining = self._count_remaining_questions()
+        if remaining != self.state.remaining_questions:
+            self.emit("bank_replaced", remaining=remaining)
+
+    def _check_remaining_questions(self):
+        if not DEBUG_STATE_CHECKS:
+            return
+        expected = self._count_remaining_questions()
+        if self.state.remaining_questions != expected:
+            raise RuntimeError(
+                f"remaining_questions drifted: {self.state.remaining_questions} != {expected}"
+            )
+
+    def is_tiebreaker(self, question_id: int) -> bool:
+        return question_id == self.questions.tiebreaker_id
+
+    def is_regular_question(self, question_id: int) -> bool:
+        return question_id in self.questions and not self.is_tiebreaker(question_id)
+
+    def question_board(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Regular question ids in play order (the round's, if one was drawn)
+        plus the tiebreaker id."""
+        tiebreaker_id = self.questions.tiebreaker_id
+        if self.state.question_round is not None:
+            drawn = self.state.question_round["question_ids"]
+            ids = [qid for qid in drawn if qid in self.questions]
+            return {
+                "question_ids": ids[:limit],
+                "tiebreaker_id": tiebreaker_id,
+                "total_questions": len(ids) + (tiebreaker_id is not None),
+            }
+        ids = self.questions.ids(0, limit)
+        return {
+            "question_ids": [qid for qid in ids if qid != tiebreaker_id],
+            "tiebreaker_id": tiebreaker_id,
+            "total_questions": len(self.questions),
+        }
+
+    # -------------- Rounds --------------
+    def build_round(
+        self,
+        size: int,
+        seed: Optional[int] = None,
+        weights: Optional[Dict[str, float]] = None,
+        by: str = "category",
+    ) -> Dict[str, Any]:
+        """Play the next game with ``size`` questions drawn from the bank.
+
+        ``weights`` maps categories (or difficulty levels, with ``by`` set to
+        ``"difficulty"``) to relative weights; see QuestionPool.draw. The
+        same seed over the same bank draws the same round. A size of 0 goes
+        back to playing the whole bank. Only possible before the game starts.
+        """
+        if self.state.game_started:
+            return {
+                "success": False,
+                "error": "Rounds can only be changed before the game starts",
+            }
+        if by not in ROUND_GROUPINGS:
+            return {"success": False, "error": ROUND_GROUPING_ERROR}
+        try:
+            size = int(size)
+            seed = self.rng.getrandbits(32) if seed is None else int(seed)
+            # Kept with string keys, as they come back from JSON
+            weights = None if weights is None else {str(k): float(v) for k, v in weights.items()}
+            keyed = weights
+            if weights is not None and by == "difficulty":
+                keyed = {int(k): v for k, v in weights.items()}
+        except (AttributeError, TypeError, ValueError):
+            return {"success": False, "error": "Invalid round settings"}
+        if size <= 0:
+            self.emit("round", question_round=None, remaining=max(0, len(self.questions) - 1))
+            self.sync_to_player()
+            return {"success": True, "message": "Playing the whole bank"}
+        ids = self.questions.draw_round(size, random.Random(seed), keyed, by)
+        if not ids:
+            return {"success": False, "error": "No questions match the round settings"}
+        plan = {"seed": seed, "size": size, "by": by, "weights": weights, "question_ids": ids}
+        self.emit("round", question_round=plan, remaining=len(ids))
+        self.sync_to_player()
+        return {
+            "success": True,
+            "round": plan,
+            "message": f"Drew {len(ids)} of {size} questions (seed {seed})",
+        }
+
+    def reset_game(self):
+        """Start over; a game played as a round gets the next round (seed + 1)."""
+        plan = self.state.question_round
+        self.archive_results()
+        self.emit("reset", total_questions=len(self.questions))
+        # The finished game is archived: its events are no longer kept, so
+        # the log (and its snapshots) stay the size of one game
+        self.events.restart(self.state, self.settings)
+        if plan is not None:
+            self.build_round(plan["size"], plan["seed"] + 1, plan["weights"], plan["by"])
+
+    def archive_results(self) -> bool:
+        """Add the game played since the last reset to the results archive."""
+        events = self.events.events
+        start = len(events)
+        while start and events[start - 1].kind != "reset":
+            start -= 1
+        rows = []
+        for event in events[start:]:
+            data = event.data
+            if event.kind not in ("answer", "timeout") or data["tiebreaker"]:
+                continue
+            if event.kind == "timeout":
+                outcome = RESULT_TIMEOUT
+            else:
+                outcome = RESULT_CORRECT if data["correct"] else RESULT_WRONG
+            rows.append((data["question_id"], data["team"], outcome))
+        return self.results.add_game(self.events.origin + start, rows)
+
+    def shown_option_order(self, question_id: int, count: int) -> Optional[List[int]]:
+        """How the round shuffles a question's options (None: stored order)."""
+        if self.state.question_round is None:
+            return None
+        return option_order(self.state.question_round["seed"], question_id, count)
+
+    def play_payload(self, question_id: int) -> Optional[Dict[str, Any]]:
+        """A question as the players see it: no answer, options in round order."""
+        payload = self.questions.payload(question_id, include_answer=False)
+        if payload is None:
+            return None
+        order = self.shown_option_order(question_id, len(payload["options"]))
+        if order is None:
+            return payload
+        options = payload["options"]
+        return {**payload, "options": [options[i] for i in order]}
+
+    def get_next_team(self, current_team: int) -> int:
+        return self.machine.next_team(current_team)
+
+    def get_score_dict(self) -> Dict[str, int]:
+        return self.state.score_dict()
+
+    def determine_winner(self) -> Optional[str]:
+        return self.machine.winner()
+
+    def check_tiebreaker_condition(self) -> bool:
+        return self.machine.tiebreaker_due()
+
+    # -------------- Background import/export --------------
+    def _start_job(self, kind: str, work: Callable[..., Dict[str, Any]], path: str):
+        """Run ``work(progress_callback)`` on a background thread.
+
+        Progress and the final result are published in ``job_progress[kind]``.
+        """
+        with self._job_lock:
+            if self.job_progress.get(kind, {}).get("running"):
+                return {"success": False, "error": f"An {kind} is already running"}
+            self.job_progress[kind] = {"running": True, "path": path, "records": 0}
+
+        def _update(progress: Dict[str, Any]):
+            self.job_progress[kind] = dict(progress, running=True, path=path)
+
+        def _run():
+            try:
+                result = work(_update)
+            except (OSError, UnicodeError) as e:
+                result = {"success": False, "error": str(e)}
+            self.job_progress[kind] = dict(result, running=False, done=True, path=path)
+            self.sync_to_admin()
+
+        threading.Thread(target=_run, name=f"question-{kind}", daemon=True).start()
+        return {"success": True, "message": f"{kind.capitalize()} started"}
+
+    def start_file_import(self, path: str) -> Dict[str, Any]:
+        if not os.path.isfile(path):
+            return {"success": False, "error": "File not found"}
+
+        def _work(progress):
+            # The game waits while the bank is swapped out under it
+            with self.transaction():
+                result = stream_import_questions(self.questions, path, progress)
+                if result.get("success"):
+                    if not self.state.game_started:
+                        self._recalculate_remaining_questions()
+                    self.sync_to_player()
+                    result["message"] = f"Imported {result['imported']} questions" + (
+                        f" ({result['duplicate_count']} possible duplicates)"
+                        if result["duplicate_count"]
+                        else ""
+                    )
+                    result["total_questions"] = len(self.questions)
+            return result
+
+        return self._start_job("import", _work, path)
+
+    def start_file_export(
+        self,
+        path: str,
+        fmt: str = "jsonl",
+        answered_only: bool = False,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        include = (lambda q: self.state.is_answered(q.id)) if answered_only else None
+
+        def _work(progress):
+            with self.transaction():
+                result = stream_export_questions(
+                    self.questions, path, fmt, start, stop, include, progress
+                )
+            if result.get("success"):
+                result["message"] = f"Exported {result['exported']} questions"
+            return result
+
+        return self._start_job("export", _work, path)
+
+    # -------------- Question management --------------
+    def add_question(
+        self, question_text: str, options: List[str], correct: int
+    ) -> Dict[str, Any]:
+        if not question_text or not question_text.strip():
+            return {"success": False, "error": "Question text cannot be empty"}
+        if len(options) != 4:
+            return {"success": False, "error": "Must have exactly 4 options"}
+        if not all(opt.strip() for opt in options):
+            return {"success": False, "error": "All options must be non-empty"}
+        if not 0 <= correct < 4:
+            return {"success": False, "error": "Invalid correct option index"}
+
+        # Appended before the tiebreaker
+        new_id = self.questions.add(
+            Question(
+                id=-1,
+                question=question_text.strip(),
+                options=[o.strip() for o in options],
+                correct=correct,
+            )
+        )
+        self.emit("question_added", question_id=new_id)
+        self.sync_to_player()
+        return {
+            "success": True,
+            "question_id": new_id,
+            "total_questions": len(self.questions),
+            "message": "Question added successfully!",
+        }
+
+    def edit_question(
+        self, question_id: int, question_text: str, options: List[str], correct: int
+    ) -> Dict[str, Any]:
+        if question_id not in self.questions:
+            return {"success": False, "error": "Invalid question ID"}
+        # Allow editing the tiebreaker question as requested
+        if not question_text or not question_text.strip():
+            return {"success": False, "error": "Question text cannot be empty"}
+        if len(options) != 4 or not all(opt.strip() for opt in options):
+            return {"success": False, "error": "Must have 4 non-empty options"}
+        if not 0 <= correct < 4:
+            return {"success": False, "error": "Invalid correct option index"}
+        if self.state.game_started and self.state.is_answered(question_id):
+            return {
+                "success": False,
+                "error": "Cannot edit answered questions during game",
+            }
+        current = self.questions.get(question_id)
+        self.questions.update(
+            question_id,
+            Question(
+                id=question_id,
+                question=question_text.strip(),
+                options=[o.strip() for o in options],
+                correct=correct,
+                category=current.category,
+                difficulty=current.difficulty,
+            ),
+        )
+        self.sync_to_player()
+        return {"success": True, "message": "Question updated successfully!"}
+
+    def delete_question(self, question_id: int) -> Dict[str, Any]:
+        if question_id not in self.questions:
+            return {"success": False, "error": "Invalid question ID"}
+        # Keep protection on deleting the tiebreaker question
+        if self.is_tiebreaker(question_id):
+            return {"success": False, "error": "Cannot delete tiebreaker question"}
+        if self.state.game_started and not self.state.is_answered(question_id):
+            return {
+                "success": False,
+                "error": "Cannot delete unanswered questions during game",
+            }
+
+        was_answered = self.state.is_answered(question_id)
+        self.questions.remove(question_id)
+        self.emit("question_deleted", question_id=question_id, answered=was_answered)
+        self.sync_to_player()
+        return {
+            "success": True,
+            "message": "Question deleted successfully!",
+            "total_questions": len(self.questions),
+        }
+
+    def apply_question_batch(self, ops: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Validate a list of question edits, then apply all of them or none.
+
+        Operations are ``{"op": "add", "question", "options", "correct"}``,
+        ``{"op": "edit", "question_id", "question", "options", "correct"}``
+        (both optionally with ``category`` and ``difficulty``),
+        ``{"op": "delete", "question_id"}`` and ``{"op": "move",
+        "question_id", "before"}`` (``before`` is another question's id, or
+        null for the end of the regular questions). Moves run after the
+        other operations, in order. The whole batch is one event and one
+        sync; ``results`` has one entry per operation.
+        """
+        if not isinstance(ops, list) or not ops:
+            return {"success": False, "error": "No operations given"}
+        errors = self._check_question_batch(ops)
+        failed = sum(error is not None for error in errors)
+        if failed:
+            return {
+                "success": False,
+                "error": f"{failed} of {len(ops)} operations are invalid; nothing was changed",
+                "results": [
+                    {"success": False, "error": error} if error else {"success": True}
+                    for error in errors
+                ],
+            }
+        results: List[Dict[str, Any]] = []
+        added: List[int] = []
+        deleted: List[List[Any]] = []
+        moves: List[Tuple[int, Optional[int]]] = []
+        with self.questions.batch():
+            for op in ops:
+                kind, question_id = op["op"], op.get("question_id")
+                if kind in ("add", "edit"):
+                    # Edits keep the question's category and difficulty unless given
+                    current = self.questions.get(question_id) if kind == "edit" else None
+                    question = Question(
+                        id=-1,
+                        question=op["question"].strip(),
+                        options=[o.strip() for o in op["options"]],
+                        correct=op["correct"],
+                        category=op.get("category", current.category if current else "").strip(),
+                        difficulty=op.get("difficulty", current.difficulty if current else 0),
+                    )
+                    if kind == "add":
+                        question_id = self.questions.add(question)
+                        added.append(question_id)
+                    else:
+                        self.questions.update(question_id, question)
+                elif kind == "delete":
+                    deleted.append([question_id, self.state.is_answered(question_id)])
+                    self.questions.remove(question_id)
+                else:
+                    moves.append((question_id, op.get("before")))
+                results.append({"success": True, "question_id": question_id})
+            if moves:
+                self.questions.reorder(moves)
+        if added or deleted:
+            self.emit("questions_changed", added=added, deleted=deleted)
+        self.sync_to_player()
+        return {
+            "success": True,
+            "message": f"Applied {len(ops)} question changes",
+            "results": results,
+            "total_questions": len(self.questions),
+        }
+
+    def _check_question_batch(self, ops: List[Any]) -> List[Optional[str]]:
+        """One error message (or None) per operation, in batch order."""
+        tiebreaker_id = self.questions.tiebreaker_id
+        # Moves run last, so nothing deleted anywhere in the batch may be moved
+        doomed = {
+            op.get("question_id")
+            for op in ops
+            if isinstance(op, dict)
+            and op.get("op") == "delete"
+            and isinstance(op.get("question_id"), int)
+        }
+        deleted: set = set()
+
+        def known(question_id: Any) -> bool:
+            return (
+                isinstance(question_id, int)
+                and not isinstance(question_id, bool)
+                and question_id not in deleted
+                and question_id in self.questions
+            )
+
+        def check(op: Any) -> Optional[str]:
+            if not isinstance(op, dict):
+                return "Operation must be an object"
+            kind, question_id = op.get("op"), op.get("question_id")
+            if kind == "add":
+                return validate_question_record(op)
+            if kind not in ("edit", "delete", "move"):
+                return f"Unknown operation: {kind}"
+            if not known(question_id):
+                return "Invalid question ID"
+            if kind == "edit":
+                if self.state.game_started and self.state.is_answered(question_id):
+                    return "Cannot edit answered questions during game"
+                return validate_question_record(op)
+            if question_id == tiebreaker_id:
+                return f"Cannot {kind} tiebreaker question"
+            if kind == "delete":
+                if self.state.game_started and not self.state.is_answered(question_id):
+                    return "Cannot delete unanswered questions during game"
+                deleted.add(question_id)
+                return None
+            before = op.get("before")
+            if question_id in doomed:
+                return "Question is deleted in this batch"
+            if before is not None and (
+                not known(before) or before == tiebreaker_id or before in doomed
+            ):
+                return "Invalid move target"
+            return None
+
+        return [check(op) for op in ops]
+
+
+_default_manager: Optional[GameManager] = None
+_default_manager_lock = threading.Lock()
+
+
+def default_game_manager() -> GameManager:
+    """The desktop game (and the server's default game), built on first use."""
+    global _default_manager
+    with _default_manager_lock:
+        if _default_manager is None:
+            _default_manager = GameManager(open_question_store())
+        return _default_manager
+
+
+def __getattr__(name: str) -> Any:
+    # The default game used to be built at import time as ``game_manager``
+    if name == "game_manager":
+        return default_game_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# =========================
+# Sessions
+# =========================
+@dataclass
+class GameSession:
+    game_id: str
+    manager: GameManager
+    created: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    clients: int = 0
+
+
+class SessionRegistry:
+    """Concurrent games in one process, keyed by game id.
+
+    Every session has its own GameState and Settings over a copy-on-write
+    view of one shared question bank, so a room costs little more than its
+    scores. The default game is ``default`` itself and is never evicted;
+    other games are dropped after ``idle_timeout`` seconds with no clients.
+    When the default game persists its state, every game gets its own state
+    log under ``<state dir>/games/<game id>`` and resumes from it.
+    """
+
+    def __init__(
+        self,
+        default: GameManager,
+        idle_timeout: float = SESSION_IDLE_TIMEOUT,
+        max_sessions: int = MAX_SESSIONS,
+    ):
+        self.bank = default.questions
+        self.state_dir = default.state_log.directory if default.state_log else None
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, GameSession] = {
+            DEFAULT_GAME_ID: GameSession(DEFAULT_GAME_ID, default)
+        }
+        self.on_evict: List[Callable[[GameSession], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._sessions
+
+    def get(self, game_id: str, create: bool = False) -> Optional[GameSession]:
+        """Look up (or create) a session and mark it as used."""
+        evicted: List[GameSession] = []
+        try:
+            with self._lock:
+                session = self._sessions.get(game_id)
+                if session is None and create:
+                    if not GAME_ID_PATTERN.fullmatch(game_id):
+                        raise ValueError("Invalid game id")
+                    if len(self._sessions) >= self.max_sessions:
+                        evicted = self._evict_idle_locked(time.monotonic())
+                        if len(self._sessions) >= self.max_sessions:
+                            raise ValueError("Too many games running")
+                    session = GameSession(game_id, self._new_manager(game_id))
+                    self._sessions[game_id] = session
+                if session is not None:
+                    session.last_used = time.monotonic()
+                return session
+        finally:
+            self._closed(evicted)
+
+    def _new_manager(self, game_id: str) -> GameManager:
+        manager = GameManager(QuestionBankView(self.bank))
+        if self.state_dir is not None:
+            manager.enable_persistence(str(self.state_dir / "games" / game_id))
+        return manager
+
+    def _closed(self, evicted: List[GameSession]):
+        for session in evicted:
+            session.manager.close()
+            for callback in self.on_evict:
+                callback(session)
+
+    def attach(self, session: GameSession):
+        with self._lock:
+            session.clients += 1
+            session.last_used = time.monotonic()
+
+    def detach(self, session: GameSession):
+        with self._lock:
+            session.clients = max(0, session.clients - 1)
+            session.last_used = time.monotonic()
+
+    def evict_idle(self, now: Optional[float] = None) -> List[str]:
+        with self._lock:
+            evicted = self._evict_idle_locked(time.monotonic() if now is None else now)
+        self._closed(evicted)
+        return [s.game_id for s in evicted]
+
+    def _evict_idle_locked(self, now: float) -> List[GameSession]:
+        evicted = [
+            s
+            for s in self._sessions.values()
+            if s.game_id != DEFAULT_GAME_ID
+            and s.clients == 0
+            and now - s.last_used >= self.idle_timeout
+        ]
+        for session in evicted:
+            del self._sessions[session.game_id]
+        return evicted
+
+    def close(self):
+        """Close the state logs of every game except the default one."""
+        with self._lock:
+            sessions = [s for s in self._sessions.values() if s.game_id != DEFAULT_GAME_ID]
+        for session in sessions:
+            session.manager.close()
+
+    def managers(self) -> Dict[str, GameManager]:
+        with self._lock:
+            return {s.game_id: s.manager for s in self._sessions.values()}
+
+    def stats(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "game_id": s.game_id,
+                    "clients": s.clients,
+                    "idle_seconds": round(now - s.last_used, 1),
+                    "questions": len(s.manager.questions),
+                    "game_started": s.manager.state.game_started,
+                }
+                for s in self._sessions.values()
+            ]
+
+
+# =========================
+# Metrics
+# =========================
+class Histogram:
+    """Fixed-bucket histogram; ``counts[i]`` holds values up to ``bounds[i]``."""
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the ``q`` quantile (None if empty or beyond the last bound)."""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, count) pairs in Prometheus order, ending with +Inf."""
+        pairs, seen = [], 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            pairs.append((f"{bound:g}", seen))
+        pairs.append(("+Inf", self.count))
+        return pairs
+
+
+class ApiMetrics:
+    """Call counts, latency and response size histograms per API method.
+
+    Filled by the ``instrument_api`` wrappers while ``enabled`` is set;
+    when it is not, a wrapped call costs one attribute check.
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._calls: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def observe(self, role: str, method: str, seconds: float, result: Any, raised: bool = False):
+        # What the bridge has to serialize and ship back
+        size = 0 if raised else len(json.dumps(result, default=str))
+        failed = raised or (isinstance(result, dict) and result.get("success") is False)
+        with self._lock:
+            entry = self._calls.get((role, method))
+            if entry is None:
+                entry = self._calls[(role, method)] = {
+                    "failed": 0,
+                    "latency": Histogram(METRIC_LATENCY_BUCKETS),
+                    "bytes": Histogram(METRIC_SIZE_BUCKETS),
+                }
+            entry["failed"] += failed
+            entry["latency"].observe(seconds)
+            entry["bytes"].observe(size)
+
+    def reset(self):
+        with self._lock:
+            self._calls.clear()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                f"{role}.{method}": {
+                    "calls": e["latency"].count,
+                    "failed": e["failed"],
+                    "mean_ms": round(e["latency"].sum / e["latency"].count * 1000, 3),
+                    "p50_ms_le": self._ms(e["latency"].quantile(0.5)),
+                    "p99_ms_le": self._ms(e["latency"].quantile(0.99)),
+                    "bytes_total": int(e["bytes"].sum),
+                    "bytes_mean": round(e["bytes"].sum / e["bytes"].count),
+                    "latency_buckets": e["latency"].cumulative(),
+                    "bytes_buckets": e["bytes"].cumulative(),
+                }
+                for (role, method), e in sorted(self._calls.items())
+            }
+
+    @staticmethod
+    def _ms(seconds: Optional[float]) -> Optional[float]:
+        return None if seconds is None else round(seconds * 1000, 3)
+
+    def prometheus(self, games: Dict[str, "GameManager"]) -> str:
+        """Prometheus text exposition of the API metrics plus per-game sync stats."""
+        out: List[str] = []
+
+        def family(name: str, kind: str, help_text: str):
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            calls = sorted(self._calls.items())
+            family("meom_api_failures_total", "counter", "API calls that failed or raised.")
+            for (role, method), e in calls:
+                out.append(f'meom_api_failures_total{{role="{role}",method="{method}"}} {e["failed"]}')
+            for name, key, help_text in (
+                ("meom_api_latency_seconds", "latency", "API call latency."),
+                ("meom_api_response_bytes", "bytes", "JSON size of API responses."),
+            ):
+                family(name, "histogram", help_text)
+                for (role, method), e in calls:
+                    labels = f'role="{role}",method="{method}"'
+                    for le, count in e[key].cumulative():
+                        out.append(f'{name}_bucket{{{labels},le="{le}"}} {count}')
+                    out.append(f"{name}_sum{{{labels}}} {e[key].sum:g}")
+                    out.append(f"{name}_count{{{labels}}} {e[key].count}")
+        for stat in ("requested", "dispatched", "coalesced", "failed"):
+            family(f"meom_sync_{stat}_total", "counter", f"Window sync requests {stat}.")
+            for game_id, manager in sorted(games.items()):
+                for window, stats in manager.sync_stats().items():
+                    out.append(
+                        f'meom_sync_{stat}_total{{game="{game_id}",window="{window}"}} {stats[stat]}'
+                    )
+        for stat in ("hits", "misses"):
+            family(
+                f"meom_question_cache_{stat}_total",
+                "counter",
+                f"Question payload cache {stat} (views count only their own edits).",
             )
-        return [Question(id=i, **q) for i, q in enumerate(default_data)]
+            for game_id, manager in sorted(games.items()):
+                value = manager.questions.payload_stats()[stat]
+                out.append(f'meom_question_cache_{stat}_total{{game="{game_id}"}} {value}')
+        family("meom_game_events", "gauge", "Events recorded in the game's event log.")
+        for game_id, manager in sorted(games.items()):
+            out.append(f'meom_game_events{{game="{game_id}"}} {len(manager.events)}')
+        return "\n".join(out) + "\n"
+
+
+api_metrics = ApiMetrics()
+
+
+def instrument_api(role: str):
+    """Class decorator recording every public method of an API class in ``api_metrics``.
+
+    Only methods defined on the class itself are wrapped, so subclasses can
+    be decorated too without timing inherited methods twice.
+    """
+
+    def wrap(method: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def instrumented(*args, **kwargs):
+            if not api_metrics.enabled:
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                api_metrics.observe(role, method, time.perf_counter() - started, None, True)
+                raise
+            api_metrics.observe(role, method, time.perf_counter() - started, result)
+            return result
+
+        return instrumented
+
+    def decorate(cls):
+        for name, fn in list(vars(cls).items()):
+            if not name.startswith("_") and isinstance(fn, types.FunctionType):
+                setattr(cls, name, wrap(name, fn))
+        return cls
+
+    return decorate
+
+
+class MetricsDump:
+    """Rewrites a Prometheus text file every ``interval`` seconds (textfile collector style)."""
+
+    def __init__(
+        self,
+        path: str,
+        games: Callable[[], Dict[str, "GameManager"]],
+        interval: float = METRICS_DUMP_INTERVAL,
+    ):
+        self.path = Path(path)
+        self.games = games
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-dump", daemon=True)
+
+    def start(self):
+        api_metrics.enabled = True
+        self._thread.start()
+
+    def write(self):
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(api_metrics.prometheus(self.games()), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError as e:
+                print(f"Metrics dump failed: {e}")
+
+    def stop(self):
+        self._stop.set()
+        try:
+            self.write()
+        except OSError as e:
+            print(f"Metrics dump failed: {e}")
+
+
+# =========================
+# APIs
+# =========================
+def api_failure(name: str, error: Exception) -> Dict[str, Any]:
+    """Log an unexpected error in an API call and report it to the caller."""
+    print(f"API call {name} failed:")
+    traceback.print_exception(type(error), error, error.__traceback__)
+    return {"success": False, "error": describe_error(error)}
+
+
+def describe_error(error: Exception) -> str:
+    """``str(error)``, or the exception type for errors without a message."""
+    return str(error) or type(error).__name__
+
+
+@instrument_api("admin")
+class AdminAPI:
+    def __init__(self, manager: Optional[GameManager] = None):
+        self.manager = manager if manager is not None else default_game_manager()
+
+    def verify_password(self, password: str) -> Dict[str, Any]:
+        return {
+            "success": check_admin_password(password),
+            "message": "OK" if check_admin_password(password) else "Invalid",
+        }
+
+    def get_all_questions(
+        self, since_revision: Optional[int] = None, bank_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """All questions, or with the ``bank``/``revision`` of an earlier reply,
+        only those changed and deleted since (see QuestionStore.delta_since)."""
+        with self.manager.transaction():
+            return {
+                "success": True,
+                **self.manager.questions.delta_since(since_revision, bank_id),
+            }
+
+    def search_questions(self, query: str, limit: int = SEARCH_LIMIT) -> Dict[str, Any]:
+        """Questions whose text or options best match ``query``, best first."""
+        query = (query or "").strip()
+        if not query:
+            return {"success": False, "error": "Search query cannot be empty"}
+        limit = max(1, min(int(limit), SEARCH_MAX_LIMIT))
+        with self.manager.transaction():
+            store = self.manager.questions
+            hits = store.search(query, limit)
+            return {
+                "success": True,
+                "query": query,
+                "questions": [store.payload(question_id) for question_id, _ in hits],
+                "scores": [round(score, 3) for _, score in hits],
+            }
+
+    def build_round(
+        self,
+        size: int,
+        seed: Optional[int] = None,
+        weights: Optional[Dict[str, float]] = None,
+        by: str = "category",
+    ) -> Dict[str, Any]:
+        """Draw the questions for the next game (see GameManager.build_round)."""
+        with self.manager.transaction():
+            result = self.manager.build_round(size, seed, weights, by)
+            if result["success"]:
+                self.manager.sync_to_admin()
+            return result
+
+    def get_round_groups(self, by: str = "category") -> Dict[str, Any]:
+        """Question counts per category (or difficulty level) to weight rounds by."""
+        if by not in ROUND_GROUPINGS:
+            return {"success": False, "error": ROUND_GROUPING_ERROR}
+        with self.manager.transaction():
+            return {"success": True, "by": by, "groups": self.manager.questions.round_groups(by)}
+
+    def get_results_analytics(
+        self, limit: int = ANALYTICS_LIMIT, min_attempts: int = 1
+    ) -> Dict[str, Any]:
+        """Accuracy, discrimination, timeouts and streaks over all archived games."""
+        limit = max(0, min(int(limit), ANALYTICS_MAX_LIMIT))
+        with self.manager.transaction():
+            columns = self.manager.results.snapshot()
+        try:
+            analytics = results_analytics(columns, limit, int(min_attempts))
+        except ImportError:
+            return {"success": False, "error": ANALYTICS_NUMPY_ERROR}
+        with self.manager.transaction():
+            for entry in analytics["questions"]:
+                question = self.manager.questions.get(entry["question_id"])
+                entry["question"] = question.question if question is not None else None
+        return {"success": True, **analytics}
+
+    def add_question(
+        self, question_text: str, options: List[str], correct_index: int
+    ) -> Dict[str, Any]:
+        with self.manager.transaction():
+            return self.manager.add_question(question_text, options, correct_index)
+
+    def edit_question(
+        self,
+        question_id: int,
+        question_text: str,
+        options: List[str],
+        correct_index: int,
+    ) -> Dict[str, Any]:
+        with self.manager.transaction():
+            return self.manager.edit_question(
+                question_id, question_text, options, correct_index
+            )
+
+    def delete_question(self, question_id: int) -> Dict[str, Any]:
+        with self.manager.transaction():
+            return self.manager.delete_question(question_id)
+
+    def apply_question_batch(self, ops: List[Dict[str, Any]]) -> Dict[str, Any]:
+        with self.manager.transaction():
+            return self.manager.apply_question_batch(ops)
+
+    def get_settings(self) -> Dict[str, Any]:
+        with self.manager.transaction():
+            return {"success": True, "settings": self.manager.settings.to_dict()}
+
+    def update_settings(self, settings: Dict[str, Any]) -> Dict[str, Any]:
+        with self.manager.transaction():
+            new_num = settings.get("number_of_teams", self.manager.settings.number_of_teams)
+            if not 2 <= int(new_num) <= MAX_TEAMS:
+                return {
+                    "success": False,
+                    "error": f"Number of teams must be between 2 and {MAX_TEAMS}",
+                }
+            self.manager.emit("settings", settings={**settings, "number_of_teams": int(new_num)})
+            self.manager.sync_to_player()
+            return {
+                "success": True,
+                "message": "Settings updated!",
+                "settings": self.manager.settings.to_dict(),
+            }
+
+    def get_game_state(self) -> Dict[str, Any]:
+        with self.manager.transaction():
+            return {"success": True, "game_state": self.manager.state.to_dict()}
+
+    def get_state_since(self, version: int) -> Dict[str, Any]:
+        with self.manager.transaction():
+            return {"success": True, "state": self.manager.state.delta_since(int(version))}
+
+    def wait_for_state_change(
+        self, last_version: int, timeout: float = STATE_WAIT_TIMEOUT
+    ) -> Dict[str, Any]:
+        # Wait outside the lock so transitions can run meanwhile
+        changed = self.manager.wait_for_state_change(int(last_version), timeout)
+        with self.manager.transaction():
+            delta = self.manager.state.delta_since(int(last_version))
+            # A full snapshot (e.g. for a client ahead of the server) must be applied
+            return {"success": True, "changed": changed or delta["full"], "state": delta}
+
+    def get_leaderboard(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        with self.manager.transaction():
+            return {"success": True, "leaderboard": self.manager.state.leaderboard(limit)}
+
+    def get_events(self, offset: int = 0, limit: int = EVENT_PAGE_SIZE) -> Dict[str, Any]:
+        with self.manager.transaction():
+            offset = max(0, int(offset))
+            events = self.manager.events.since(offset, max(0, int(limit)))
+            return {
+                "success": True,
+                "first": self.manager.events.origin,
+                "total": len(self.manager.events),
+                "events": [event.to_dict() for event in events],
+            }
+
+    def get_question_history(self, question_id: int) -> Dict[str, Any]:
+        """Every event that touched one question: who opened, answered or timed it out."""
+        with self.manager.transaction():
+            events = self.manager.events.question_history(question_id)
+            return {"success": True, "events": [event.to_dict() for event in events]}
+
+    def get_state_at(self, offset: int) -> Dict[str, Any]:
+        """The game as it was after its first ``offset`` events."""
+        with self.manager.transaction():
+            machine = self.manager.events.machine_at(offset)
+            return {
+                "success": True,
+                "offset": min(max(self.manager.events.origin, int(offset)), len(self.manager.events)),
+                "game_state": machine.state.to_dict(),
+                "settings": machine.settings.to_dict(),
+            }
+
+    def export_event_log(self, path: str) -> Dict[str, Any]:
+        with self.manager.transaction():
+            try:
+                self.manager.events.export(path)
+            except OSError as e:
+                return {"success": False, "error": str(e)}
+            return {"success": True, "path": path, "events": len(self.manager.events)}
+
+    def _games(self) -> Dict[str, GameManager]:
+        return {DEFAULT_GAME_ID: self.manager}
+
+    def get_metrics(self, fmt: str = "json") -> Dict[str, Any]:
+        """API call metrics plus sync, event and state log stats ("json" or "prometheus")."""
+        if fmt == "prometheus":
+            return {"success": True, "text": api_metrics.prometheus(self._games())}
+        log = self.manager.state_log
+        return {
+            "success": True,
+            "enabled": api_metrics.enabled,
+            "api": api_metrics.summary(),
+            "sync": self.manager.sync_stats(),
+            "events": len(self.manager.events),
+            "question_cache": self.manager.questions.payload_stats(),
+            "state_log": log.stats() if log is not None else None,
+        }
+
+    def set_metrics_enabled(self, enabled: bool, reset: bool = False) -> Dict[str, Any]:
+        api_metrics.enabled = bool(enabled)
+        if reset:
+            api_metrics.reset()
+        return {"success": True, "enabled": api_metrics.enabled}
+
+    def force_spin_wheel(self, team_number: int) -> Dict[str, Any]:
+        with self.manager.transaction():
+            if self.manager.state.wheel_spun:
+                return {"success": False, "error": "Wheel already spun"}
+            if not 1 <= team_number <= self.manager.settings.number_of_teams:
+                return {
+                    "success": False,
+                    "error": f"Invalid team (1-{self.manager.settings.number_of_teams})",
+                }
+            self.manager.emit("spin", team=team_number)
+            self.manager.sync_to_player()
+            return {
+                "success": True,
+                "starting_team": team_number,
+                "team_name": self.manager.settings.get_team_name(team_number),
+            }
+
+    def force_start_game(self) -> Dict[str, Any]:
+        with self.manager.transaction():
+            if not self.manager.state.wheel_spun:
+                return {"success": False, "error": "Wheel must be spun first"}
+            self.manager.emit("start")
+            self.manager.sync_to_player()
+            return {"success": True, "message": "Game started"}
+
+    def manual_score_set(self, team: int, score: int) -> Dict[str, Any]:
+        with self.manager.transaction():
+            if not 1 <= team <= self.manager.settings.number_of_teams:
+                return {"success": False, "error": "Invalid team"}
+            self.manager.emit("score", team=team, score=max(0, int(score)))
+            self.manager.sync_to_player()
+            return {"success": True, "message": f"Team {team} score set to {score}"}
+
+    def reset_game(self) -> Dict[str, Any]:
+        with self.manager.transaction():
+            self.manager.reset_game()
+            self.manager.sync_to_player()
+            return {"success": True, "message": "Game reset"}
+
+    def export_questions(self) -> Dict[str, Any]:
+        with self.manager.transaction():
+            return {
+                "success": True,
+                "data": json.dumps([q.to_dict() for q in self.manager.questions], indent=2),
+            }
+
+    def import_questions(self, json_data: str) -> Dict[str, Any]:
+        with self.manager.transaction():
+            try:
+                imported = json.loads(json_data)
+                if not isinstance(imported, list) or not imported:
+                    return {"success": False, "error": "Invalid format"}
+                for position, q in enumerate(imported, 1):
+                    error = validate_question_record(q)
+                    if error:
+                        return {"success": False, "error": f"Question {position}: {error}"}
+                # Ensure last is tiebreaker
+                if (
+                    imported
+                    and TIEBREAKER_TAG not in imported[-1].get("question", "").upper()
+                ):
+                    imported[-1]["question"] = "\ud83c\udfc6 TIEBREAKER: " + imported[
+                        -1
+                    ].get("question", "")
+                report: Dict[str, Any] = {"duplicate_count": 0, "duplicates": []}
+                duplicates = NearDuplicateFinder()
+                for position, q in enumerate(imported, 1):
+                    match = duplicates.check(q["question"], q["options"])
+                    if match is not None:
+                        record_duplicate(report, position, match)
+                self.manager.questions.replace_all(
+                    Question(
+                        id=-1,
+                        question=q["question"],
+                        options=q["options"],
+                        correct=q["correct"],
+                        category=q.get("category", "").strip(),
+                        difficulty=q.get("difficulty", 0),
+                    )
+                    for q in imported
+                )
+                if not self.manager.state.game_started:
+                    self.manager._recalculate_remaining_questions()
+                self.manager.sync_to_player()
+                message = f"Imported {len(self.manager.questions)} questions"
+                if report["duplicate_count"]:
+                    message += f" ({report['duplicate_count']} possible duplicates)"
+                return {
+                    "success": True,
+                    "message": message,
+                    "total_questions": len(self.manager.questions),
+                    **report,
+                }
+            except json.JSONDecodeError:
+                return {"success": False, "error": "Invalid JSON"}
+
+    def choose_import_file(self) -> Dict[str, Any]:
+        if not self.manager.admin_window:
+            return {"success": False, "error": "Admin window not available"}
+        paths = self.manager.admin_window.create_file_dialog(
+            webview.OPEN_DIALOG,
+            file_types=("Question files (*.json;*.jsonl)", "All files (*.*)"),
+        )
+        if not paths:
+            return {"success": False, "error": "No file selected"}
+        return {"success": True, "path": paths[0]}
+
+    def import_questions_file(self, path: str) -> Dict[str, Any]:
+        return self.manager.start_file_import(path)
+
+    def get_import_progress(self) -> Dict[str, Any]:
+        return {"success": True, "progress": self.manager.job_progress.get("import", {})}
+
+    def choose_export_file(self, fmt: str = "jsonl") -> Dict[str, Any]:
+        if not self.manager.admin_window:
+            return {"success": False, "error": "Admin window not available"}
+        path = self.manager.admin_window.create_file_dialog(
+            webview.SAVE_DIALOG, save_filename=f"meom-questions.{fmt}"
+        )
+        if isinstance(path, (list, tuple)):
+            path = path[0] if path else None
+        if not path:
+            return {"success": False, "error": "No file selected"}
+        return {"success": True, "path": path}
+
+    def export_questions_file(
+        self,
+        path: str,
+        fmt: str = "jsonl",
+        answered_only: bool = False,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        return self.manager.start_file_export(path, fmt, answered_only, start, stop)
+
+    def get_export_progress(self) -> Dict[str, Any]:
+        return {"success": True, "progress": self.manager.job_progress.get("export", {})}
+
+    def open_player_window(self) -> Dict[str, Any]:
+        if self.manager.player_window:
+            try:
+                self.manager.player_window.destroy()
+            except Exception:
+                pass
+            finally:
+                self.manager.player_window = None
+        threading.Timer(0.1, create_player_window).start()
+        return {"success": True, "message": "Opening player window..."}
+
+    def exit_application(self) -> Dict[str, Any]:
+        try:
+            if self.manager.admin_window:
+                self.manager.admin_window.destroy()
+            if self.manager.player_window:
+                self.manager.player_window.destroy()
+        except Exception:
+            pass
+        finally:
+            try:
+                webview.destroy_window()
+            except Exception:
+                pass
+        return {"success": True}
+
+
+@instrument_api("player")
+class PlayerAPI:
+    def __init__(self, manager: Optional[GameManager] = None):
+        self.manager = manager if manager is not None else default_game_manager()
+
+    def open_admin_panel(self, password: str) -> Dict[str, Any]:
+        if not check_admin_password(password):
+            return {"success": False, "error": "Invalid password"}
+        if not self.manager.admin_window:
+            threading.Timer(0.1, create_admin_window_from_player).start()
+        return {"success": True, "message": "Admin panel opening..."}
+
+    def close_player_window(self) -> Dict[str, Any]:
+        try:
+            if self.manager.player_window:
+                self.manager.player_window.destroy()
+                self.manager.player_window = None
+            return {"success": True}
+        except Exception as e:
+            return api_failure("player.close_player_window", e)
+
+    def exit_application(self) -> Dict[str, Any]:
+        try:
+            if self.manager.admin_window:
+                self.manager.admin_window.destroy()
+            if self.manager.player_window:
+                self.manager.player_window.destroy()
+        except Exception:
+            pass
+        finally:
+            try:
+                webview.destroy_window()
+            except Exception:
+                pass
+        return {"success": True}
+
+    def reset_game(self) -> Dict[str, Any]:
+        with self.manager.transaction():
+            self.manager.reset_game()
+            self.manager.sync_to_admin()
+            self.manager.sync_to_player()
+            return {"success": True, "game_state": self.manager.state.to_dict()}
+
+    def spin_wheel(self) -> Dict[str, Any]:
+        with self.manager.transaction():
+            # Allow respin any time before game starts
+            if self.manager.state.game_started:
+                return {"success": False, "error": "Cannot spin wheel after game started"}
+            num_teams = self.manager.settings.number_of_teams
+            if num_teams < 2:
+                return {"success": False, "error": "Invalid team count"}
+            seed = self.manager.rng.getrandbits(32)
+            starting_team = GameMachine.spin_outcome(seed, num_teams)
+            self.manager.emit("spin", team=starting_team, seed=seed)
+            self.manager.sync_to_admin()
+            return {
+                "success": True,
+                "starting_team": starting_team,
+                "team_name": self.manager.settings.get_team_name(starting_team),
+                "number_of_teams": num_teams,
+            }
+
+    def start_game(self, known_version: Optional[int] = None) -> Dict[str, Any]:
+        with self.manager.transaction():
+            if not self.manager.state.wheel_spun:
+                return {"success": False, "error": "Spin wheel first"}
+            self.manager.emit("start")
+            self.manager.sync_to_admin()
+            return {"success": True, **self.manager.state_payload(known_version)}
+
+    def get_question(self, question_id: int) -> Dict[str, Any]:
+        with self.manager.transaction():
+            if not self.manager.state.game_started:
+                return {"success": False, "error": "Game not started"}
+            question = self.manager.questions.get(question_id)
+            if question is None:
+                return {"success": False, "error": "Invalid question"}
+            if self.manager.state.is_answered(question_id):
+                return {"success": False, "error": "Already answered"}
+            is_tiebreaker = question.tiebreaker
+            if self.manager.state.tiebreaker_active and not is_tiebreaker:
+                return {"success": False, "error": "Tiebreaker is active"}
+            if not self.manager.state.tiebreaker_active and is_tiebreaker:
+                return {"success": False, "error": "Tiebreaker not yet available"}
+            if not is_tiebreaker and not self.manager.state.in_round(question_id):
+                return {"success": False, "error": "Question is not in this round"}
+            self.manager.emit("open", question_id=question_id)
+            return {
+                "success": True,
+                "question": self.manager.play_payload(question_id),
+                "current_team": self.manager.state.current_team,
+                "is_tiebreaker": is_tiebreaker,
+            }
+
+    def check_answer(
+        self,
+        question_id: int,
+        selected_option: int,
+        known_version: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        with self.manager.transaction():
+            try:
+                question = self.manager.questions.get(question_id)
+                if question is None:
+                    return {"success": False, "error": "Invalid question"}
+                if self.manager.state.is_answered(question_id):
+                    return {"success": False, "error": "Question already answered"}
+                if not self.manager.state.game_started or self.manager.state.game_finished:
+                    return {"success": False, "error": "Game not in progress"}
+                is_tiebreaker = question.tiebreaker
+                current_team = self.manager.state.current_team
+                if is_tiebreaker and not self.manager.state.tiebreaker_active:
+                    return {"success": False, "error": "Tiebreaker not yet available"}
+                if self.manager.state.tiebreaker_active and not is_tiebreaker:
+                    return {"success": False, "error": "Tiebreaker is active"}
+                if not is_tiebreaker and not self.manager.state.in_round(question_id):
+                    return {"success": False, "error": "Question is not in this round"}
+                # In a round the player picks a shown position; the log and the
+                # check use the stored option it stands for
+                order = self.manager.shown_option_order(question_id, len(question.options))
+                if order is not None and 0 <= selected_option < len(order):
+                    selected_option = order[selected_option]
+                correct = selected_option == question.correct
+                # Scoring, locking the question and the turn flow
+                outcome = self.manager.emit(
+                    "answer",
+                    question_id=question_id,
+                    team=current_team,
+                    selected=selected_option,
+                    correct=correct,
+                    tiebreaker=is_tiebreaker,
+                )
+                self.manager.sync_to_admin()
+                return {
+                    "success": True,
+                    "is_correct": correct,
+                    "correct": correct,
+                    "correct_answer": (
+                        question.correct if order is None else order.index(question.correct)
+                    ),
+                    **self.manager.state_payload(known_version),
+                    "current_team": self.manager.state.current_team,
+                    **outcome,
+                    **self.manager.get_score_dict(),
+                }
+            except Exception as e:
+                return api_failure("player.check_answer", e)
+
+    def handle_timeout(
+        self, question_id: int, known_version: Optional[int] = None
+    ) -> Dict[str, Any]:
+        with self.manager.transaction():
+            try:
+                if question_id not in self.manager.questions:
+                    return {"success": False, "error": "Invalid question"}
+                # A timer firing after an answer (or twice) must not move the turn again
+                if self.manager.state.is_answered(question_id):
+                    return {"success": False, "error": "Question already answered"}
+                if not self.manager.state.game_started or self.manager.state.game_finished:
+                    return {"success": False, "error": "Game not in progress"}
+                is_tiebreaker = self.manager.is_tiebreaker(question_id)
+                current_team = self.manager.state.current_team
+                if is_tiebreaker and not self.manager.state.tiebreaker_active:
+                    return {"success": False, "error": "Tiebreaker not yet available"}
+                if self.manager.state.tiebreaker_active and not is_tiebreaker:
+                    return {"success": False, "error": "Tiebreaker is active"}
+                if not is_tiebreaker and not self.manager.state.in_round(question_id):
+                    return {"success": False, "error": "Question is not in this round"}
+                outcome = self.manager.emit(
+                    "timeout", question_id=question_id, team=current_team, tiebreaker=is_tiebreaker
+                )
+                self.manager.sync_to_admin()
+                return {
+                    "success": True,
+                    **self.manager.state_payload(known_version),
+                    **outcome,
+                }
+            except Exception as e:
+                return api_failure("player.handle_timeout", e)
 
-    # -------------- Sync helpers --------------
-    def sync_to_player(self):
-        if not self.player_window:
-            return
+    def switch_team(self, known_version: Optional[int] = None) -> Dict[str, Any]:
+        with self.manager.transaction():
+            self.manager.emit("switch")
+            self.manager.sync_to_admin()
+            return {"success": True, **self.manager.state_payload(known_version)}
 
-        def _sync():
-            with self._sync_lock:
-                try:
-                    if hasattr(self.player_window, "evaluate_js"):
-                        self.player_window.evaluate_js(
-                            "(async () => { if(window.syncFromAdmin) await window.syncFromAdmin(); })()"
-                        )
-                except Exception as e:
-                    print(f"Sync to player failed: {e}")
+    def restart_game(self) -> Dict[str, Any]:
+        with self.manager.transaction():
+            self.manager.reset_game()
+            self.manager.sync_to_admin()
+            return {"success": True, "game_state": self.manager.state.to_dict()}
 
-        threading.Timer(0.03, _sync).start()
+    def get_game_state(self) -> Dict[str, Any]:
+        with self.manager.transaction():
+            return {"success": True, "game_state": self.manager.state.to_dict()}
 
-    def sync_to_admin(self):
-        if not self.admin_window:
-            return
+    def get_state_since(self, version: int) -> Dict[str, Any]:
+        with self.manager.transaction():
+            return {"success": True, "state": self.manager.state.delta_since(int(version))}
 
-        def _sync():
-            try:
-                if hasattr(self.admin_window, "evaluate_js"):
-                    self.admin_window.evaluate_js(
-                        "(async () => { if(window.syncFromPlayer) await window.syncFromPlayer(); })()"
-                    )
-            except Exception:
-                pass
+    def wait_for_state_change(
+        self, last_version: int, timeout: float = STATE_WAIT_TIMEOUT
+    ) -> Dict[str, Any]:
+        # Wait outside the lock so transitions can run meanwhile
+        changed = self.manager.wait_for_state_change(int(last_version), timeout)
+        with self.manager.transaction():
+            delta = self.manager.state.delta_since(int(last_version))
+            # A full snapshot (e.g. for a client ahead of the server) must be applied
+            return {"success": True, "changed": changed or delta["full"], "state": delta}
 
-        threading.Timer(0.05, _sync).start()
+    def get_question_board(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        with self.manager.transaction():
+            return {"success": True, **self.manager.question_board(limit)}
 
-    # -------------- Core computations --------------
-    def _recalculate_remaining_questions(self):
-        total_regular = max(0, len(self.questions) - 1)
-        answered_regular = sum(
-            1 for idx in self.state.answered_questions if idx < len(self.questions) - 1
-        )
-        self.state.remaining_questions = max(0, total_regular - answered_regular)
+    def get_settings(self) -> Dict[str, Any]:
+        with self.manager.transaction():
+            return {"success": True, "settings": self.manager.settings.to_dict()}
 
-    def get_next_team(self, current_team: int) -> int:
-        num_teams = max(1, self.settings.number_of_teams)
-        nxt = current_team + 1
-        return 1 if nxt > num_teams else nxt
 
-    def get_score_dict(self) -> Dict[str, int]:
+# =========================
+# Window creation
+# =========================
+
+
+def get_web_path() -> Path:
+    if getattr(sys, "frozen", False):
+        base_path = Path(getattr(sys, "_MEIPASS", Path(sys.executable).parent))
+        return base_path / "web"
+    return Path(__file__).parent.absolute() / "web"
+
+
+def get_screen_size() -> Tuple[int, int]:
+    if sys.platform == "win32":
+        try:
+            import ctypes
+
+            user32 = ctypes.windll.user32
+            return user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
+        except Exception:
+            pass
+    return 1920, 1080
+
+
+def enable_dpi_awareness():
+    if sys.platform != "win32":
+        return
+    import ctypes
+
+    try:
+        ctypes.windll.shcore.SetProcessDpiAwareness(1)
+    except (AttributeError, OSError):
+        try:
+            ctypes.windll.user32.SetProcessDPIAware()
+        except (AttributeError, OSError):
+            pass
+
+
+def create_admin_window_from_player():
+    html_file = str(get_web_path() / "admin.html")
+    width, height = get_screen_size()
+    w = int(width * 0.8)
+    h = int(height * 0.85)
+    w = max(1024, min(w, 1600))
+    h = max(768, min(h, 1000))
+
+    game_manager = default_game_manager()
+    game_manager.admin_window = webview.create_window(
+        "Admin Panel",
+        html_file,
+        js_api=AdminAPI(),
+        width=w,
+        height=h,
+        resizable=True,
+        min_size=(1024, 768),
+    )
+
+    def cleanup():
+        game_manager.admin_window = None
+
+    game_manager.admin_window.events.closed += cleanup
+
+
+def create_player_window():
+    html_file = str(get_web_path() / "player.html")
+    game_manager = default_game_manager()
+    game_manager.player_window = webview.create_window(
+        "MEOM Quiz",
+        html_file,
+        js_api=PlayerAPI(),
+        fullscreen=True,  # Cover entire monitor
+        resizable=False,  # Not resizable
+        frameless=False,  # Use system frame to avoid draggable surface
+        easy_drag=False,  # Ensure no drag helpers (if backend supports)
+    )
+
+    def cleanup():
+        game_manager.player_window = None
+
+    game_manager.player_window.events.closed += cleanup
+
+
+# =========================
+# Headless server
+# =========================
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC11B65"
+
+# Injected into the served pages in place of the pywebview bridge: API calls go
+# over the WebSocket (or plain HTTP while it is connecting) and server pushes
+# trigger the same syncFromAdmin()/syncFromPlayer() hooks the desktop app uses.
+SERVER_CLIENT_SHIM = """<script>
+(function(){
+  const ROLE = %(role)s;
+  const GAME = new URLSearchParams(location.search).get('game') || '';
+  let password = null;
+  if (ROLE === 'admin') {
+    password = sessionStorage.getItem('meom-admin-password') || prompt('Admin password') || '';
+    sessionStorage.setItem('meom-admin-password', password);
+  }
+  const pending = new Map(); let nextId = 1; let ws = null;
+  const syncHook = () => ROLE === 'player' ? window.syncFromAdmin : window.syncFromPlayer;
+  function connect(){
+    const q = 'role=' + ROLE + '&game=' + encodeURIComponent(GAME);
+    ws = new WebSocket((location.protocol === 'https:' ? 'wss://' : 'ws://') + location.host + '/ws?' + q);
+    // The password goes in the first message, never in the URL
+    ws.onopen = () => { if (ROLE === 'admin') ws.send(JSON.stringify({auth: password})); };
+    ws.onmessage = (ev) => {
+      const msg = JSON.parse(ev.data);
+      if (msg.type === 'error') {
+        if (msg.error === 'auth_failed') { sessionStorage.removeItem('meom-admin-password'); alert('Wrong admin password'); location.reload(); }
+        else alert(msg.error);
+      } else if (msg.id !== undefined) {
+        const p = pending.get(msg.id); pending.delete(msg.id);
+        if (p) { if (msg.error !== undefined) p.reject(new Error(msg.error)); else p.resolve(msg.result); }
+      } else if (msg.type === 'sync' || (msg.type === 'state' && ROLE === 'player' && window.stateVersion && msg.version > window.stateVersion())) {
+        const fn = syncHook(); if (fn) fn();
+      }
+    };
+    ws.onclose = () => {
+      for (const p of pending.values()) p.reject(new Error('Connection lost'));
+      pending.clear(); setTimeout(connect, 1000);
+    };
+  }
+  async function call(method, args){
+    if (ws && ws.readyState === WebSocket.OPEN) {
+      return new Promise((resolve, reject) => { const id = nextId++; pending.set(id, {resolve, reject}); ws.send(JSON.stringify({id, method, args})); });
+    }
+    const r = await fetch('/api/' + ROLE + '/' + method + '?game=' + encodeURIComponent(GAME), {method: 'POST', headers: {'Content-Type': 'application/json', 'X-Admin-Password': password || ''}, body: JSON.stringify({args})});
+    if (!r.ok) throw new Error(r.status + ' ' + r.statusText);
+    return r.json();
+  }
+  // There is no native file dialog in a browser: ask for a path on the server
+  const askPath = (label) => async () => { const path = prompt(label); return path ? {success: true, path} : {success: false, error: 'No file selected'}; };
+  const local = { choose_import_file: askPath('Question file in the server data directory'), choose_export_file: askPath('File to write in the server data directory') };
+  const api = new Proxy({}, { get: (_, name) => typeof name !== 'string' ? undefined : local[name] || ((...args) => call(name, args).then(r => { if (r && r.open) window.open(r.open, '_blank'); return r; })) });
+  window.pywebview = { api };
+  window.addEventListener('DOMContentLoaded', () => { connect(); window.dispatchEvent(new Event('pywebviewready')); });
+})();
+</script>
+"""
+
+
+@instrument_api("player")
+class ServerPlayerAPI(PlayerAPI):
+    """PlayerAPI for browser clients: there are no windows to open or close."""
+
+    def __init__(self, manager: GameManager, game_id: str = DEFAULT_GAME_ID):
+        super().__init__(manager)
+        self.game_id = game_id
+
+    def open_admin_panel(self, password: str) -> Dict[str, Any]:
+        if not check_admin_password(password):
+            return {"success": False, "error": "Invalid password"}
         return {
-            f"team{i}_score": getattr(self.state, f"team{i}_score", 0)
-            for i in range(1, self.settings.number_of_teams + 1)
+            "success": True,
+            "message": "Admin panel opening...",
+            "open": f"/admin?game={self.game_id}",
         }
 
-    def determine_winner(self) -> Optional[str]:
-        num_teams = max(0, self.settings.number_of_teams)
-        scores = [
-            (i, getattr(self.state, f"team{i}_score", 0))
-            for i in range(1, num_teams + 1)
-        ]
-        if not scores:
+    def close_player_window(self) -> Dict[str, Any]:
+        return {"success": True}
+
+    def exit_application(self) -> Dict[str, Any]:
+        return {"success": False, "error": "Not available in server mode"}
+
+
+@instrument_api("admin")
+class ServerAdminAPI(AdminAPI):
+    """AdminAPI for browser clients; file dialogs are answered by the page.
+
+    File paths are taken relative to ``data_dir``, and paths that lead out
+    of it (absolute paths, ``..``, symlinks) are refused.
+    """
+
+    def __init__(
+        self,
+        manager: GameManager,
+        game_id: str = DEFAULT_GAME_ID,
+        sessions: Optional[SessionRegistry] = None,
+        data_dir: str = SERVER_DATA_DIR,
+    ):
+        super().__init__(manager)
+        self.game_id = game_id
+        self.sessions = sessions
+        self.data_dir = Path(data_dir)
+
+    def _data_path(self, path: str) -> Optional[str]:
+        """``path`` inside the data directory, or None if it points elsewhere."""
+        root = self.data_dir.resolve()
+        target = (root / str(path)).resolve()
+        try:
+            target.relative_to(root)
+        except ValueError:
             return None
-        scores.sort(key=lambda x: x[1], reverse=True)
-        if len(scores) > 1 and scores[0][1] == scores[1][1]:
-            return "TIE"
-        return f"TEAM{scores[0][0]}"
+        return str(target)
 
-    def check_tiebreaker_condition(self) -> bool:
-        if self.state.remaining_questions > 0:
-            return False
-        num_teams = self.settings.number_of_teams
-        if num_teams < 2:
-            return False
-        scores = [
-            getattr(self.state, f"team{i}_score", 0) for i in range(1, num_teams + 1)
-        ]
-        if not scores:
-            return False
-        top = max(scores)
-        return sum(1 for s in scores if s == top) > 1
+    def _outside(self) -> Dict[str, Any]:
+        return {"success": False, "error": f"Files must be inside {self.data_dir}"}
 
-    # -------------- Question management --------------
-    def add_question(
-        self, question_text: str, options: List[str], correct: int
+    def import_questions_file(self, path: str) -> Dict[str, Any]:
+        target = self._data_path(path)
+        return self._outside() if target is None else super().import_questions_file(target)
+
+    def export_questions_file(
+        self,
+        path: str,
+        fmt: str = "jsonl",
+        answered_only: bool = False,
+        start: int = 0,
+        stop: Optional[int] = None,
     ) -> Dict[str, Any]:
-        if not question_text or not question_text.strip():
-            return {"success": False, "error": "Question text cannot be empty"}
-        if len(options) != 4:
-            return {"success": False, "error": "Must have exactly 4 options"}
-        if not all(opt.strip() for opt in options):
-            return {"success": False, "error": "All options must be non-empty"}
-        if not 0 <= correct < 4:
-            return {"success": False, "error": "Invalid correct option index"}
+        target = self._data_path(path)
+        if target is None:
+            return self._outside()
+        return super().export_questions_file(target, fmt, answered_only, start, stop)
 
-        # Insert before tiebreaker
-        new_id = len(self.questions) - 1
-        self.questions.insert(
-            new_id,
-            Question(
-                id=new_id,
-                question=question_text.strip(),
-                options=[o.strip() for o in options],
-                correct=correct,
-            ),
-        )
-        # Reindex
-        for i, q in enumerate(self.questions):
-            q.id = i
+    def export_event_log(self, path: str) -> Dict[str, Any]:
+        target = self._data_path(path)
+        return self._outside() if target is None else super().export_event_log(target)
 
-        self._recalculate_remaining_questions()
-        self.sync_to_player()
+    def choose_import_file(self) -> Dict[str, Any]:
+        return {"success": False, "error": "Not available in server mode"}
+
+    def choose_export_file(self, fmt: str = "jsonl") -> Dict[str, Any]:
+        return {"success": False, "error": "Not available in server mode"}
+
+    def open_player_window(self) -> Dict[str, Any]:
         return {
             "success": True,
-            "question_id": new_id,
-            "total_questions": len(self.questions),
-            "message": "Question added successfully!",
+            "message": "Opening player page...",
+            "open": f"/?game={self.game_id}",
         }
 
-    def edit_question(
-        self, question_id: int, question_text: str, options: List[str], correct: int
+    def exit_application(self) -> Dict[str, Any]:
+        return {"success": False, "error": "Not available in server mode"}
+
+    def _games(self) -> Dict[str, GameManager]:
+        if self.sessions is None:
+            return {self.game_id: self.manager}
+        return self.sessions.managers()
+
+    def list_games(self) -> Dict[str, Any]:
+        if self.sessions is None:
+            return {"success": False, "error": "No session registry"}
+        return {"success": True, "games": self.sessions.stats()}
+
+
+class RemoteWindow:
+    """Stands in for a webview window of one role in server mode.
+
+    The sync scripts GameManager evaluates only ask the page to resync, so
+    evaluate_js() becomes a ``sync`` push to every connected client of the role.
+    """
+
+    def __init__(self, channel: "GameChannel", role: str):
+        self.channel = channel
+        self.role = role
+
+    def evaluate_js(self, script: str):
+        self.channel.push_threadsafe(self.role, {"type": "sync"})
+
+
+class WebSocketClient:
+    def __init__(self, role: str, writer: "asyncio.StreamWriter"):
+        self.role = role
+        self.writer = writer
+        self.queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(WS_SEND_QUEUE)
+        self.closed = False
+
+    def send(self, frame: bytes):
+        """Queue a frame; a client that falls too far behind is dropped."""
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.close()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def pump(self):
+        try:
+            while True:
+                frame = await self.queue.get()
+                if frame is None:
+                    break
+                self.writer.write(frame)
+                await self.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.closed = True
+            self.writer.close()
+
+
+_json_key = json.encoder.encode_basestring_ascii
+
+
+def _is_payload(value: Any) -> bool:
+    return isinstance(value, QuestionPayload) or (
+        type(value) is list and bool(value) and isinstance(value[0], QuestionPayload)
+    )
+
+
+def encode_json(result: Any) -> str:
+    """json.dumps() of an API result that splices in ready-made QuestionPayloads.
+
+    Payloads are looked for only where the APIs put them: the result itself
+    or one of its top-level values. Everything else goes to json.dumps().
+    """
+    if isinstance(result, QuestionPayload):
+        return result.json
+    if _is_payload(result):
+        return "[%s]" % ",".join(payload.json for payload in result)
+    if type(result) is dict and any(map(_is_payload, result.values())):
+        return "{%s}" % ",".join(
+            "%s:%s" % (_json_key(str(key)), encode_json(item) if _is_payload(item) else json.dumps(item))
+            for key, item in result.items()
+        )
+    return json.dumps(result)
+
+
+def ws_frame(payload: bytes, opcode: int = 0x1) -> bytes:
+    n = len(payload)
+    if n < 126:
+        header = bytes((0x80 | opcode, n))
+    elif n < 1 << 16:
+        header = bytes((0x80 | opcode, 126)) + n.to_bytes(2, "big")
+    else:
+        header = bytes((0x80 | opcode, 127)) + n.to_bytes(8, "big")
+    return header + payload
+
+
+async def ws_read_message(reader: "asyncio.StreamReader") -> Tuple[int, bytes]:
+    """Read one (possibly fragmented) client message; returns (opcode, payload)."""
+    chunks: List[bytes] = []
+    size = 0
+    message_opcode = None
+    while True:
+        b0, b1 = await reader.readexactly(2)
+        opcode = b0 & 0x0F
+        n = b1 & 0x7F
+        if n == 126:
+            n = int.from_bytes(await reader.readexactly(2), "big")
+        elif n == 127:
+            n = int.from_bytes(await reader.readexactly(8), "big")
+        if size + n > SERVER_MAX_BODY:
+            raise ValueError("WebSocket message too large")
+        mask = await reader.readexactly(4) if b1 & 0x80 else b""
+        data = await reader.readexactly(n)
+        if mask and n:
+            key = (mask * (n // 4 + 1))[:n]
+            data = (int.from_bytes(data, "big") ^ int.from_bytes(key, "big")).to_bytes(n, "big")
+        if opcode >= 0x8:
+            # Control frames may arrive between fragments of a data message
+            if opcode == 0x8 or not chunks:
+                return opcode, data
+            continue
+        if message_opcode is None:
+            message_opcode = opcode
+        chunks.append(data)
+        size += n
+        if b0 & 0x80:
+            return message_opcode, b"".join(chunks)
+
+
+class GameChannel:
+    """Server-side plumbing for one game session: its APIs, clients and pushes."""
+
+    def __init__(self, server: "QuizServer", session: GameSession):
+        self.server = server
+        self.session = session
+        manager = session.manager
+        self.apis: Dict[str, Any] = {
+            "player": ServerPlayerAPI(manager, session.game_id),
+            "admin": ServerAdminAPI(
+                manager, session.game_id, server.sessions, server.data_dir
+            ),
+        }
+        self.clients: Dict[str, set] = {role: set() for role in self.apis}
+        self.state_event = asyncio.Event()
+        self.running = True
+        manager.player_window = RemoteWindow(self, "player")
+        manager.admin_window = RemoteWindow(self, "admin")
+        threading.Thread(
+            target=self._watch_state, name=f"state-push-{session.game_id}", daemon=True
+        ).start()
+
+    def close(self):
+        self.running = False
+        manager = self.session.manager
+        manager.player_window = None
+        manager.admin_window = None
+        manager._notify_state_change()
+        for clients in self.clients.values():
+            for client in list(clients):
+                client.close()
+
+    def push(self, role: Optional[str], message: Dict[str, Any]):
+        """Send one message to every client of ``role`` (all clients if None)."""
+        frame = ws_frame(json.dumps(message).encode("utf-8"))
+        roles = self.clients if role is None else (role,)
+        for r in roles:
+            for client in list(self.clients.get(r, ())):
+                client.send(frame)
+
+    def push_threadsafe(self, role: Optional[str], message: Dict[str, Any]):
+        loop = self.server._loop
+        if loop and self.running:
+            loop.call_soon_threadsafe(self.push, role, message)
+
+    def _watch_state(self):
+        # One thread per game turns state changes into pushes for its clients;
+        # a short pause after each change folds a burst into one push.
+        manager = self.session.manager
+        version = manager.state.version
+        while self.running:
+            if not manager.wait_for_state_change(version, STATE_WAIT_TIMEOUT):
+                continue
+            time.sleep(PLAYER_SYNC_DELAY)
+            version = manager.state.version
+            if self.running:
+                self.server._loop.call_soon_threadsafe(self._state_moved, version)
+
+    def _state_moved(self, version: int):
+        event, self.state_event = self.state_event, asyncio.Event()
+        event.set()
+        self.push(None, {"type": "state", "version": version})
+
+    async def wait_for_state_change(
+        self, last_version: int, timeout: float = STATE_WAIT_TIMEOUT
     ) -> Dict[str, Any]:
-        if not 0 <= question_id < len(self.questions):
-            return {"success": False, "error": "Invalid question ID"}
-        # Allow editing the tiebreaker question as requested
-        if not question_text or not question_text.strip():
-            return {"success": False, "error": "Question text cannot be empty"}
-        if len(options) != 4 or not all(opt.strip() for opt in options):
-            return {"success": False, "error": "Must have 4 non-empty options"}
-        if not 0 <= correct < 4:
-            return {"success": False, "error": "Invalid correct option index"}
-        if self.state.game_started and question_id in self.state.answered_questions:
-            return {
-                "success": False,
-                "error": "Cannot edit answered questions during game",
-            }
-        self.questions[question_id] = Question(
-            id=question_id,
-            question=question_text.strip(),
-            options=[o.strip() for o in options],
-            correct=correct,
+        # Long-polls wait on the event loop instead of holding a worker thread
+        loop = self.server._loop
+        state = self.session.manager.state
+        last_version = int(last_version)
+        deadline = loop.time() + max(0.0, min(float(timeout), STATE_WAIT_TIMEOUT))
+        while state.version <= last_version and self.running:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(self.state_event.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+        return self.apis["admin"].wait_for_state_change(last_version, 0)
+
+
+class QuizServer:
+    """Serves the player and admin pages plus their APIs over HTTP and WebSocket.
+
+    ``POST /api/<role>/<method>?game=<id>`` takes ``{"args": [...]}`` and
+    returns the API result. ``/ws?role=<role>&game=<id>`` carries
+    ``{"id", "method", "args"}`` calls and their ``{"id", "result"}`` replies,
+    plus ``sync`` and ``state`` pushes. Without ``game`` the default game is
+    used; admin requests may start new games. The admin password travels in
+    the ``X-Admin-Password`` header, or as an ``{"auth": password}`` first
+    WebSocket message, never in a URL. Admin file paths are confined to
+    ``data_dir``.
+    """
+
+    def __init__(
+        self,
+        host: str = SERVER_HOST,
+        port: int = SERVER_PORT,
+        workers: int = SERVER_WORKERS,
+        sessions: Optional[SessionRegistry] = None,
+        data_dir: str = SERVER_DATA_DIR,
+    ):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.host = host
+        self.port = port
+        self.data_dir = data_dir
+        self.sessions = sessions if sessions is not None else SessionRegistry(default_game_manager())
+        self.sessions.on_evict.append(self._drop_channel)
+        self.channels: Dict[str, GameChannel] = {}
+        self.pages = {"/": ("player.html", "player"), "/admin": ("admin.html", "admin")}
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="api")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: set = set()
+        self._sweeper: Optional[asyncio.Task] = None
+
+    # -------------- Lifecycle --------------
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._sweeper = asyncio.ensure_future(self._sweep())
+
+    async def serve_forever(self):
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        if self._sweeper:
+            self._sweeper.cancel()
+        if self._server:
+            self._server.close()
+        for game_id in list(self.channels):
+            self.channels.pop(game_id).close()
+        self.sessions.close()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        self._executor.shutdown(wait=False)
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(SESSION_SWEEP_INTERVAL)
+            self.sessions.evict_idle()
+
+    def _drop_channel(self, session: GameSession):
+        channel = self.channels.pop(session.game_id, None)
+        if channel is not None:
+            channel.close()
+
+    def channel(self, game_id: Optional[str], create: bool = False) -> GameChannel:
+        """The channel for ``game_id``; raises LookupError for unknown games."""
+        game_id = game_id or DEFAULT_GAME_ID
+        session = self.sessions.get(game_id, create=create)
+        if session is None:
+            raise LookupError(f"Unknown game: {game_id}")
+        channel = self.channels.get(game_id)
+        if channel is None:
+            channel = self.channels[game_id] = GameChannel(self, session)
+        return channel
+
+    # -------------- API calls --------------
+    @staticmethod
+    def _authorized(role: str, password: Optional[str]) -> bool:
+        if role != "admin":
+            return role == "player"
+        return check_admin_password(password)
+
+    async def call(self, channel: GameChannel, role: str, method: str, args: List[Any]) -> Any:
+        api = channel.apis[role]
+        fn = getattr(api, method, None) if not method.startswith("_") else None
+        if not callable(fn):
+            raise LookupError(f"Unknown method: {method}")
+        if method == "wait_for_state_change":
+            return await channel.wait_for_state_change(*args)
+        channel.session.last_used = time.monotonic()
+        return await self._loop.run_in_executor(self._executor, lambda: fn(*args))
+
+    # -------------- HTTP --------------
+    async def _handle(self, reader: "asyncio.StreamReader", writer: "asyncio.StreamWriter"):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, _ = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, b"Bad Request", close=True)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        key, value = line.split(":", 1)
+                        headers[key.strip().lower()] = value.strip()
+                url = urlsplit(target)
+                if url.path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                    await self._websocket(reader, writer, headers, parse_qs(url.query))
+                    return
+                length = int(headers.get("content-length") or 0)
+                if length > SERVER_MAX_BODY:
+                    await self._respond(writer, 413, b"Payload Too Large", close=True)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                close = headers.get("connection", "").lower() == "close"
+                status, ctype, payload = await self._route(
+                    method, url.path, parse_qs(url.query), headers, body
+                )
+                await self._respond(writer, status, payload, ctype, close)
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _respond(
+        self,
+        writer: "asyncio.StreamWriter",
+        status: int,
+        payload: bytes,
+        ctype: str = "text/plain; charset=utf-8",
+        close: bool = False,
+    ):
+        head = (
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            f"Content-Type: {ctype}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Cache-Control: no-store\r\n"
+            f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n"
         )
-        self.sync_to_player()
-        return {"success": True, "message": "Question updated successfully!"}
+        writer.write(head.encode("latin-1") + payload)
+        await writer.drain()
 
-    def delete_question(self, question_id: int) -> Dict[str, Any]:
-        if not 0 <= question_id < len(self.questions):
-            return {"success": False, "error": "Invalid question ID"}
-        # Keep protection on deleting the tiebreaker question
-        if question_id == len(self.questions) - 1:
-            return {"success": False, "error": "Cannot delete tiebreaker question"}
-        if self.state.game_started and question_id not in self.state.answered_questions:
-            return {
-                "success": False,
-                "error": "Cannot delete unanswered questions during game",
-            }
+    async def _route(
+        self,
+        method: str,
+        path: str,
+        query: Dict[str, List[str]],
+        headers: Dict[str, str],
+        body: bytes,
+    ) -> Tuple[int, str, bytes]:
+        if path.startswith("/api/"):
+            if method != "POST":
+                return 405, "text/plain; charset=utf-8", b"Method Not Allowed"
+            parts = path.split("/")
+            if len(parts) != 4:
+                return 404, "text/plain; charset=utf-8", b"Not Found"
+            role, name = parts[2], parts[3]
+            if not self._authorized(role, headers.get("x-admin-password")):
+                return 403, "text/plain; charset=utf-8", b"Forbidden"
+            try:
+                channel = self.channel((query.get("game") or [None])[0], create=role == "admin")
+                args = json.loads(body or b"{}").get("args", [])
+                result = await self.call(channel, role, name, list(args))
+            except LookupError as e:
+                return 404, "text/plain; charset=utf-8", str(e).encode()
+            except (ValueError, TypeError, AttributeError) as e:
+                return 400, "text/plain; charset=utf-8", str(e).encode()
+            except Exception as e:
+                print(f"API call {role}.{name} failed:")
+                traceback.print_exception(type(e), e, e.__traceback__)
+                return 500, "text/plain; charset=utf-8", describe_error(e).encode()
+            # ASCII escapes keep surrogate-pair emoji from the question bank intact
+            return 200, "application/json", encode_json(result).encode("ascii")
+        if method not in ("GET", "HEAD"):
+            return 405, "text/plain; charset=utf-8", b"Method Not Allowed"
+        if path in self.pages:
+            name, role = self.pages[path]
+            html = (get_web_path() / name).read_text(encoding="utf-8")
+            shim = SERVER_CLIENT_SHIM % {"role": json.dumps(role)}
+            html = html.replace("</head>", shim + "</head>", 1)
+            return 200, "text/html; charset=utf-8", html.encode("utf-8")
+        return self._static(path)
+
+    def _static(self, path: str) -> Tuple[int, str, bytes]:
+        root = get_web_path().resolve()
+        try:
+            target = (root / path.lstrip("/")).resolve()
+            target.relative_to(root)
+            data = target.read_bytes()
+        except (ValueError, OSError):
+            return 404, "text/plain; charset=utf-8", b"Not Found"
+        ctype = mimetypes.guess_type(target.name)[0] or "application/octet-stream"
+        return 200, ctype, data
 
-        self.questions.pop(question_id)
-        # Reindex
-        for i, q in enumerate(self.questions):
-            q.id = i
-        # Reindex answered/timed out
-        self.state.answered_questions = [
-            idx if idx < question_id else idx - 1
-            for idx in self.state.answered_questions
-            if idx != question_id
-        ]
-        self.state.timed_out_questions = [
-            idx if idx < question_id else idx - 1
-            for idx in self.state.timed_out_questions
-            if idx != question_id
-        ]
-        if self.state.questions_results:
-            new_map = {}
-            for idx, data in self.state.questions_results.items():
-                if idx == question_id:
+    # -------------- WebSocket --------------
+    async def _websocket(self, reader, writer, headers: Dict[str, str], query: Dict[str, List[str]]):
+        role = (query.get("role") or [""])[0]
+        key = headers.get("sec-websocket-key")
+        game_id = (query.get("game") or [None])[0]
+        if not key or role not in ("player", "admin"):
+            await self._respond(writer, 403, b"Forbidden", close=True)
+            return
+        if role == "player":
+            try:
+                channel = self.channel(game_id)
+            except (LookupError, ValueError) as e:
+                await self._respond(writer, 404, str(e).encode(), close=True)
+                return
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        writer.write(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+            ).encode("latin-1")
+        )
+        if role == "admin":
+            # Authenticate before an admin socket can create a game
+            error = None if await self._ws_authenticate(reader) else "auth_failed"
+            if error is None:
+                try:
+                    channel = self.channel(game_id, create=True)
+                except (LookupError, ValueError) as e:
+                    error = str(e)
+            if error is not None:
+                reply = json.dumps({"type": "error", "error": error}).encode()
+                writer.write(ws_frame(reply) + ws_frame(b"", 0x8))
+                await writer.drain()
+                return
+        client = WebSocketClient(role, writer)
+        channel.clients[role].add(client)
+        self.sessions.attach(channel.session)
+        pump = asyncio.ensure_future(client.pump())
+        tasks = set()
+        try:
+            while not client.closed:
+                opcode, data = await ws_read_message(reader)
+                if opcode == 0x8:
+                    client.send(ws_frame(data[:2], 0x8))
+                    break
+                if opcode == 0x9:
+                    client.send(ws_frame(data, 0xA))
                     continue
-                new_idx = idx if idx < question_id else idx - 1
-                new_map[new_idx] = data
-            self.state.questions_results = new_map
-
-        self._recalculate_remaining_questions()
-        self.sync_to_player()
-        return {
-            "success": True,
-            "message": "Question deleted successfully!",
-            "total_questions": len(self.questions),
-        }
+                if opcode not in (0x1, 0x2):
+                    continue
+                task = asyncio.ensure_future(self._ws_call(channel, client, data))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            channel.clients[role].discard(client)
+            self.sessions.detach(channel.session)
+            for task in tasks:
+                task.cancel()
+            client.close()
+            await pump
 
+    async def _ws_authenticate(self, reader: "asyncio.StreamReader") -> bool:
+        """Read an admin socket's first message, which must be ``{"auth": password}``."""
+        try:
+            opcode, data = await asyncio.wait_for(ws_read_message(reader), WS_AUTH_TIMEOUT)
+            message = json.loads(data) if opcode in (0x1, 0x2) else None
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            return False
+        return isinstance(message, dict) and self._authorized("admin", message.get("auth"))
 
-game_manager = GameManager()
+    async def _ws_call(self, channel: GameChannel, client: WebSocketClient, data: bytes):
+        msg_id = None
+        method = ""
+        try:
+            msg = json.loads(data)
+            msg_id = msg.get("id")
+            method = str(msg.get("method", ""))
+            result = await self.call(channel, client.role, method, list(msg.get("args") or []))
+            reply = '{"id":%s,"result":%s}' % (json.dumps(msg_id), encode_json(result))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if not isinstance(e, (LookupError, ValueError, TypeError, AttributeError)):
+                print(f"API call {client.role}.{method} failed:")
+                traceback.print_exception(type(e), e, e.__traceback__)
+            reply = json.dumps({"id": msg_id, "error": describe_error(e)})
+        client.send(ws_frame(reply.encode("ascii")))
 
 
 # =========================
-# APIs
+# Diagnostics
 # =========================
-class AdminAPI:
-    def verify_password(self, password: str) -> Dict[str, Any]:
-        return {
-            "success": password == ADMIN_PASSWORD,
-            "message": "OK" if password == ADMIN_PASSWORD else "Invalid",
-        }
+def synthetic_questions(count: int) -> Iterator[Question]:
+    """Placeholder questions for load tests; the last one becomes the tiebreaker."""
+    for i in range(count):
+        yield Question(id=-1, question=f"Q{i}?", options=["a", "b", "c", "d"], correct=i % 4)
 
-    def get_all_questions(self) -> Dict[str, Any]:
-        return {
-            "success": True,
-            "questions": [q.to_dict() for q in game_manager.questions],
-        }
 
-    def add_question(
-        self, question_text: str, options: List[str], correct_index: int
-    ) -> Dict[str, Any]:
-        return game_manager.add_question(question_text, options, correct_index)
+def check_game_invariants(
+    manager: GameManager, advances: Optional[int] = None, start_team: Optional[int] = None
+) -> List[str]:
+    """Consistency checks for a game driven only through the APIs.
 
-    def edit_question(
-        self,
-        question_id: int,
-        question_text: str,
-        options: List[str],
-        correct_index: int,
-    ) -> Dict[str, Any]:
-        return game_manager.edit_question(
-            question_id, question_text, options, correct_index
+    The event log is replayed from the start: every answer and timeout must
+    come from the team whose turn it was, and the replay must rebuild the
+    live state. Scores are checked against the recorded results unless the
+    team count changed or an answered question was deleted since the last
+    reset (both legitimately keep points without a result). ``advances``,
+    the number of successful calls that passed the turn on, and
+    ``start_team``, the team that had the first turn, add a turn count check
+    for games that were never reset.
+    """
+    state, settings = manager.state, manager.settings
+    problems = []
+    if state.remaining_questions != manager._count_remaining_questions():
+        problems.append(
+            f"remaining_questions {state.remaining_questions}"
+            f" != {manager._count_remaining_questions()}"
         )
+    answered = set(state.answered_questions)
+    if len(answered) != len(state.answered_questions):
+        problems.append("a question is marked answered twice")
+    if not set(state.questions_results) <= answered:
+        problems.append("a result exists for an unanswered question")
+    replay = manager.events.machine_at(0)
+    scores_follow_results = True
+    for event in manager.events.events:
+        if event.kind in ("answer", "timeout") and event.data["team"] != replay.state.current_team:
+            problems.append(
+                f"event {event.seq}: team {event.data['team']} played"
+                f" on team {replay.state.current_team}'s turn"
+            )
+            break
+        teams = replay.settings.number_of_teams
+        replay.apply(event)
+        if event.kind == "reset":
+            scores_follow_results = True
+        elif (
+            replay.settings.number_of_teams != teams
+            or event.kind == "score"
+            or (event.kind == "question_deleted" and event.data["answered"])
+            or (event.kind == "questions_changed" and any(a for _, a in event.data["deleted"]))
+        ):
+            scores_follow_results = False
+    if scores_follow_results:
+        expected = [0] * settings.number_of_teams
+        for qid, result in state.questions_results.items():
+            if not manager.is_tiebreaker(qid):
+                points = settings.points_correct if result["correct"] else settings.points_wrong
+                expected[result["team"] - 1] = max(0, expected[result["team"] - 1] + points)
+        actual = [state.get_score(t) for t in range(1, settings.number_of_teams + 1)]
+        if actual != expected:
+            problems.append(f"scores {actual} != {expected} from results")
+    if advances is not None and start_team is not None:
+        team = (start_team - 1 + advances) % settings.number_of_teams + 1
+        if state.current_team != team:
+            problems.append(f"current_team {state.current_team} != {team}")
+    replayed = replay.state.to_dict()
+    live = state.to_dict()
+    replayed.pop("version")
+    live.pop("version")
+    if replayed != live:
+        problems.append("replaying the event log does not rebuild the state")
+    return problems
 
-    def delete_question(self, question_id: int) -> Dict[str, Any]:
-        return game_manager.delete_question(question_id)
 
-    def get_settings(self) -> Dict[str, Any]:
-        return {"success": True, "settings": game_manager.settings.to_dict()}
+def run_stress_test(
+    games: int = 20,
+    threads: int = 16,
+    calls: int = 500,
+    questions: int = 1000,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Hammer fresh games with concurrent player and admin calls.
 
-    def update_settings(self, settings: Dict[str, Any]) -> Dict[str, Any]:
-        new_num = settings.get("number_of_teams", game_manager.settings.number_of_teams)
-        if not 2 <= int(new_num) <= 4:
-            return {
-                "success": False,
-                "error": "Number of teams must be between 2 and 4",
-            }
-        old_num = game_manager.settings.number_of_teams
-        game_manager.settings.update(settings)
-        # Clamp current_team
-        if game_manager.state.current_team > game_manager.settings.number_of_teams:
-            game_manager.state.current_team = 1
-        # Zero scores for removed teams
-        for i in range(game_manager.settings.number_of_teams + 1, 5):
-            setattr(game_manager.state, f"team{i}_score", 0)
-        # Recalc remaining if not started
-        if not game_manager.state.game_started:
-            game_manager._recalculate_remaining_questions()
-        game_manager.sync_to_player()
-        return {
-            "success": True,
-            "message": "Settings updated!",
-            "settings": game_manager.settings.to_dict(),
-        }
+    Each game uses a synthetic bank of ``questions`` questions and runs
+    ``threads`` threads making ``calls`` random calls each:
+    answers and timeouts on random (often the same) questions, turn
+    switches, spins and starts, admin edits, deletes, resets, team count
+    changes and reads. Invariants are checked after each game, and any
+    call that raised or failed without an error message is reported.
+    """
+    rng = random.Random(seed)
+    previous_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible
+    report: Dict[str, Any] = {"games": games, "calls": 0, "succeeded": 0, "violations": []}
+    try:
+        for game in range(games):
+            manager = GameManager(MemoryQuestionStore(synthetic_questions(questions)))
+            player, admin = PlayerAPI(manager), AdminAPI(manager)
+            player.spin_wheel()
+            player.start_game()
+            ids = manager.questions.ids()
+            counters = {"calls": 0, "succeeded": 0}
+            counter_lock = threading.Lock()
+            errors: List[str] = []
 
-    def get_game_state(self) -> Dict[str, Any]:
-        return {"success": True, "game_state": game_manager.state.to_dict()}
+            def worker(worker_seed: int):
+                local = random.Random(worker_seed)
+                for _ in range(calls):
+                    pick = local.random()
+                    qid = local.choice(ids)
+                    try:
+                        if pick < 0.35:
+                            r = player.check_answer(qid, local.randrange(4))
+                        elif pick < 0.5:
+                            r = player.handle_timeout(qid)
+                        elif pick < 0.54:
+                            r = player.switch_team()
+                        elif pick < 0.58:
+                            r = admin.add_question("Stress?", ["a", "b", "c", "d"], 0)
+                        elif pick < 0.62:
+                            r = admin.edit_question(qid, "Edited?", ["a", "b", "c", "d"], 1)
+                        elif pick < 0.65:
+                            r = admin.delete_question(qid)
+                        elif pick < 0.67:
+                            r = admin.update_settings({"timer_duration": local.randint(10, 60)})
+                        elif pick < 0.68:
+                            r = admin.update_settings({"number_of_teams": local.randint(2, 6)})
+                        elif pick < 0.69:
+                            r = admin.reset_game()
+                        elif pick < 0.72:
+                            r = player.spin_wheel()
+                        elif pick < 0.75:
+                            r = player.start_game()
+                        elif pick < 0.87:
+                            r = player.get_state_since(local.randint(0, manager.state.version))
+                        else:
+                            r = admin.get_leaderboard()
+                        if not r.get("success") and not r.get("error"):
+                            raise RuntimeError(f"failed without an error message: {r}")
+                    except Exception as e:
+                        r = {"success": False}
+                        with counter_lock:
+                            errors.append(f"{type(e).__name__}: {e}")
+                    with counter_lock:
+                        counters["calls"] += 1
+                        counters["succeeded"] += bool(r.get("success"))
 
-    def force_spin_wheel(self, team_number: int) -> Dict[str, Any]:
-        if game_manager.state.wheel_spun:
-            return {"success": False, "error": "Wheel already spun"}
-        if not 1 <= team_number <= game_manager.settings.number_of_teams:
-            return {
-                "success": False,
-                "error": f"Invalid team (1-{game_manager.settings.number_of_teams})",
-            }
-        game_manager.state.current_team = team_number
-        game_manager.state.wheel_spun = True
-        game_manager.sync_to_player()
-        return {
-            "success": True,
-            "starting_team": team_number,
-            "team_name": game_manager.settings.get_team_name(team_number),
-        }
+            pool = [
+                threading.Thread(target=worker, args=(rng.randrange(1 << 30),))
+                for _ in range(threads)
+            ]
+            for t in pool:
+                t.start()
+            for t in pool:
+                t.join()
+            report["calls"] += counters["calls"]
+            report["succeeded"] += counters["succeeded"]
+            for error in sorted(set(errors)):
+                report["violations"].append(f"game {game}: raised {error}")
+            for problem in check_game_invariants(manager):
+                report["violations"].append(f"game {game}: {problem}")
+    finally:
+        sys.setswitchinterval(previous_interval)
+    report["ok"] = not report["violations"]
+    return report
 
-    def force_start_game(self) -> Dict[str, Any]:
-        if not game_manager.state.wheel_spun:
-            return {"success": False, "error": "Wheel must be spun first"}
-        game_manager.state.game_started = True
-        game_manager.sync_to_player()
-        return {"success": True, "message": "Game started"}
 
-    def manual_score_set(self, team: int, score: int) -> Dict[str, Any]:
-        if not 1 <= team <= game_manager.settings.number_of_teams:
-            return {"success": False, "error": "Invalid team"}
-        setattr(game_manager.state, f"team{team}_score", max(0, int(score)))
-        game_manager.sync_to_player()
-        return {"success": True, "message": f"Team {team} score set to {score}"}
+class BenchWindow:
+    """Stand-in for a webview window that only counts the scripts pushed to it."""
 
-    def reset_game(self) -> Dict[str, Any]:
-        game_manager.state.reset(len(game_manager.questions))
-        game_manager.sync_to_player()
-        return {"success": True, "message": "Game reset"}
+    def __init__(self):
+        self.calls = 0
+        self.bytes = 0
 
-    def export_questions(self) -> Dict[str, Any]:
-        return {
-            "success": True,
-            "data": json.dumps([q.to_dict() for q in game_manager.questions], indent=2),
-        }
+    def evaluate_js(self, script: str):
+        self.calls += 1
+        self.bytes += len(script)
 
-    def import_questions(self, json_data: str) -> Dict[str, Any]:
-        try:
-            imported = json.loads(json_data)
-            if not isinstance(imported, list) or not imported:
-                return {"success": False, "error": "Invalid format"}
-            for q in imported:
-                if not all(k in q for k in ["question", "options", "correct"]):
-                    return {"success": False, "error": "Missing fields"}
-                if len(q.get("options", [])) != 4:
-                    return {
-                        "success": False,
-                        "error": "Each question must have 4 options",
-                    }
-                if not 0 <= q.get("correct", -1) < 4:
-                    return {"success": False, "error": "Invalid correct answer index"}
-            # Ensure last is tiebreaker
-            if (
-                imported
-                and TIEBREAKER_TAG not in imported[-1].get("question", "").upper()
-            ):
-                imported[-1]["question"] = "\ud83c\udfc6 TIEBREAKER: " + imported[
-                    -1
-                ].get("question", "")
-            game_manager.questions = [
-                Question(id=i, **q) for i, q in enumerate(imported)
-            ]
-            if not game_manager.state.game_started:
-                game_manager._recalculate_remaining_questions()
-            game_manager.sync_to_player()
-            return {
-                "success": True,
-                "message": f"Imported {len(game_manager.questions)} questions",
-                "total_questions": len(game_manager.questions),
-            }
-        except json.JSONDecodeError:
-            return {"success": False, "error": "Invalid JSON"}
 
-    def open_player_window(self) -> Dict[str, Any]:
-        if game_manager.player_window:
+class BenchRecorder:
+    """Latency, allocation and payload samples per API operation.
+
+    Every ``trace_every``-th call of an operation (or any call made with
+    ``trace=True``) runs under tracemalloc to measure its peak allocation and
+    is left out of the latency figures.
+    """
+
+    def __init__(self, trace_every: int = BENCH_TRACE_EVERY):
+        self.trace_every = trace_every
+        self.samples: Dict[str, Dict[str, List[float]]] = {}
+
+    def call(
+        self, op: str, fn: Callable[..., Dict[str, Any]], *args, trace: bool = False
+    ) -> Dict[str, Any]:
+        samples = self.samples.setdefault(op, {"us": [], "alloc": [], "payload": []})
+        calls = len(samples["us"]) + len(samples["alloc"])
+        if trace or (self.trace_every and calls % self.trace_every == self.trace_every - 1):
+            tracemalloc.start()
             try:
-                game_manager.player_window.destroy()
-            except Exception:
-                pass
+                result = fn(*args)
+                samples["alloc"].append(tracemalloc.get_traced_memory()[1])
             finally:
-                game_manager.player_window = None
-        threading.Timer(0.1, create_player_window).start()
-        return {"success": True, "message": "Opening player window..."}
+                tracemalloc.stop()
+        else:
+            t0 = time.perf_counter_ns()
+            result = fn(*args)
+            samples["us"].append(round((time.perf_counter_ns() - t0) / 1000, 2))
+        # What the bridge would carry back to the page
+        samples["payload"].append(len(json.dumps(result)))
+        return result
 
-    def exit_application(self) -> Dict[str, Any]:
-        try:
-            if game_manager.admin_window:
-                game_manager.admin_window.destroy()
-            if game_manager.player_window:
-                game_manager.player_window.destroy()
-        except Exception:
-            pass
-        finally:
-            try:
-                webview.destroy_window()
-            except Exception:
-                pass
-        return {"success": True}
+    @staticmethod
+    def percentile(values: List[float], pct: float) -> Optional[float]:
+        """Nearest-rank percentile; None without samples."""
+        if not values:
+            return None
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        pct = self.percentile
+        return {
+            op: {
+                "calls": len(s["us"]) + len(s["alloc"]),
+                "p50_us": pct(s["us"], 50),
+                "p99_us": pct(s["us"], 99),
+                "max_us": pct(s["us"], 100),
+                "alloc_p50_bytes": pct(s["alloc"], 50),
+                "alloc_max_bytes": pct(s["alloc"], 100),
+                "payload_p50_bytes": pct(s["payload"], 50),
+                "payload_max_bytes": pct(s["payload"], 100),
+            }
+            for op, s in sorted(self.samples.items())
+        }
 
 
-class PlayerAPI:
-    def open_admin_panel(self, password: str) -> Dict[str, Any]:
-        if password != ADMIN_PASSWORD:
-            return {"success": False, "error": "Invalid password"}
-        if not game_manager.admin_window:
-            threading.Timer(0.1, create_admin_window_from_player).start()
-        return {"success": True, "message": "Admin panel opening..."}
+def _call(name: str, fn: Callable[..., Dict[str, Any]], *args: Any) -> Dict[str, Any]:
+    return fn(*args)
 
-    def close_player_window(self) -> Dict[str, Any]:
-        try:
-            if game_manager.player_window:
-                game_manager.player_window.destroy()
-                game_manager.player_window = None
-            return {"success": True}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
 
-    def exit_application(self) -> Dict[str, Any]:
-        try:
-            if game_manager.admin_window:
-                game_manager.admin_window.destroy()
-            if game_manager.player_window:
-                game_manager.player_window.destroy()
-        except Exception:
-            pass
-        finally:
-            try:
-                webview.destroy_window()
-            except Exception:
-                pass
-        return {"success": True}
+def play_game(
+    player: PlayerAPI,
+    rng: random.Random,
+    call: Callable[..., Dict[str, Any]] = _call,
+    on_turn: Optional[Callable[[int], None]] = None,
+    timeout_rate: float = BENCH_TIMEOUT_RATE,
+) -> int:
+    """Spin, then open and answer (or time out) every question in board order
+    and play the tiebreaker until the game is decided; returns the turns.
 
-    def reset_game(self) -> Dict[str, Any]:
-        game_manager.state.reset(len(game_manager.questions))
-        game_manager.sync_to_admin()
-        game_manager.sync_to_player()
-        return {"success": True, "game_state": game_manager.state.to_dict()}
+    Every API call goes through ``call(name, fn, *args)``.
+    """
+    manager = player.manager
+    player.spin_wheel()
+    version = player.start_game(0)["state_delta"]["version"]
+    board = manager.question_board()
+    turns = 0
+    for turn, qid in enumerate(board["question_ids"]):
+        call("get_question", player.get_question, qid)
+        if rng.random() < timeout_rate:
+            result = call("handle_timeout", player.handle_timeout, qid, version)
+        else:
+            result = call("check_answer", player.check_answer, qid, rng.randrange(4), version)
+        version = result["state_delta"]["version"]
+        turns += 1
+        if on_turn:
+            on_turn(turn)
+    tiebreaker_id = board["tiebreaker_id"]
+    while manager.state.tiebreaker_active:
+        call("get_question", player.get_question, tiebreaker_id)
+        result = call("check_answer", player.check_answer, tiebreaker_id, rng.randrange(4), version)
+        turns += 1
+        if not result["success"]:
+            break
+        version = result["state_delta"]["version"]
+    return turns
 
-    def spin_wheel(self) -> Dict[str, Any]:
-        # Allow respin any time before game starts
-        if game_manager.state.game_started:
-            return {"success": False, "error": "Cannot spin wheel after game started"}
-        num_teams = game_manager.settings.number_of_teams
-        if num_teams < 2:
-            return {"success": False, "error": "Invalid team count"}
-        starting_team = random.randint(1, num_teams)
-        game_manager.state.current_team = starting_team
-        game_manager.state.wheel_spun = True
-        game_manager.sync_to_admin()
-        return {
-            "success": True,
-            "starting_team": starting_team,
-            "team_name": game_manager.settings.get_team_name(starting_team),
-            "number_of_teams": num_teams,
-        }
-
-    def start_game(self) -> Dict[str, Any]:
-        if not game_manager.state.wheel_spun:
-            return {"success": False, "error": "Spin wheel first"}
-        game_manager.state.game_started = True
-        game_manager.sync_to_admin()
-        return {"success": True, "game_state": game_manager.state.to_dict()}
-
-    def get_question(self, question_index: int) -> Dict[str, Any]:
-        if not game_manager.state.game_started:
-            return {"success": False, "error": "Game not started"}
-        if not 0 <= question_index < len(game_manager.questions):
-            return {"success": False, "error": "Invalid question"}
-        if question_index in game_manager.state.answered_questions:
-            return {"success": False, "error": "Already answered"}
-        is_tiebreaker = question_index == len(game_manager.questions) - 1
-        if game_manager.state.tiebreaker_active and not is_tiebreaker:
-            return {"success": False, "error": "Tiebreaker is active"}
-        if not game_manager.state.tiebreaker_active and is_tiebreaker:
-            return {"success": False, "error": "Tiebreaker not yet available"}
-        game_manager.state.current_question_index = question_index
-        return {
-            "success": True,
-            "question": game_manager.questions[question_index].to_dict(
-                include_answer=False
-            ),
-            "current_team": game_manager.state.current_team,
-            "is_tiebreaker": is_tiebreaker,
+
+def simulate_game(
+    store: Optional[QuestionStore] = None, teams: int = 2, seed: int = 0
+) -> Dict[str, Any]:
+    """Play one game with random answers over ``store`` (default: the built-in bank)."""
+    manager = GameManager(store, seed=seed)
+    manager.player_window, manager.admin_window = BenchWindow(), BenchWindow()
+    AdminAPI(manager).update_settings({"number_of_teams": teams})
+    turns = play_game(PlayerAPI(manager), random.Random(seed))
+    result = {
+        "success": manager.state.game_finished,
+        "seed": seed,
+        "teams": teams,
+        "questions": len(manager.questions),
+        "turns": turns,
+        "events": len(manager.events),
+        **manager.state.score_dict(),
+        "winner": manager.machine.winner(),
+    }
+    manager.close()
+    return result
+
+
+def _replay_sweep_game(
+    codes: List[int], tries: int, teams: int, points_correct: int, points_wrong: int
+) -> Tuple[List[int], Optional[str], int]:
+    """Play one sweep game through GameMachine, team 1 having won the spin.
+
+    Returns the scores, the winner and the number of turns.
+    """
+    settings = Settings()
+    settings.update(
+        {
+            "number_of_teams": teams,
+            "points_correct": points_correct,
+            "points_wrong": points_wrong,
+        }
+    )
+    state = GameState(remaining_questions=len(codes))
+    state.set_team_count(teams)
+    machine = GameMachine(state, settings)
+    machine.apply(GameEvent(0, "spin", {"team": 1}))
+    machine.apply(GameEvent(1, "start"))
+    outcome: Dict[str, Any] = {}
+    turns = 0
+    for question_id, code in enumerate(codes):
+        data = {"question_id": question_id, "team": state.current_team, "tiebreaker": False}
+        if code == RESULT_TIMEOUT:
+            outcome = machine.apply(GameEvent(turns + 2, "timeout", data))
+        else:
+            data.update(selected=0, correct=code == RESULT_CORRECT)
+            outcome = machine.apply(GameEvent(turns + 2, "answer", data))
+        turns += 1
+    while state.tiebreaker_active and turns < len(codes) + tries:
+        turns += 1
+        data = {
+            "question_id": len(codes),
+            "team": state.current_team,
+            "selected": 0,
+            "correct": turns == len(codes) + tries,
+            "tiebreaker": True,
         }
+        outcome = machine.apply(GameEvent(turns + 1, "answer", data))
+    scores = [state.get_score(team) for team in range(1, teams + 1)]
+    return scores, outcome.get("winner"), turns
 
-    def check_answer(self, question_index: int, selected_option: int) -> Dict[str, Any]:
-        try:
-            if not 0 <= question_index < len(game_manager.questions):
-                return {"success": False, "error": "Invalid question"}
-            if question_index in game_manager.state.answered_questions:
-                return {"success": False, "error": "Question already answered"}
-            question = game_manager.questions[question_index]
-            correct = selected_option == question.correct
-            is_tiebreaker = question_index == len(game_manager.questions) - 1
-            current_team = game_manager.state.current_team
-            if is_tiebreaker and not game_manager.state.tiebreaker_active:
-                return {"success": False, "error": "Tiebreaker not yet available"}
-            # Scoring
-            if not is_tiebreaker:
-                curr = getattr(game_manager.state, f"team{current_team}_score", 0)
-                delta = (
-                    game_manager.settings.points_correct
-                    if correct
-                    else game_manager.settings.points_wrong
+
+def sweep_settings(
+    questions: int,
+    teams: Iterable[int] = SWEEP_TEAMS,
+    points_correct: Iterable[int] = SWEEP_POINTS_CORRECT,
+    points_wrong: Iterable[int] = SWEEP_POINTS_WRONG,
+    timers: Iterable[float] = SWEEP_TIMERS,
+    games: int = SWEEP_GAMES,
+    accuracy: float = SWEEP_ACCURACY,
+    answer_time: float = SWEEP_ANSWER_TIME,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Monte-Carlo the game rules for every combination of the settings given.
+
+    Each setting plays ``games`` games of ``questions`` regular questions at
+    once with NumPy, under the rules GameMachine applies: turns rotate from
+    the team that won the spin, scores never drop below 0, a tie for the
+    lead after the last question goes to the tiebreaker, and whichever team
+    answers that first wins. All teams are equally strong, so the first
+    team's edge over 1/teams comes from the turn order alone. Point rules
+    with the same team count and timer are played on the same random draws,
+    which keeps the differences between them from being noise. Raises
+    ImportError without NumPy.
+    """
+    np = load_numpy()
+    teams, points_correct, points_wrong, timers = (
+        [int(n) for n in teams],
+        [int(n) for n in points_correct],
+        [int(n) for n in points_wrong],
+        [float(n) for n in timers],
+    )
+    if (
+        questions < 1
+        or games < 1
+        or not 0 < accuracy <= 1
+        or answer_time <= 0
+        or not all(2 <= n <= MAX_TEAMS for n in teams)
+        or not all(timer > 0 for timer in timers)
+    ):
+        return {"success": False, "error": "Invalid sweep settings"}
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    chunk = max(1, SWEEP_CHUNK_CELLS // questions)
+    totals: Dict[Tuple[int, int, int, float], Dict[str, Any]] = {}
+    verified = mismatches = 0
+    for team_count, timer in itertools.product(teams, timers):
+        timeout_rate = math.exp(-timer / answer_time)
+        right = (1 - timeout_rate) * accuracy
+        for first in range(0, games, chunk):
+            size = min(chunk, games - first)
+            draws = rng.random((size, questions), dtype=np.float32)
+            codes = np.full(draws.shape, RESULT_WRONG, dtype=np.uint8)
+            codes[draws < right] = RESULT_CORRECT
+            codes[draws >= 1 - timeout_rate] = RESULT_TIMEOUT
+            del draws
+            # Tiebreaker turns up to and including the first right answer
+            tries = rng.geometric(right, size)
+            # Question q goes to turn position q % teams (0 = the spin winner)
+            correct_counts = np.zeros((size, team_count), dtype=np.int64)
+            wrong_counts = np.zeros((size, team_count), dtype=np.int64)
+            for position in range(team_count):
+                answers = codes[:, position::team_count]
+                correct_counts[:, position] = (answers == RESULT_CORRECT).sum(axis=1)
+                wrong_counts[:, position] = (answers == RESULT_WRONG).sum(axis=1)
+            for pc, pw in itertools.product(points_correct, points_wrong):
+                if pc >= 0 and pw >= 0:
+                    # No score can go below 0, so counting answers is enough
+                    scores = pc * correct_counts + pw * wrong_counts
+                else:
+                    points = np.zeros((size, questions), dtype=np.int64)
+                    points[codes == RESULT_CORRECT] = pc
+                    points[codes == RESULT_WRONG] = pw
+                    scores = np.zeros((size, team_count), dtype=np.int64)
+                    for question in range(questions):
+                        column = scores[:, question % team_count]
+                        np.maximum(column + points[:, question], 0, out=column)
+                leaders = scores == scores.max(axis=1)[:, None]
+                tied = np.count_nonzero(leaders, axis=1) > 1
+                winner = np.where(
+                    tied, (questions + tries - 1) % team_count, scores.argmax(axis=1)
                 )
-                setattr(
-                    game_manager.state,
-                    f"team{current_team}_score",
-                    max(0, curr + delta),
+                total = totals.setdefault(
+                    (team_count, pc, pw, timer),
+                    {"ties": 0, "upsets": 0, "turns": 0, "wins": np.zeros(team_count, np.int64)},
                 )
-            # Persist per-question result
-            game_manager.state.questions_results[question_index] = {
-                "team": current_team,
-                "correct": bool(correct),
-            }
-            # Lock question
-            game_manager.state.answered_questions.append(question_index)
-            if not is_tiebreaker:
-                game_manager._recalculate_remaining_questions()
-            if question_index in game_manager.state.timed_out_questions:
-                game_manager.state.timed_out_questions.remove(question_index)
-            # Flow
-            game_ended = False
-            winner = None
-            if is_tiebreaker:
-                if correct:
-                    game_manager.state.game_finished = True
-                    game_manager.state.tiebreaker_active = False
-                    game_manager.state.tiebreaker_used = True
-                    game_ended = True
-                    winner = f"TEAM{current_team}"
-                else:
-                    game_manager.state.current_team = game_manager.get_next_team(
-                        current_team
+                total["ties"] += int(np.count_nonzero(tied))
+                upset = tied & ~leaders[np.arange(size), winner]
+                total["upsets"] += int(np.count_nonzero(upset))
+                total["turns"] += size * questions + int(tries[tied].sum())
+                total["wins"] += np.bincount(winner, minlength=team_count)
+                if first:
+                    continue
+                for i in range(min(SWEEP_VERIFY_GAMES, size)):
+                    replayed = _replay_sweep_game(
+                        codes[i].tolist(), int(tries[i]), team_count, pc, pw
                     )
-            else:
-                game_manager.state.current_team = game_manager.get_next_team(
-                    current_team
-                )
-                if game_manager.state.remaining_questions == 0:
-                    if game_manager.check_tiebreaker_condition():
-                        game_manager.state.tiebreaker_active = True
-                        game_manager.state.tiebreaker_used = True
-                    else:
-                        game_manager.state.game_finished = True
-                        game_ended = True
-                        winner = game_manager.determine_winner()
-            game_manager.sync_to_admin()
-            return {
-                "success": True,
-                "is_correct": correct,
-                "correct": correct,
-                "correct_answer": question.correct,
-                "game_state": game_manager.state.to_dict(),
-                "current_team": game_manager.state.current_team,
-                "game_ended": game_ended,
-                "winner": winner,
-                **game_manager.get_score_dict(),
-            }
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-
-    def handle_timeout(self, question_index: int) -> Dict[str, Any]:
-        try:
-            if not 0 <= question_index < len(game_manager.questions):
-                return {"success": False, "error": "Invalid question"}
-            is_tiebreaker = question_index == len(game_manager.questions) - 1
-            current_team = game_manager.state.current_team
-            if is_tiebreaker and not game_manager.state.tiebreaker_active:
-                return {"success": False, "error": "Tiebreaker not yet available"}
-            if question_index not in game_manager.state.answered_questions:
-                game_manager.state.answered_questions.append(question_index)
-            if question_index not in game_manager.state.timed_out_questions:
-                game_manager.state.timed_out_questions.append(question_index)
-            if not is_tiebreaker:
-                game_manager._recalculate_remaining_questions()
-            game_manager.state.current_team = game_manager.get_next_team(current_team)
-            game_ended = False
-            winner = None
-            if not is_tiebreaker and game_manager.state.remaining_questions == 0:
-                if game_manager.check_tiebreaker_condition():
-                    game_manager.state.tiebreaker_active = True
-                    game_manager.state.tiebreaker_used = True
-                else:
-                    game_manager.state.game_finished = True
-                    game_ended = True
-                    winner = game_manager.determine_winner()
-            game_manager.sync_to_admin()
-            return {
-                "success": True,
-                "game_state": game_manager.state.to_dict(),
-                "game_ended": game_ended,
-                "winner": winner,
+                    expected = (
+                        scores[i].tolist(),
+                        f"TEAM{winner[i] + 1}",
+                        questions + (int(tries[i]) if tied[i] else 0),
+                    )
+                    verified += 1
+                    mismatches += replayed != expected
+    results = []
+    for (team_count, pc, pw, timer), total in totals.items():
+        timeout_rate = math.exp(-timer / answer_time)
+        wins = total["wins"] / games
+        mean_turns = total["turns"] / games
+        results.append(
+            {
+                "teams": team_count,
+                "points_correct": pc,
+                "points_wrong": pw,
+                "timer_duration": timer,
+                "timeout_rate": round(timeout_rate, 4),
+                "tie_rate": round(total["ties"] / games, 4),
+                # Tiebreakers won by a team that was not tied for the lead
+                "tiebreaker_upset_rate": round(total["upsets"] / max(1, total["ties"]), 4),
+                "mean_turns": round(mean_turns, 2),
+                # A turn lasts the answer time, or the whole timer on a timeout
+                "mean_minutes": round(mean_turns * answer_time * (1 - timeout_rate) / 60, 1),
+                "first_team_win_rate": round(float(wins[0]), 4),
+                "spin_advantage": round(float(wins[0]) - 1 / team_count, 4),
+                "win_rate_by_turn_order": [round(float(w), 4) for w in wins],
             }
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-
-    def switch_team(self) -> Dict[str, Any]:
-        game_manager.state.current_team = game_manager.get_next_team(
-            game_manager.state.current_team
         )
-        game_manager.sync_to_admin()
-        return {"success": True, "game_state": game_manager.state.to_dict()}
-
-    def restart_game(self) -> Dict[str, Any]:
-        game_manager.state.reset(len(game_manager.questions))
-        game_manager.sync_to_admin()
-        return {"success": True, "game_state": game_manager.state.to_dict()}
+    return {
+        "success": mismatches == 0,
+        "questions": questions,
+        "games_per_setting": games,
+        "games": games * len(results),
+        "accuracy": accuracy,
+        "answer_time": answer_time,
+        "seed": seed,
+        "verified_games": verified,
+        "mismatches": mismatches,
+        "seconds": round(time.perf_counter() - started, 2),
+        "results": results,
+    }
 
-    def get_game_state(self) -> Dict[str, Any]:
-        return {"success": True, "game_state": game_manager.state.to_dict()}
 
-    def get_settings(self) -> Dict[str, Any]:
-        return {"success": True, "settings": game_manager.settings.to_dict()}
+def validate_question_file(path: str) -> Dict[str, Any]:
+    """Check a JSON or JSON Lines bank the way an import would, without loading it."""
+    stats: Dict[str, Any] = {
+        "path": path,
+        "records": 0,
+        "valid": 0,
+        "error_count": 0,
+        "errors": [],
+        "duplicate_count": 0,
+        "duplicates": [],
+    }
+    duplicates = NearDuplicateFinder()
+    try:
+        for line_no, record, error in iter_question_records(path):
+            stats["records"] += 1
+            error = error or validate_question_record(record)
+            if not error:
+                stats["valid"] += 1
+                match = duplicates.check(record["question"], record["options"])
+                if match is not None:
+                    record_duplicate(stats, stats["valid"], match, line=line_no)
+                continue
+            stats["error_count"] += 1
+            if len(stats["errors"]) < IMPORT_ERROR_LIMIT:
+                stats["errors"].append({"line": line_no, "error": error})
+    except (OSError, UnicodeDecodeError) as e:
+        return dict(stats, success=False, error=str(e))
+    return dict(stats, success=stats["valid"] > 0 and not stats["error_count"])
 
 
-# =========================
-# Window creation
-# =========================
+def run_startup_benchmark(runs: int = STARTUP_BENCH_RUNS) -> Dict[str, Any]:
+    """Time cold starts of this module in fresh interpreters.
 
+    Each run imports the module under ``-X importtime``, builds the default
+    game and loads pywebview (when installed), as the desktop app does
+    before its first window. Times are medians in milliseconds; the
+    heaviest imports are the module's own, from the last run.
+    """
+    import subprocess
 
-def get_web_path() -> Path:
     if getattr(sys, "frozen", False):
-        base_path = Path(getattr(sys, "_MEIPASS", Path(sys.executable).parent))
-        return base_path / "web"
-    return Path(__file__).parent.absolute() / "web"
+        raise RuntimeError("the startup benchmark needs a Python interpreter")
+    module = Path(__file__).stem
+    script = (
+        "import json, sys, time\n"
+        "t0 = time.perf_counter()\n"
+        f"sys.path.insert(0, {str(Path(__file__).parent)!r})\n"
+        f"import {module} as m\n"
+        "t1 = time.perf_counter()\n"
+        "m.default_game_manager()\n"
+        "t2 = time.perf_counter()\n"
+        "try:\n"
+        "    m.load_webview()\n"
+        "except ImportError:\n"
+        "    pass\n"
+        "t3 = time.perf_counter()\n"
+        "print(json.dumps([t1 - t0, t2 - t0, t3 - t2, m.webview is not None]))\n"
+    )
+    samples: Dict[str, List[float]] = {"process": [], "import": [], "ready": [], "webview": []}
+    heaviest: List[Dict[str, Any]] = []
+    has_webview = False
+    for _ in range(runs):
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", script],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        samples["process"].append(time.perf_counter() - started)
+        imported, ready, webview_load, has_webview = json.loads(proc.stdout.splitlines()[-1])
+        samples["import"].append(imported)
+        samples["ready"].append(ready)
+        samples["webview"].append(webview_load)
+        children: List[Dict[str, Any]] = []
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|")
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            if depth == 0 and name.strip() == module:
+                heaviest = sorted(children, key=lambda c: -c["ms"])[:STARTUP_BENCH_TOP]
+            if depth == 0:
+                children = []
+            elif depth == 1 and cumulative.strip().isdigit():
+                children.append({"module": name.strip(), "ms": int(cumulative) / 1000})
+    median = {key: round(sorted(values)[len(values) // 2] * 1000, 2) for key, values in samples.items()}
+    return {
+        "python": platform.python_version(),
+        "runs": runs,
+        "process_ms": median["process"],
+        "import_ms": median["import"],
+        "ready_ms": median["ready"],
+        "webview_ms": median["webview"] if has_webview else None,
+        "heaviest_imports": heaviest,
+    }
 
 
-def get_screen_size() -> Tuple[int, int]:
-    if sys.platform == "win32":
-        try:
-            import ctypes
+def bench_game(
+    questions: int, teams: int, seed: int = 0, trace_every: int = BENCH_TRACE_EVERY
+) -> Dict[str, Any]:
+    """Play one full game over a synthetic bank through PlayerAPI/AdminAPI.
 
-            user32 = ctypes.windll.user32
-            return user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
-        except Exception:
-            pass
-    return 1920, 1080
+    Before the game ``BENCH_EDITS`` questions are added and deleted again
+    and the bank is re-imported ``BENCH_IMPORT_RUNS`` times (plus once
+    traced); then every regular question is opened and
+    answered (or timed out), the tiebreaker is played if the scores tie,
+    and the admin's get_game_state is sampled along the way.
+    """
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    manager = GameManager(MemoryQuestionStore(synthetic_questions(questions)), seed=seed)
+    manager.player_window, manager.admin_window = BenchWindow(), BenchWindow()
+    player, admin = PlayerAPI(manager), AdminAPI(manager)
+    rec = BenchRecorder(trace_every)
+    admin.update_settings({"number_of_teams": teams})
 
+    added = [
+        rec.call("add_question", admin.add_question, "Bench?", ["a", "b", "c", "d"], 0)[
+            "question_id"
+        ]
+        for _ in range(BENCH_EDITS)
+    ]
+    for qid in added:
+        rec.call("delete_question", admin.delete_question, qid)
+    bank = json.dumps([q.to_dict() for q in manager.questions])
+    for run in range(BENCH_IMPORT_RUNS + 1):
+        result = rec.call("import_questions", admin.import_questions, bank, trace=run == 0)
+        if not result["success"]:
+            raise RuntimeError(f"import failed: {result.get('error')}")
+    del bank
 
-def create_admin_window_from_player():
-    html_file = str(get_web_path() / "admin.html")
-    width, height = get_screen_size()
-    w = int(width * 0.8)
-    h = int(height * 0.85)
-    w = max(1024, min(w, 1600))
-    h = max(768, min(h, 1000))
+    state_every = max(1, questions // BENCH_STATE_SAMPLES)
 
-    game_manager.admin_window = webview.create_window(
-        "Admin Panel",
-        html_file,
-        js_api=AdminAPI(),
-        width=w,
-        height=h,
-        resizable=True,
-        min_size=(1024, 768),
-    )
+    def sample_state(turn: int):
+        if turn % state_every == 0:
+            rec.call("get_game_state", admin.get_game_state)
 
-    def cleanup():
-        game_manager.admin_window = None
+    turns = play_game(player, rng, rec.call, sample_state)
+    if not manager.state.game_finished:
+        raise RuntimeError("benchmark game did not finish")
+    elapsed = time.perf_counter() - started
+    manager.close()
+    return {
+        "questions": questions,
+        "teams": teams,
+        "turns": turns,
+        "seconds": round(elapsed, 3),
+        "events": len(manager.events),
+        "pushes": manager.player_window.calls + manager.admin_window.calls,
+        "ops": rec.summary(),
+    }
 
-    game_manager.admin_window.events.closed += cleanup
 
+def run_benchmark(
+    sizes: Iterable[int] = BENCH_SIZES,
+    teams: Iterable[int] = BENCH_TEAMS,
+    seed: int = 0,
+    trace_every: int = BENCH_TRACE_EVERY,
+) -> Dict[str, Any]:
+    """Benchmark a full game for every bank size and team count."""
+    teams = list(teams)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seed": seed,
+            "trace_every": trace_every,
+        },
+        "results": [
+            bench_game(size, team_count, seed, trace_every)
+            for size in sizes
+            for team_count in teams
+        ],
+    }
 
-def create_player_window():
-    html_file = str(get_web_path() / "player.html")
-    game_manager.player_window = webview.create_window(
-        "MEOM Quiz",
-        html_file,
-        js_api=PlayerAPI(),
-        fullscreen=True,  # Cover entire monitor
-        resizable=False,  # Not resizable
-        frameless=False,  # Use system frame to avoid draggable surface
-        easy_drag=False,  # Ensure no drag helpers (if backend supports)
-    )
 
-    def cleanup():
-        game_manager.player_window = None
+def compare_benchmarks(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = BENCH_TOLERANCE,
+    slack_us: float = BENCH_SLACK_US,
+) -> List[str]:
+    """Regressions of ``current`` against a saved ``baseline`` report.
 
-    game_manager.player_window.events.closed += cleanup
+    A latency counts as regressed when it exceeds the baseline by more than
+    ``tolerance`` (relative) plus ``slack_us``; allocation and payload sizes
+    by more than ``tolerance`` alone. Configurations missing from either
+    report are skipped.
+    """
+    old = {(r["questions"], r["teams"]): r["ops"] for r in baseline.get("results", [])}
+    regressions = []
+    for result in current["results"]:
+        key = (result["questions"], result["teams"])
+        for op, stats in result["ops"].items():
+            before = old.get(key, {}).get(op)
+            if before is None:
+                continue
+            for metric in ("p50_us", "p99_us", "alloc_p50_bytes", "payload_p50_bytes"):
+                if before.get(metric) is None or stats[metric] is None:
+                    continue
+                limit = before[metric] * (1 + tolerance)
+                if metric.endswith("_us"):
+                    limit += slack_us
+                if stats[metric] > limit:
+                    regressions.append(
+                        f"{op} ({key[0]} questions, {key[1]} teams): "
+                        f"{metric} {stats[metric]} > baseline {before[metric]}"
+                    )
+    return regressions
 
 
 # =========================
@@ -977,14 +6290,296 @@ def create_player_window():
 # =========================
 
 
-def start():
+def resume_game_state(state_dir: Optional[str], fsync_window: float = STATE_FSYNC_WINDOW):
+    """Recover the game from ``state_dir`` (or $MEOM_STATE_DIR) and keep logging to it."""
+    state_dir = state_dir or os.environ.get("MEOM_STATE_DIR")
+    if not state_dir:
+        return
+    game_manager = default_game_manager()
+    replayed = game_manager.enable_persistence(state_dir, fsync_window)
+    if game_manager.state.game_started:
+        print(f"Resumed game in progress ({replayed} log records replayed)")
+
+
+def start(
+    state_dir: Optional[str] = None,
+    fsync_window: float = STATE_FSYNC_WINDOW,
+    metrics_file: Optional[str] = None,
+):
+    try:
+        load_webview()
+    except ImportError:
+        sys.exit("pywebview is not installed; use --serve to run the headless server")
+    enable_dpi_awareness()
+    game_manager = default_game_manager()
+    resume_game_state(state_dir, fsync_window)
+    dump = MetricsDump(metrics_file, lambda: {DEFAULT_GAME_ID: game_manager}) if metrics_file else None
+    if dump:
+        dump.start()
     print("=" * 60)
     print("MEOM Quiz Game - Desktop Application")
     print(f"Questions: {len(game_manager.questions)}")
     print("=" * 60)
     create_player_window()
-    webview.start(debug=False)
+    try:
+        webview.start(debug=False)
+    finally:
+        if dump:
+            dump.stop()
+        game_manager.close()
+
+
+def serve(
+    host: str = SERVER_HOST,
+    port: int = SERVER_PORT,
+    state_dir: Optional[str] = None,
+    fsync_window: float = STATE_FSYNC_WINDOW,
+    metrics_file: Optional[str] = None,
+    data_dir: str = SERVER_DATA_DIR,
+):
+    game_manager = default_game_manager()
+    resume_game_state(state_dir, fsync_window)
+    Path(data_dir).mkdir(parents=True, exist_ok=True)
+    server = QuizServer(host, port, data_dir=data_dir)
+    dump = MetricsDump(metrics_file, server.sessions.managers) if metrics_file else None
+    if dump:
+        dump.start()
+
+    async def run():
+        await server.start()
+        shown = "localhost" if host in ("", "0.0.0.0", "::") else host
+        print("=" * 60)
+        print("MEOM Quiz Game - Headless Server")
+        print(f"Questions: {len(game_manager.questions)}")
+        print(f"Player: http://{shown}:{server.port}/")
+        print(f"Admin:  http://{shown}:{server.port}/admin")
+        print("=" * 60)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if dump:
+            dump.stop()
+        game_manager.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="MEOM Quiz Game")
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="run without a GUI and serve the player and admin pages over HTTP/WebSocket",
+    )
+    parser.add_argument("--host", default=SERVER_HOST, help="address to listen on with --serve")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="port to listen on with --serve")
+    parser.add_argument(
+        "--admin-password",
+        help="admin password (default: $MEOM_ADMIN_PASSWORD); required with --serve",
+    )
+    parser.add_argument(
+        "--data-dir",
+        default=os.environ.get("MEOM_DATA_DIR", SERVER_DATA_DIR),
+        help="directory that --serve admins may import from and export to",
+    )
+    parser.add_argument(
+        "--stress",
+        action="store_true",
+        help="run concurrent player/admin calls against fresh games and check invariants",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="record API metrics and rewrite this Prometheus text file every 15 seconds",
+    )
+    parser.add_argument(
+        "--bench",
+        action="store_true",
+        help="play full synthetic games through the APIs and report latency, allocations and payload sizes",
+    )
+    parser.add_argument(
+        "--bench-sizes",
+        type=lambda text: [int(n) for n in text.split(",")],
+        default=list(BENCH_SIZES),
+        help="comma-separated bank sizes for --bench (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--bench-teams",
+        type=lambda text: [int(n) for n in text.split(",")],
+        default=list(BENCH_TEAMS),
+        help="comma-separated team counts for --bench (default: %(default)s)",
+    )
+    parser.add_argument("--bench-out", help="save the --bench report as JSON here")
+    parser.add_argument(
+        "--bench-startup",
+        action="store_true",
+        help="time cold starts (import, default game, pywebview) in fresh interpreters",
+    )
+    parser.add_argument(
+        "--bench-baseline",
+        help="compare --bench against a saved report and fail on regressions",
+    )
+    parser.add_argument(
+        "--rescore",
+        nargs="+",
+        metavar="EVENT_LOG",
+        help="replay exported game event logs with the point rules below and print the results",
+    )
+    parser.add_argument("--points-correct", type=int, help="points for a correct answer with --rescore")
+    parser.add_argument("--points-wrong", type=int, help="points for a wrong answer with --rescore")
+    parser.add_argument(
+        "--validate",
+        nargs="+",
+        metavar="BANK",
+        help="check JSON/JSON Lines question files as an import would and report bad records",
+    )
+    parser.add_argument(
+        "--simulate",
+        action="store_true",
+        help="play one game with random answers and print the result",
+    )
+    parser.add_argument("--teams", type=int, default=2, help="number of teams with --simulate")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for --simulate and --sweep")
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="Monte-Carlo the scoring rules over a grid of settings and print tie rates etc.",
+    )
+    for name, kind, default, what in (
+        ("teams", int, SWEEP_TEAMS, "team counts"),
+        ("points-correct", int, SWEEP_POINTS_CORRECT, "points for a correct answer"),
+        ("points-wrong", int, SWEEP_POINTS_WRONG, "points for a wrong answer"),
+        ("timers", float, SWEEP_TIMERS, "timer durations in seconds"),
+    ):
+        parser.add_argument(
+            f"--sweep-{name}",
+            type=lambda text, kind=kind: [kind(n) for n in text.split(",")],
+            default=list(default),
+            help=f"comma-separated {what} for --sweep (default: %(default)s)",
+        )
+    parser.add_argument(
+        "--sweep-games", type=int, default=SWEEP_GAMES, help="games per setting with --sweep"
+    )
+    parser.add_argument(
+        "--accuracy",
+        type=float,
+        default=SWEEP_ACCURACY,
+        help="chance that an answer given in time is right, with --sweep",
+    )
+    parser.add_argument(
+        "--answer-time",
+        type=float,
+        default=SWEEP_ANSWER_TIME,
+        help="mean seconds a team takes to answer, with --sweep",
+    )
+    parser.add_argument(
+        "--export",
+        metavar="PATH",
+        help="write the question bank to PATH (.json for an array, otherwise JSON Lines)",
+    )
+    parser.add_argument(
+        "--questions",
+        metavar="BANK",
+        help="question file to use with --simulate, --sweep and --export (default: the game's bank)",
+    )
+    parser.add_argument(
+        "--state-dir",
+        help="keep a crash-safe log of the game here and resume from it (default: $MEOM_STATE_DIR)",
+    )
+    parser.add_argument(
+        "--fsync-window",
+        type=float,
+        default=STATE_FSYNC_WINDOW,
+        help="seconds a logged change may wait before it is fsynced (0 = every change)",
+    )
+    args = parser.parse_args(argv)
+    if args.stress:
+        report = run_stress_test()
+        print(json.dumps(report, indent=2))
+        sys.exit(0 if report["ok"] else 1)
+    if args.bench:
+        report = run_benchmark(args.bench_sizes, args.bench_teams)
+        if args.bench_baseline:
+            with open(args.bench_baseline, "r", encoding="utf-8") as fh:
+                report["regressions"] = compare_benchmarks(report, json.load(fh))
+        if args.bench_out:
+            with open(args.bench_out, "w", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2)
+        print(json.dumps(report, indent=2))
+        sys.exit(1 if report.get("regressions") else 0)
+    if args.bench_startup:
+        print(json.dumps(run_startup_benchmark(), indent=2))
+        sys.exit(0)
+    if args.validate:
+        ok = True
+        for path in args.validate:
+            result = validate_question_file(path)
+            ok = ok and result["success"]
+            print(json.dumps(result))
+        sys.exit(0 if ok else 1)
+    if args.simulate or args.export or args.sweep:
+        store = open_question_store()
+        if args.questions:
+            store = MemoryQuestionStore()
+            loaded = stream_import_questions(store, args.questions)
+            if not loaded["success"]:
+                sys.exit(f"{args.questions}: {loaded['error']}")
+        if args.sweep:
+            try:
+                report = sweep_settings(
+                    len(GameManager(store).questions) - 1,
+                    args.sweep_teams,
+                    args.sweep_points_correct,
+                    args.sweep_points_wrong,
+                    args.sweep_timers,
+                    args.sweep_games,
+                    args.accuracy,
+                    args.answer_time,
+                    args.seed,
+                )
+            except ImportError:
+                sys.exit("NumPy is not installed; --sweep needs it (pip install numpy)")
+            print(json.dumps(report, indent=2))
+            sys.exit(0 if report["success"] else 1)
+        if args.export:
+            fmt = "json" if args.export.lower().endswith(".json") else "jsonl"
+            result = stream_export_questions(GameManager(store).questions, args.export, fmt)
+        else:
+            result = simulate_game(store, args.teams, args.seed)
+        print(json.dumps(result))
+        sys.exit(0 if result["success"] else 1)
+    if args.rescore:
+        overrides = {
+            key: value
+            for key, value in (
+                ("points_correct", args.points_correct),
+                ("points_wrong", args.points_wrong),
+            )
+            if value is not None
+        }
+        ok = True
+        for result in rescore_event_logs(args.rescore, overrides):
+            ok = ok and result["success"]
+            print(json.dumps(result))
+        sys.exit(0 if ok else 1)
+    password = args.admin_password or os.environ.get("MEOM_ADMIN_PASSWORD")
+    if password:
+        set_admin_password(password)
+    if args.serve:
+        if not password:
+            sys.exit("--serve needs an admin password: pass --admin-password or set MEOM_ADMIN_PASSWORD")
+        serve(
+            args.host,
+            args.port,
+            args.state_dir,
+            args.fsync_window,
+            args.metrics_file,
+            args.data_dir,
+        )
+    else:
+        start(args.state_dir, args.fsync_window, args.metrics_file)
 
 
 if __name__ == "__main__":
-    start()
+    main()
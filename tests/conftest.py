@@ -0,0 +1,45 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import quiz_admin_player_main as quiz  # noqa: E402
+
+
+def new_game(questions: int = 12, seed: int = 1) -> quiz.GameManager:
+    """A game over a synthetic bank, with stand-in windows for the syncs."""
+    game = quiz.GameManager(quiz.MemoryQuestionStore(quiz.synthetic_questions(questions)), seed)
+    game.player_window, game.admin_window = quiz.BenchWindow(), quiz.BenchWindow()
+    return game
+
+
+@pytest.fixture
+def manager():
+    game = new_game()
+    yield game
+    game.close()
+
+
+def start(manager: quiz.GameManager):
+    player = quiz.PlayerAPI(manager)
+    assert player.spin_wheel()["success"]
+    assert player.start_game()["success"]
+
+
+def play(manager: quiz.GameManager, question_ids, seed: int = 0):
+    """Answer (or now and then time out) each question for the team on turn."""
+    rng = random.Random(seed)
+    player = quiz.PlayerAPI(manager)
+    for qid in question_ids:
+        if rng.random() < 0.2:
+            result = player.handle_timeout(qid)
+        else:
+            result = player.check_answer(qid, rng.randrange(4))
+        assert result["success"], result
+
+
+def regular_ids(manager: quiz.GameManager):
+    return manager.question_board()["question_ids"]
@@ -0,0 +1,70 @@
+import pytest
+
+from quiz_admin_player_main import (
+    RESULT_CORRECT as RIGHT,
+    RESULT_TIMEOUT as TIMEOUT,
+    RESULT_WRONG as WRONG,
+    ResultsArchive,
+    results_analytics,
+    sweep_settings,
+)
+
+pytest.importorskip("numpy")
+
+
+def archive():
+    results = ResultsArchive()
+    # Game 0: team 1 answers everything right, team 2 nothing
+    results.add_game(0, [(1, 1, RIGHT), (2, 2, WRONG), (3, 1, RIGHT), (4, 2, TIMEOUT)])
+    # Game 1: both teams get question 1, team 2 also gets question 2 twice over
+    results.add_game(10, [(1, 1, RIGHT), (1, 2, RIGHT), (2, 2, RIGHT), (3, 2, RIGHT)])
+    return results
+
+
+def test_analytics_per_question_and_team():
+    summary = results_analytics(archive().snapshot())
+    assert summary["games"] == 2
+    assert summary["responses"] == 8
+    assert summary["accuracy"] == 0.75
+    assert summary["timeout_rate"] == 0.125
+    questions = {q["question_id"]: q for q in summary["questions"]}
+    assert questions[1]["attempts"] == 3 and questions[1]["accuracy"] == 1.0
+    assert questions[2]["accuracy"] == 0.5
+    assert questions[4]["timeout_rate"] == 1.0
+    # Easiest first, more attempts first among equals
+    assert [q["question_id"] for q in summary["questions"]] == [1, 3, 2, 4]
+    teams = {t["team"]: t for t in summary["teams"]}
+    assert teams[1]["accuracy"] == 1.0 and teams[1]["longest_streak"] == 2
+    assert teams[2]["attempts"] == 5 and teams[2]["longest_streak"] == 3
+
+
+def test_analytics_discrimination_separates_strong_and_weak_teams():
+    summary = results_analytics(archive().snapshot())
+    questions = {q["question_id"]: q for q in summary["questions"]}
+    # Only the weakest respondent (team 2, game 0) missed question 2
+    assert questions[2]["discrimination"] > 0
+    assert questions[1]["discrimination"] is None
+
+
+def test_analytics_of_an_empty_archive():
+    summary = results_analytics(ResultsArchive().snapshot())
+    assert summary["responses"] == 0 and summary["questions"] == []
+
+
+def test_sweep_matches_the_game_rules():
+    result = sweep_settings(
+        12, teams=[2, 3], points_correct=[2], points_wrong=[0, -1], timers=[30], games=500
+    )
+    assert result["success"], result
+    assert result["verified_games"] > 0 and result["mismatches"] == 0
+    assert len(result["results"]) == 4
+    for row in result["results"]:
+        assert sum(row["win_rate_by_turn_order"]) == pytest.approx(1, abs=1e-3)
+        assert row["mean_turns"] >= 12
+
+
+def test_sweep_is_reproducible_and_checks_its_settings():
+    kwargs = dict(teams=[2], points_correct=[1], points_wrong=[0], timers=[20], games=200)
+    first, second = sweep_settings(8, seed=3, **kwargs), sweep_settings(8, seed=3, **kwargs)
+    assert first["results"] == second["results"]
+    assert not sweep_settings(8, teams=[1])["success"]
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from quiz_admin_player_main import NearDuplicateFinder
+
+RIVER = ["Danube", "Rhine", "Elbe", "Oder"]
+BANK = [
+    ("What is the capital of France?", ["Paris", "Lyon", "Nice", "Lille"]),
+    ("Which river flows through Vienna, Budapest and Belgrade on its way to the Black Sea?", RIVER),
+    ("Who painted the Mona Lisa?", ["Leonardo", "Raphael", "Titian", "Botticelli"]),
+    ("Which river flows through Vienna, Budapest and Belgrade on its way to the Black Sea today?", RIVER),
+    ("WHAT is the capital of france", ["Lille", "Nice", "Lyon", "Paris"]),
+    ("How many legs does a spider have?", ["8", "6", "10", "12"]),
+]
+EXPECTED = [None, None, None, (1, 0.9545), (0, 1.0), None]
+
+SCRIPT = """
+from quiz_admin_player_main import NearDuplicateFinder
+from tests.test_duplicates import BANK
+finder = NearDuplicateFinder()
+print([finder.check(text, options) for text, options in BANK])
+"""
+
+
+def test_finds_the_expected_pairs():
+    finder = NearDuplicateFinder()
+    found = [finder.check(text, options) for text, options in BANK]
+    assert [m and (m[0], round(m[1], 4)) for m in found] == EXPECTED
+
+
+def test_pairs_do_not_depend_on_the_hash_seed():
+    root = Path(__file__).resolve().parent.parent
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", SCRIPT],
+            cwd=root,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        for seed in ("1", "2", "3")
+    }
+    assert len(outputs) == 1
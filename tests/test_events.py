@@ -0,0 +1,85 @@
+from quiz_admin_player_main import GameEventLog, AdminAPI
+
+from .conftest import new_game, play, regular_ids, start
+
+
+def test_replay_rebuilds_the_live_state(manager):
+    start(manager)
+    play(manager, regular_ids(manager))
+    replayed = manager.events.machine_at().state.to_dict()
+    live = manager.state.to_dict()
+    replayed.pop("version")
+    live.pop("version")
+    assert replayed == live
+
+
+def test_seek_matches_the_state_at_that_point(manager):
+    start(manager)
+    ids = regular_ids(manager)
+    play(manager, ids[:4])
+    offset = len(manager.events)
+    scores = manager.state.score_dict()
+    play(manager, ids[4:], seed=2)
+    past = manager.events.machine_at(offset).state
+    assert past.score_dict() == scores
+    assert past.answered_count == 4
+
+
+def test_log_survives_a_dict_round_trip(manager):
+    start(manager)
+    play(manager, regular_ids(manager)[:6])
+    copy = GameEventLog.from_dict(manager.events.to_dict())
+    assert [e.to_dict() for e in copy.events] == [e.to_dict() for e in manager.events.events]
+    assert copy.machine_at().state.score_dict() == manager.state.score_dict()
+
+
+def test_rescoring_replays_with_new_points(manager):
+    start(manager)
+    play(manager, regular_ids(manager))
+    rescored = manager.events.machine_at(overrides={"points_correct": 10}).state
+    correct = {
+        team: sum(
+            1
+            for qid, result in manager.state.questions_results.items()
+            if result["team"] == team and result["correct"] and not manager.is_tiebreaker(qid)
+        )
+        for team in (1, 2)
+    }
+    assert rescored.get_score(1) == 10 * correct[1]
+    assert rescored.get_score(2) == 10 * correct[2]
+    assert AdminAPI(manager).get_state_at(3)["success"]
+
+
+def test_checkpoints_stay_evenly_spaced():
+    game = new_game(questions=60)
+    try:
+        game.events = GameEventLog(game.state, game.settings, checkpoint_every=4)
+        start(game)
+        play(game, regular_ids(game))
+        gaps = [b - a for a, b in zip(game.events._offsets, game.events._offsets[1:])]
+        assert gaps and set(gaps) == {4}
+        assert len(game.events) - game.events._offsets[-1] < 4
+    finally:
+        game.close()
+
+
+def test_checkpoints_are_capped_and_seeks_still_match():
+    game = new_game(questions=80)
+    try:
+        game.events = GameEventLog(game.state, game.settings, checkpoint_every=2, max_checkpoints=4)
+        start(game)
+        play(game, regular_ids(game))
+        log = game.events
+        assert len(log._checkpoints) <= 4
+        gaps = {b - a for a, b in zip(log._offsets, log._offsets[1:])}
+        assert len(gaps) == 1
+        full = GameEventLog.from_dict(log.to_dict(), checkpoint_every=10**9)
+        for offset in range(0, len(log) + 1, 7):
+            seeked, replayed = log.machine_at(offset).state, full.machine_at(offset).state
+            assert seeked.answered_count == replayed.answered_count
+            assert seeked.score_dict() == replayed.score_dict()
+            assert seeked.current_team == replayed.current_team
+        assert AdminAPI(game).reset_game()["success"]
+        assert len(log._checkpoints) == 1
+    finally:
+        game.close()
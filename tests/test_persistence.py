@@ -0,0 +1,104 @@
+import json
+
+import quiz_admin_player_main as quiz
+from quiz_admin_player_main import AdminAPI
+
+from .conftest import new_game, play, regular_ids, start
+
+
+def without_version(data):
+    return {key: value for key, value in data.items() if key != "version"}
+
+
+def played_persisted_game(directory, games: int):
+    """A persisted game after ``games`` reset games and half of one more."""
+    game = new_game(questions=21)
+    game.enable_persistence(str(directory), fsync_window=0)
+    for seed in range(games):
+        start(game)
+        play(game, regular_ids(game), seed=seed)
+        assert AdminAPI(game).reset_game()["success"]
+    start(game)
+    play(game, regular_ids(game)[:7], seed=games)
+    return game
+
+
+def test_recovery_rebuilds_the_game(tmp_path):
+    game = played_persisted_game(tmp_path, games=2)
+    game.close()
+    recovered = new_game(questions=21)
+    try:
+        recovered.enable_persistence(str(tmp_path), fsync_window=0)
+        assert without_version(recovered.state.to_dict()) == without_version(game.state.to_dict())
+        assert recovered.settings.to_dict() == game.settings.to_dict()
+        assert recovered.events.origin == game.events.origin
+        assert [e.to_dict() for e in recovered.events.events] == [
+            e.to_dict() for e in game.events.events
+        ]
+        assert recovered.results.games == 2
+    finally:
+        recovered.close()
+
+
+def test_recovery_carries_only_the_current_game(tmp_path):
+    sizes = {}
+    for games in (1, 8):
+        directory = tmp_path / str(games)
+        played_persisted_game(directory, games).close()
+        recovered = new_game(questions=21)
+        try:
+            assert recovered.enable_persistence(str(directory), fsync_window=0) > 0
+            events = [e.to_dict() for e in recovered.events.events]
+        finally:
+            recovered.close()
+        # The snapshot written on recovery holds the current game's events only
+        snapshot = json.loads((directory / "state.snapshot.json").read_text())
+        assert snapshot["events"]["events"] == events
+        assert all(event["kind"] != "reset" for event in events)
+        sizes[games] = len(events)
+    assert sizes[1] == sizes[8]
+
+
+def test_recovery_stops_at_a_torn_line(tmp_path):
+    game = played_persisted_game(tmp_path, games=1)
+    expected = without_version(game.state.to_dict())
+    game.close()
+    # The process died halfway through writing the next record
+    segment = max(tmp_path.glob("state.*.wal"), key=lambda path: int(path.name.split(".")[1]))
+    with open(segment, "a", encoding="utf-8") as fh:
+        fh.write('{"seq": 999999, "state": {"full"')
+    recovered = new_game(questions=21)
+    try:
+        recovered.enable_persistence(str(tmp_path), fsync_window=0)
+        assert without_version(recovered.state.to_dict()) == expected
+        # Play goes on from there and survives the next recovery
+        play(recovered, regular_ids(recovered)[7:9], seed=5)
+        expected = without_version(recovered.state.to_dict())
+    finally:
+        recovered.close()
+    again = new_game(questions=21)
+    try:
+        again.enable_persistence(str(tmp_path), fsync_window=0)
+        assert without_version(again.state.to_dict()) == expected
+    finally:
+        again.close()
+
+
+def test_snapshots_bound_the_replay(tmp_path):
+    game = new_game(questions=21)
+    log = quiz.StateLog(str(tmp_path), fsync_window=0, snapshot_every=5)
+    log.recover(game)
+    game.state_log = log
+    start(game)
+    play(game, regular_ids(game), seed=1)
+    expected = without_version(game.state.to_dict())
+    game.close()
+    assert log.snapshots > 2
+    recovered = new_game(questions=21)
+    try:
+        replay = quiz.StateLog(str(tmp_path), fsync_window=0, snapshot_every=5)
+        assert replay.recover(recovered) <= 5
+        assert without_version(recovered.state.to_dict()) == expected
+        recovered.state_log = replay
+    finally:
+        recovered.close()
@@ -0,0 +1,172 @@
+import json
+
+import pytest
+
+import quiz_admin_player_main as quiz
+from quiz_admin_player_main import AdminAPI
+
+OPTIONS = ["a", "b", "c", "d"]
+
+
+def bank(manager):
+    return [q.to_dict() for q in manager.questions]
+
+
+def test_invalid_batch_changes_nothing(manager):
+    admin = AdminAPI(manager)
+    before = bank(manager)
+    first = manager.questions.ids()[0]
+    result = admin.apply_question_batch(
+        [
+            {"op": "add", "question": "New?", "options": OPTIONS, "correct": 0},
+            {
+                "op": "edit",
+                "question_id": first,
+                "question": "Changed?",
+                "options": OPTIONS,
+                "correct": 1,
+            },
+            {"op": "delete", "question_id": 10 ** 9},
+        ]
+    )
+    assert not result["success"]
+    assert [r["success"] for r in result["results"]] == [True, True, False]
+    assert bank(manager) == before
+
+
+def test_valid_batch_applies_every_operation(manager):
+    admin = AdminAPI(manager)
+    ids = manager.questions.ids()
+    count = len(manager.questions)
+    result = admin.apply_question_batch(
+        [
+            {"op": "add", "question": "New?", "options": OPTIONS, "correct": 0},
+            {"op": "delete", "question_id": ids[1]},
+        ]
+    )
+    assert result["success"], result
+    assert len(manager.questions) == count
+    assert ids[1] not in manager.questions
+    assert manager.questions.get(result["results"][0]["question_id"]).question == "New?"
+
+
+def test_batch_keeps_category_and_difficulty(manager):
+    admin = AdminAPI(manager)
+    first = manager.questions.ids()[0]
+    manager.questions.update(
+        first, quiz.Question(-1, "Old?", OPTIONS, 0, category="maths", difficulty=2)
+    )
+    result = admin.apply_question_batch(
+        [
+            {
+                "op": "add",
+                "question": "New?",
+                "options": OPTIONS,
+                "correct": 0,
+                "category": "science",
+                "difficulty": 3,
+            },
+            {"op": "edit", "question_id": first, "question": "Q?", "options": OPTIONS, "correct": 1},
+        ]
+    )
+    assert result["success"], result
+    added = manager.questions.get(result["results"][0]["question_id"])
+    assert (added.category, added.difficulty) == ("science", 3)
+    edited = manager.questions.get(first)
+    assert (edited.question, edited.category, edited.difficulty) == ("Q?", "maths", 2)
+
+
+@pytest.fixture(params=["memory", "view", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        store = quiz.MemoryQuestionStore(quiz.synthetic_questions(12))
+    elif request.param == "view":
+        store = quiz.QuestionBankView(quiz.MemoryQuestionStore(quiz.synthetic_questions(12)))
+    else:
+        store = quiz.SQLiteQuestionStore(str(tmp_path / "bank.db"))
+        store.replace_all(quiz.synthetic_questions(12))
+    yield store
+    store.close()
+
+
+def test_batch_failing_midway_changes_nothing(store, monkeypatch):
+    game = quiz.GameManager(store, 1)
+    game.player_window, game.admin_window = quiz.BenchWindow(), quiz.BenchWindow()
+    ids = store.ids()
+    before = [q.to_dict() for q in store]
+    revision = store.delta_since()["revision"]
+    remove = store.remove
+
+    def remove_once(question_id):
+        if question_id == ids[2]:
+            raise OSError("disk full")
+        remove(question_id)
+
+    monkeypatch.setattr(store, "remove", remove_once)
+    ops = [
+        {"op": "add", "question": "New?", "options": OPTIONS, "correct": 0},
+        {"op": "edit", "question_id": ids[0], "question": "Q?", "options": OPTIONS, "correct": 1},
+        {"op": "delete", "question_id": ids[1]},
+        {"op": "delete", "question_id": ids[2]},
+    ]
+    with pytest.raises(OSError):
+        with game.transaction():
+            game.apply_question_batch(ops)
+    assert [q.to_dict() for q in store] == before
+    # Clients that saw the half-applied bank reload it in full
+    assert store.delta_since(revision, store.bank_id)["full"]
+    monkeypatch.undo()
+    with game.transaction():
+        assert game.apply_question_batch(ops)["success"]
+    assert len(store) == len(before) - 1
+
+
+@pytest.mark.parametrize(
+    "bad",
+    [
+        {"question": "Q?", "options": ["a", "", "c", "d"], "correct": 0},
+        {"question": "Q?", "options": ["a", "b", "c", 4], "correct": 0},
+        {"question": "Q?", "options": OPTIONS, "correct": True},
+        {"question": " ", "options": OPTIONS, "correct": 0},
+        "Q?",
+    ],
+)
+def test_json_import_rejects_invalid_records(manager, bad):
+    before = bank(manager)
+    good = {"question": "Fine?", "options": OPTIONS, "correct": 1}
+    result = AdminAPI(manager).import_questions(json.dumps([good, bad, good]))
+    assert not result["success"]
+    assert result["error"].startswith("Question 2: ")
+    assert bank(manager) == before
+
+
+def test_sqlite_count_is_stored_with_the_rows(tmp_path):
+    path = str(tmp_path / "bank.db")
+    store = quiz.SQLiteQuestionStore(path)
+    store.replace_all(quiz.synthetic_questions(12))
+    store.add(quiz.Question(-1, "New?", OPTIONS, 0))
+    store.remove(store.ids()[0])
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            store.add(quiz.Question(-1, "Gone?", OPTIONS, 0))
+            assert len(store) == 13
+            raise RuntimeError
+    assert len(store) == 12
+    store.close()
+    store = quiz.SQLiteQuestionStore(path)
+    try:
+        # Read from the meta table, not counted
+        assert store._conn.execute("SELECT value FROM meta WHERE key = 'count'").fetchone() == (12,)
+        assert len(store) == 12 == len(list(store))
+    finally:
+        store.close()
+
+
+def test_incomplete_store_fails_when_built():
+    class Partial(quiz.QuestionStore):
+        def __len__(self):
+            return 0
+
+    with pytest.raises(TypeError, match="abstract"):
+        Partial()
+    assert len(quiz.MemoryQuestionStore(quiz.synthetic_questions(3))) == 3
@@ -0,0 +1,45 @@
+import pytest
+
+import quiz_admin_player_main as quiz
+from quiz_admin_player_main import AdminAPI, RESULTS_DIR, ResultsArchive
+
+from .conftest import new_game, play, regular_ids, start
+
+
+def test_archive_survives_many_resets_on_disk(tmp_path):
+    game = new_game(questions=41)
+    try:
+        game.enable_persistence(str(tmp_path), fsync_window=0)
+        admin = AdminAPI(game)
+        for seed in range(8):
+            start(game)
+            play(game, regular_ids(game), seed=seed)
+            assert admin.reset_game()["success"]
+        assert game.results.games == 8
+        assert game.results.starts[-1] > 255
+        loaded = ResultsArchive(str(tmp_path / RESULTS_DIR))
+        assert loaded.starts == game.results.starts
+        assert loaded.snapshot() == game.results.snapshot()
+    finally:
+        game.close()
+
+
+def test_failed_write_leaves_memory_and_disk_alike(tmp_path, monkeypatch):
+    archive = ResultsArchive(str(tmp_path))
+    assert archive.add_game(0, [(1, 1, 0), (2, 2, 1)])
+
+    def full_disk(path, mode="r", *args, **kwargs):
+        if str(path).endswith("starts.q"):
+            raise OSError("disk full")
+        return open(path, mode, *args, **kwargs)
+
+    monkeypatch.setattr(quiz, "open", full_disk, raising=False)
+    with pytest.raises(OSError):
+        archive.add_game(5, [(3, 1, 2)])
+    monkeypatch.undo()
+    assert archive.games == 1 and len(archive) == 2
+    loaded = ResultsArchive(str(tmp_path))
+    assert loaded.starts == archive.starts
+    assert loaded.snapshot() == archive.snapshot()
+    assert archive.add_game(5, [(3, 1, 2)])
+    assert ResultsArchive(str(tmp_path)).snapshot() == archive.snapshot()
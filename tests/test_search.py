@@ -0,0 +1,55 @@
+from quiz_admin_player_main import MemoryQuestionStore, Question, QuestionBankView
+
+BANK = [
+    ("What is the capital of France?", ["Paris", "Lyon", "Nice", "Lille"]),
+    ("Which river is the longest in Europe?", ["Volga", "Danube", "Rhine", "Seine"]),
+    ("What is the capital of Germany?", ["Berlin", "Bonn", "Munich", "Hamburg"]),
+    ("Which country has the most lakes?", ["Canada", "Finland", "Russia", "Sweden"]),
+    ("Tiebreaker: how many bones are in the human body?", ["206", "208", "212", "198"]),
+]
+
+
+def questions():
+    return [Question(-1, text, list(options), 0) for text, options in BANK]
+
+
+def ids(hits):
+    """Hit ids best first; equal scores come in no set order, so by id."""
+    return [question_id for question_id, score in sorted(hits, key=lambda h: (-round(h[1], 9), h[0]))]
+
+
+def test_rarer_terms_rank_higher():
+    store = MemoryQuestionStore(questions())
+    assert ids(store.search("capital france")) == [0, 2]
+    assert ids(store.search("PARIS!")) == [0]
+    assert ids(store.search("the capital"))[:2] in ([0, 2], [2, 0])
+    assert store.search("kangaroo") == []
+
+
+def test_index_follows_edits():
+    store = MemoryQuestionStore(questions())
+    store.search("capital")
+    store.update(0, Question(-1, "What is the capital of Italy?", ["Rome", "a", "b", "c"], 0))
+    added = store.add(Question(-1, "Capital of Spain?", ["Madrid", "a", "b", "c"], 0))
+    store.remove(3)
+    assert store.search("paris") == []
+    assert ids(store.search("rome")) == [0]
+    assert ids(store.search("madrid")) == [added]
+    assert store.search("lakes") == []
+    # The caught-up index scores exactly like a fresh one
+    caught_up = sorted(store.search("capital of", 10))
+    store._index = None
+    assert sorted(store.search("capital of", 10)) == caught_up
+
+
+def test_view_ranks_like_a_private_bank():
+    base = MemoryQuestionStore(questions())
+    view = QuestionBankView(base)
+    view.update(1, Question(-1, "Which capital lies on the Danube?", ["Vienna", "a", "b", "c"], 0))
+    view.remove(3)
+    view.add(Question(-1, "Capital of Austria?", ["Vienna", "a", "b", "c"], 0))
+    private = MemoryQuestionStore.adopt(list(view._merged()))
+    for query in ("vienna", "danube", "lakes", "germany", "bones"):
+        assert ids(view.search(query)) == ids(private.search(query)), query
+    assert ids(view.search("capital of germany"))[0] == 2
+    assert base.search("vienna") == []
@@ -0,0 +1,34 @@
+import pytest
+
+import quiz_admin_player_main as quiz
+
+
+@pytest.mark.parametrize("path", ["../log.json", "/tmp/log.json", "sub/../../log.json"])
+def test_admin_paths_stay_in_the_data_directory(manager, tmp_path, path):
+    admin = quiz.ServerAdminAPI(manager, data_dir=str(tmp_path / "data"))
+    assert not admin.export_event_log(path)["success"]
+    assert not admin.import_questions_file(path)["success"]
+    assert not admin.export_questions_file(path)["success"]
+
+
+def test_admin_exports_into_the_data_directory(manager, tmp_path):
+    (tmp_path / "data").mkdir()
+    admin = quiz.ServerAdminAPI(manager, data_dir=str(tmp_path / "data"))
+    result = admin.export_event_log("log.json")
+    assert result["success"], result
+    assert (tmp_path / "data" / "log.json").exists()
+
+
+def test_admin_password_is_configurable(monkeypatch):
+    monkeypatch.setattr(quiz, "admin_password", quiz.ADMIN_PASSWORD)
+    quiz.set_admin_password("s3cret")
+    assert quiz.check_admin_password("s3cret")
+    assert not quiz.check_admin_password(quiz.ADMIN_PASSWORD)
+    assert not quiz.check_admin_password(None)
+
+
+def test_serve_needs_a_configured_password(monkeypatch):
+    monkeypatch.delenv("MEOM_ADMIN_PASSWORD", raising=False)
+    monkeypatch.setattr(quiz, "serve", lambda *args: pytest.fail("server started"))
+    with pytest.raises(SystemExit, match="admin password"):
+        quiz.main(["--serve"])
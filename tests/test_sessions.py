@@ -0,0 +1,35 @@
+from quiz_admin_player_main import (
+    VIEW_QUESTION_ID_BASE,
+    AdminAPI,
+    PlayerAPI,
+    SessionRegistry,
+    check_game_invariants,
+)
+
+from .conftest import new_game, play, regular_ids
+
+
+def test_room_game_answers_a_question_added_to_the_room():
+    main = new_game()
+    rooms = SessionRegistry(main)
+    room = rooms.get("room1", create=True).manager
+    added = AdminAPI(room).add_question("Added?", ["a", "b", "c", "d"], 2)
+    assert added["success"], added
+    question_id = added["question_id"]
+    assert question_id >= VIEW_QUESTION_ID_BASE
+    player = PlayerAPI(room)
+    start_team = player.spin_wheel()["starting_team"]
+    assert player.start_game()["success"]
+    ids = regular_ids(room)
+    assert question_id in ids
+    result = player.check_answer(question_id, 2)
+    assert result["success"], result
+    assert player.check_answer(question_id, 2)["error"] == "Question already answered"
+    assert room.state.is_answered(question_id)
+    assert room.state.get_score(start_team) == room.settings.points_correct
+    play(room, [qid for qid in ids if qid != question_id])
+    assert check_game_invariants(room, len(ids), start_team) == []
+    # The shared bank and the default game never see the room's question
+    assert question_id not in main.questions
+    rooms.close()
+    main.close()
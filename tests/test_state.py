@@ -0,0 +1,57 @@
+import time
+
+from quiz_admin_player_main import AdminAPI, GameState
+
+from .conftest import play, regular_ids, start
+
+
+def without_version(data):
+    return {key: value for key, value in data.items() if key != "version"}
+
+
+def test_delta_brings_an_old_copy_up_to_date(manager):
+    start(manager)
+    ids = regular_ids(manager)
+    play(manager, ids[:3])
+    client = GameState()
+    client.restore(manager.state.to_dict())
+    since = manager.state.version
+    play(manager, ids[3:6], seed=1)
+    delta = manager.state.delta_since(since)
+    assert not delta["full"]
+    client.apply_delta(delta)
+    assert without_version(client.to_dict()) == without_version(manager.state.to_dict())
+
+
+def test_unknown_version_gets_a_full_snapshot(manager):
+    start(manager)
+    play(manager, regular_ids(manager)[:2])
+    delta = manager.state.delta_since(manager.state.version + 1000)
+    assert delta["full"]
+    assert delta["game_state"] == manager.state.to_dict()
+
+
+def test_restore_round_trip(manager):
+    start(manager)
+    play(manager, regular_ids(manager)[:5])
+    copy = GameState()
+    copy.restore(manager.state.to_dict())
+    assert without_version(copy.to_dict()) == without_version(manager.state.to_dict())
+    assert copy.answered_count == manager.state.answered_count
+
+
+def test_sparse_question_ids():
+    state = GameState()
+    assert state.mark_answered(1 << 40)
+    assert state.is_answered(1 << 40)
+    assert state.answered_questions == [1 << 40]
+
+
+def test_client_ahead_of_the_server_waits_then_resyncs(manager):
+    admin = AdminAPI(manager)
+    began = time.monotonic()
+    result = admin.wait_for_state_change(10**9, 0.2)
+    assert time.monotonic() - began >= 0.2
+    assert result["changed"] and result["state"]["full"]
+    assert result["state"]["version"] == manager.state.version
+    assert not admin.wait_for_state_change(result["state"]["version"], 0.05)["changed"]
@@ -0,0 +1,31 @@
+from quiz_admin_player_main import PlayerAPI, check_game_invariants
+
+from .conftest import regular_ids, start
+
+
+def test_failed_transition_leaves_no_trace(manager, monkeypatch, capsys):
+    start(manager)
+    player = PlayerAPI(manager)
+    qid = regular_ids(manager)[0]
+    team = manager.state.current_team
+    events = len(manager.events)
+    correct = manager.questions.get(qid).correct
+
+    def broken(question_id):
+        raise MemoryError()
+
+    with monkeypatch.context() as patch:
+        patch.setattr(manager.state, "mark_answered", broken)
+        result = player.check_answer(qid, correct)
+    assert result == {"success": False, "error": "MemoryError"}
+    assert "check_answer failed" in capsys.readouterr().out
+    assert len(manager.events) == events
+    assert manager.state.get_score(team) == 0
+    assert not manager.state.is_answered(qid)
+    assert qid not in manager.state.questions_results
+    assert check_game_invariants(manager) == []
+
+    # The retry scores once
+    assert player.check_answer(qid, correct)["success"]
+    assert manager.state.get_score(team) == manager.settings.points_correct
+    assert check_game_invariants(manager) == []